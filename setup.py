@@ -33,6 +33,13 @@ setup_args = {'ext_modules': [
                                                       'utils4/libs'],
                                         py_limited_api=True,
                                         language='c'),
+                              Extension('utils4.xxhash',
+                                        sources=['utils4/xxhashmodule.c',
+                                                 'utils4/libs/_xxhash.c'],
+                                        include_dirs=['utils4',
+                                                      'utils4/libs'],
+                                        py_limited_api=True,
+                                        language='c'),
                              ]}
 # If on Windows, add a [build] table for the compiler (only once).
 if sys.platform == 'win32':
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:Purpose:   Testing module for the ``binmanifest`` module.
+
+:Developer: J Berendt
+:Email:     development@s3dev.uk
+
+:Comments:  n/a
+
+"""
+# pylint: disable=invalid-name
+# pylint: disable=wrong-import-order
+
+import hashlib
+import os
+import tempfile
+try:
+    from .base import TestBase
+    from .testlibs import msgs
+    from .testlibs.utilities import utilities
+except ImportError:
+    from base import TestBase
+    from testlibs import msgs
+    from testlibs.utilities import utilities
+# The imports for utils4 must be after TestBase.
+from utils4.binmanifest import BinaryManifest
+
+
+class TestBinaryManifest(TestBase):
+    """Testing class used to test the ``binmanifest`` module."""
+
+    _MSG1 = msgs.templates.not_as_expected.general
+    _KEY = b'0123456789abcdef0123456789abcdef'
+
+    @classmethod
+    def setUpClass(cls):
+        """Run this logic at the start of all test cases."""
+        msgs.startoftest.startoftest(module_name='binmanifest')
+
+    def setUp(self):
+        """Run this logic *before* each test case.
+
+        :Tasks:
+            - Create a temporary directory and a manifest of 5000 entries,
+              spanning several blocks.
+
+        """
+        self._tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._fp = os.path.join(self._tmp.name, 'files.bm')
+        self._entries = {f'/srv/app/dir{i % 7}/file_{i}.py':
+                         hashlib.md5(str(i).encode()).hexdigest()
+                         for i in range(5000)}
+        BinaryManifest.write(path=self._fp, entries=self._entries, algorithm='md5',
+                             key=self._KEY, block_size=256)
+
+    def tearDown(self):
+        """Run this logic *after* each test case."""
+        self._tmp.cleanup()
+
+    def test01__lookup(self):
+        """Test the ``get`` method and mapping interface.
+
+        :Test:
+            - Verify every path is found with the expected digest.
+            - Verify paths before, between and after the stored paths are
+              not found.
+            - Verify the length, algorithm and sorted iteration.
+
+        """
+        with BinaryManifest(path=self._fp, key=self._KEY) as mfst:
+            test1 = all(mfst[p] == d for p, d in self._entries.items())
+            test2 = [mfst.get('/'), mfst.get('/srv/app/dir0/file_0.pyc'), mfst.get('/zzz'),
+                     '/srv' in mfst]
+            test3 = [len(mfst), mfst.algorithm, list(mfst) == sorted(self._entries)]
+            with self.assertRaises(KeyError):
+                _ = mfst['/zzz']
+        utilities.assert_true(expected=[True, [None]*3 + [False], [5000, 'md5', True]],
+                              test=[test1, test2, test3],
+                              msg=self._MSG1)
+
+    def test02__items_verify(self):
+        """Test the ``items`` and ``verify`` methods.
+
+        :Test:
+            - Verify the items round trip to the original entries.
+            - Verify the manifest passes verification.
+
+        """
+        with BinaryManifest(path=self._fp, key=self._KEY) as mfst:
+            test = [dict(mfst.items()) == self._entries, mfst.verify()]
+        utilities.assert_true(expected=[True, True], test=test, msg=self._MSG1)
+
+    def test03__tamper(self):
+        """Test a modified manifest fails authentication.
+
+        :Test:
+            - Verify opening the manifest with the wrong key raises a
+              ValueError.
+            - Modify a single digest byte in the last block.
+            - Verify a lookup in the first block still succeeds, a lookup
+              in the last block raises a ValueError, and the manifest fails
+              verification.
+
+        """
+        with self.assertRaises(ValueError):
+            BinaryManifest(path=self._fp, key=b'wrong')
+        with open(self._fp, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            b = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([b[0] ^ 0xff]))
+        first, last = min(self._entries), max(self._entries)
+        with BinaryManifest(path=self._fp, key=self._KEY) as mfst:
+            test = [mfst.get(first) == self._entries[first], mfst.verify()]
+            with self.assertRaises(ValueError):
+                mfst.get(last)
+        utilities.assert_true(expected=[True, False], test=test, msg=self._MSG1)
+
+    def test04__empty(self):
+        """Test an empty manifest.
+
+        :Test:
+            - Write a manifest with no entries, and verify it has a length
+              of zero, a lookup returns None and it passes verification.
+
+        """
+        BinaryManifest.write(path=self._fp, entries={}, algorithm='crc32', key=self._KEY)
+        with BinaryManifest(path=self._fp, key=self._KEY) as mfst:
+            test = [len(mfst), mfst.get('/a'), list(mfst), mfst.verify()]
+        utilities.assert_true(expected=[0, None, [], True], test=test, msg=self._MSG1)
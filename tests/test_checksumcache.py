@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:Purpose:   Testing module for the ``checksumcache`` module.
+
+:Developer: J Berendt
+:Email:     development@s3dev.uk
+
+:Comments:  n/a
+
+"""
+# pylint: disable=invalid-name
+# pylint: disable=wrong-import-order
+
+import os
+import tempfile
+try:
+    from .base import TestBase
+    from .testlibs import msgs
+    from .testlibs.utilities import utilities
+except ImportError:
+    from base import TestBase
+    from testlibs import msgs
+    from testlibs.utilities import utilities
+# The imports for utils4 must be after TestBase.
+from utils4.checksumcache import ChecksumCache
+from utils4.crypto import crypto
+
+
+class TestChecksumCache(TestBase):
+    """Testing class used to test the ``checksumcache`` module."""
+
+    _MSG1 = msgs.templates.not_as_expected.general
+
+    @classmethod
+    def setUpClass(cls):
+        """Run this logic at the start of all test cases."""
+        msgs.startoftest.startoftest(module_name='checksumcache')
+
+    def setUp(self):
+        """Run this logic *before* each test case.
+
+        :Tasks:
+            - Create a temporary directory containing a test file.
+
+        """
+        self._tmp = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self._db = os.path.join(self._tmp.name, 'cache', 'checksums.db')
+        self._fp = os.path.join(self._tmp.name, 'file.txt')
+        self._write(self._fp, 'The quick brown fox jumps over the lazy dog')
+
+    def tearDown(self):
+        """Run this logic *after* each test case."""
+        crypto.disable_cache()
+        self._tmp.cleanup()
+
+    def test01__get_put(self):
+        """Test the ``get`` and ``put`` methods.
+
+        :Test:
+            - Verify a key is not found in a new cache.
+            - Store a digest and verify it is returned by a new cache
+              object, opened on the same database.
+
+        """
+        with ChecksumCache(path=self._db) as cache:
+            key = cache.key(path=self._fp, algorithm='md5')
+            test1 = cache.get(key)
+            test2 = cache.put(key=key, digest='abc123', path=self._fp)
+        with ChecksumCache(path=self._db) as cache:
+            test3 = cache.get(key)
+            test4 = len(cache)
+        utilities.assert_true_pyiter(expected=[None, True, 'abc123', 1],
+                                     test=[test1, test2, test3, test4],
+                                     msg=self._MSG1)
+
+    def test02__changed_file(self):
+        """Test the cache key changes when a file is modified.
+
+        :Test:
+            - Store a digest for a file.
+            - Modify the file's size and mtime, and verify the cached
+              digest is no longer found.
+            - Verify ``put`` refuses to store a digest if the file has
+              changed since the key was built.
+
+        """
+        with ChecksumCache(path=self._db) as cache:
+            key = cache.key(path=self._fp, algorithm='md5')
+            cache.put(key=key, digest='abc123')
+            self._write(self._fp, 'Modified')
+            os.utime(self._fp, ns=(0, key[3] + 10**9))
+            test1 = cache.get(cache.key(path=self._fp, algorithm='md5'))
+            test2 = cache.put(key=key, digest='abc123', path=self._fp)
+        utilities.assert_true_pyiter(expected=[None, False], test=[test1, test2], msg=self._MSG1)
+
+    def test03__evict(self):
+        """Test the least recently used eviction.
+
+        :Test:
+            - Create a cache with a maximum of 10 entries.
+            - Store 10 entries, then read the first entry so it is the
+              most recently used.
+            - Store another entry, and verify the cache is reduced to 90%
+              of its maximum, the first entry is retained and the second
+              (least recently used) entry has been evicted.
+
+        """
+        with ChecksumCache(path=self._db, max_entries=10) as cache:
+            keys = [(0, i, 0, 0, 'md5') for i in range(11)]
+            for k in keys[:10]:
+                cache.put(key=k, digest=str(k[1]))
+            cache.get(keys[0])
+            cache.put(key=keys[10], digest='10')
+            test = [len(cache), cache.get(keys[0]), cache.get(keys[1])]
+        utilities.assert_true_pyiter(expected=[9, '0', None], test=test, msg=self._MSG1)
+
+    def test03__count__replace(self):
+        """Test the entry count is not inflated by replacing an entry.
+
+        :Test:
+            - Store the same key several times, then a new key.
+            - Verify the tracked count matches the number of entries.
+
+        """
+        with ChecksumCache(path=self._db) as cache:
+            key = (0, 1, 0, 0, 'md5')
+            for i in range(5):
+                cache.put(key=key, digest=str(i))
+            cache.put(key=(0, 2, 0, 0, 'md5'), digest='2')
+            test = [cache._count, len(cache), cache.get(key)]  # pylint: disable=protected-access
+        utilities.assert_true_pyiter(expected=[2, 2, '4'], test=test, msg=self._MSG1)
+
+    def test04__crypto_integration(self):
+        """Test the cache is used by the ``crypto`` checksum methods.
+
+        :Test:
+            - Enable the cache and checksum the test file.
+            - Overwrite the cached entry with a known (false) digest and
+              verify it is returned, proving the file was not re-hashed.
+            - Verify ``verify=True`` re-hashes the file and refreshes the
+              cached entry.
+
+        """
+        cache = crypto.enable_cache(path=self._db)
+        exp = crypto.checksum_sha256(path=self._fp)
+        cache.put(key=cache.key(path=self._fp, algorithm='sha256'), digest='cached')
+        test1 = crypto.checksum_sha256(path=self._fp)
+        test2 = dict(crypto.checksum_many(paths=[self._fp], algorithm='sha256'))[self._fp]
+        test3 = crypto.checksum_sha256(path=self._fp, verify=True)
+        test4 = crypto.checksum_multi(path=self._fp, algorithms=['sha256'])['sha256']
+        utilities.assert_true_pyiter(expected=['cached', 'cached', exp, exp],
+                                     test=[test1, test2, test3, test4],
+                                     msg=self._MSG1)
+
+    def test05__checksum_many__hits_streamed(self):
+        """Test cache hits are yielded by ``checksum_many`` as they are found.
+
+        :Test:
+            - Enable the cache and checksum the test file.
+            - Pass a lazy iterable of 100 (cached) paths to
+              ``checksum_many`` and verify the first result is yielded
+              after only the first path has been consumed.
+
+        """
+        crypto.enable_cache(path=self._db)
+        exp = crypto.checksum_md5(path=self._fp)
+        consumed = []
+
+        def _paths():
+            for i in range(100):
+                consumed.append(i)
+                yield self._fp
+
+        gen = crypto.checksum_many(paths=_paths())
+        test = next(gen)
+        gen.close()
+        utilities.assert_true_pyiter(expected=[(self._fp, exp), 1],
+                                     test=[test, len(consumed)],
+                                     msg=self._MSG1)
+
+    @staticmethod
+    def _write(path: str, text: str):
+        """Write text to the given file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
@@ -15,7 +15,11 @@
 import base64
 import hashlib
 import os
+import pandas as pd
+import tempfile
 import zlib
+from glob import glob
+from unittest import mock
 try:
     from .base import TestBase
     from .testlibs import msgs
@@ -25,6 +29,7 @@ except ImportError:
     from testlibs import msgs
     from testlibs.utilities import utilities
 # The imports for utils4 must be after TestBase.
+from utils4 import crypto as crypto_
 from utils4.crypto import crypto
 
 
@@ -105,6 +110,33 @@ class TestCrypto(TestBase):
         test = crypto.b64md5(data=inp, trunc=16)
         utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
 
+    def test02__b64md5_many(self):
+        """Test the ``b64md5_many`` method.
+
+        :Test:
+            - Verify the output for a DataFrame, Series and list of tuples
+              matches calling ``b64md5`` per row, for a range of truncation
+              values.
+            - Verify the index of a DataFrame is retained.
+            - Verify the output using a process pool matches.
+
+        """
+        rows = [(f'name{i}', str(i * 7), 'GB') for i in range(1000)]
+        df = pd.DataFrame(rows, columns=['name', 'id', 'cntry'], index=range(10, 1010))
+        srs = df['name'] + df['id']
+        for trunc in (None, 1, 5, 16, 43, 44, 50, -1):
+            with self.subTest(msg=f'trunc={trunc}'):
+                exp = [crypto.b64md5(r, trunc=trunc) for r in rows]
+                test1 = crypto.b64md5_many(df, trunc=trunc)
+                test2 = crypto.b64md5_many(srs, trunc=trunc)
+                test3 = crypto.b64md5_many(rows, trunc=trunc)
+                self.assertEqual(exp, test1.tolist())
+                self.assertEqual([crypto.b64md5(r, trunc=trunc) for r in srs], test2.tolist())
+                self.assertEqual(exp, test3.tolist())
+                self.assertTrue(test1.index.equals(df.index))
+        test = crypto.b64md5_many(df, trunc=16, workers=2, chunksize=300)
+        self.assertTrue(test.equals(crypto.b64md5_many(df, trunc=16)))
+
     def test03__md5_encoded(self):
         """Test the ``md5`` method, without decoding.
 
@@ -131,6 +163,34 @@ class TestCrypto(TestBase):
         test = crypto.md5(data=inp, decode=True)
         utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
 
+    def test03__md5_many(self):
+        """Test the ``md5_many`` method.
+
+        :Test:
+            - Verify the output for a Series matches calling ``md5`` per
+              row, and the index is retained.
+
+        """
+        srs = pd.Series([f'value{i}' for i in range(100)], index=range(100, 200))
+        test = crypto.md5_many(srs)
+        self.assertEqual([crypto.md5(s) for s in srs], test.tolist())
+        self.assertTrue(test.index.equals(srs.index))
+
+    def test04__checksum_blake2b(self):
+        """Test the ``checksum_blake2b`` method.
+
+        :Test:
+            - Use the method to checksum *this* file.
+            - Use the ``hashlib.blake2b`` method to checksum *this* file.
+            - Verify the two checksum values are the same.
+
+        """
+        fp = os.path.realpath(__file__)
+        with open(fp, 'rb') as f:
+            exp = hashlib.blake2b(f.read()).hexdigest()
+        test = crypto.checksum_blake2b(path=fp)
+        utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
     def test04__checksum_crc32__int(self):
         """Test the ``checksum_crc32`` method, returning an integer.
 
@@ -220,3 +280,122 @@ class TestCrypto(TestBase):
             exp = hashlib.sha512(f.read()).hexdigest()
         test = crypto.checksum_sha512(path=fp)
         utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
+    def test05__checksum_multi(self):
+        """Test the ``checksum_multi`` method.
+
+        :Test:
+            - Use the method to checksum *this* file with several
+              algorithms and a small buffer, forcing multiple reads.
+            - Verify each checksum matches the single-algorithm methods.
+
+        """
+        fp = os.path.realpath(__file__)
+        exp = {'crc32': crypto.checksum_crc32(path=fp),
+               'md5': crypto.checksum_md5(path=fp),
+               'sha1': crypto.checksum_sha1(path=fp),
+               'sha256': crypto.checksum_sha256(path=fp),
+               'sha512': crypto.checksum_sha512(path=fp)}
+        test = crypto.checksum_multi(path=fp, algorithms=list(exp), size=1000)
+        utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
+    def test05__checksum_multi__valueerror(self):
+        """Test the ``checksum_multi`` method with an invalid algorithm.
+
+        :Test:
+            - Verify a ValueError is raised for an unsupported algorithm.
+
+        """
+        with self.assertRaises(ValueError):
+            crypto.checksum_multi(path=os.path.realpath(__file__), algorithms=['md5', 'xyz'])
+
+    def test06__checksum_many(self):
+        """Test the ``checksum_many`` method, using each executor type.
+
+        :Test:
+            - Checksum all modules in the ``utils4`` directory, passed as
+              a generator, using a thread pool and a process pool.
+            - Verify each file is yielded once, and each checksum matches
+              the ``checksum_sha256`` method.
+
+        """
+        files = glob(os.path.join(self._DIR_ROOT, 'utils4', '*.py'))
+        exp = {f: crypto.checksum_sha256(path=f) for f in files}
+        for executor in ('thread', 'process'):
+            with self.subTest(msg=f'executor={executor}'):
+                test = list(crypto.checksum_many(paths=iter(files),
+                                                 algorithm='sha256',
+                                                 workers=2,
+                                                 executor=executor))
+                utilities.assert_true(expected=len(exp), test=len(test), msg=self._MSG1)
+                utilities.assert_true(expected=exp, test=dict(test), msg=self._MSG1)
+
+    def test06__checksum_many__valueerror(self):
+        """Test the ``checksum_many`` method with invalid arguments.
+
+        :Test:
+            - Verify a ValueError is raised for an invalid executor.
+            - Verify a ValueError is raised for an invalid algorithm.
+
+        """
+        kwargs = ({'executor': 'fibre'}, {'algorithm': 'xyz'})
+        for kws in kwargs:
+            with self.subTest(msg=f'kwargs={kws}'):
+                with self.assertRaises(ValueError):
+                    list(crypto.checksum_many(paths=[__file__], **kws))
+
+    def test06__checksum_many__oserror(self):
+        """Test the ``checksum_many`` method with an unreadable file.
+
+        :Test:
+            - Verify an OSError is raised from the stream for a file which
+              does not exist, as documented.
+
+        """
+        missing = os.path.join(self._DIR_ROOT, 'not', 'a', 'file.txt')
+        with self.assertRaises(OSError):
+            list(crypto.checksum_many(paths=[__file__, missing], workers=2))
+
+    def test07__checksum__mmap_readinto(self):
+        """Test the checksum methods using both read paths.
+
+        :Test:
+            - Use each checksum method to checksum *this* file, using a
+              memory-mapped file and the ``readinto`` fallback, with a
+              chunk size which does not divide the file size.
+            - Verify the checksums match the ``hashlib`` / ``zlib``
+              checksum of the whole file.
+            - Verify an empty file (which cannot be mapped) is hashed.
+
+        """
+        fp = os.path.realpath(__file__)
+        with open(fp, 'rb') as f:
+            data = f.read()
+        methods = {crypto.checksum_md5: hashlib.md5(data).hexdigest(),
+                   crypto.checksum_sha1: hashlib.sha1(data).hexdigest(),
+                   crypto.checksum_sha256: hashlib.sha256(data).hexdigest(),
+                   crypto.checksum_sha512: hashlib.sha512(data).hexdigest(),
+                   crypto.checksum_crc32: f'{zlib.crc32(data):0x}'}
+        for func, exp in methods.items():
+            for use_mmap in (True, False):
+                with self.subTest(msg=f'func={func.__name__} use_mmap={use_mmap}'):
+                    test = func(path=fp, size=999, use_mmap=use_mmap)
+                    utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+        with tempfile.NamedTemporaryFile() as tmp:
+            test = crypto.checksum_md5(path=tmp.name, use_mmap=True)
+            utilities.assert_true(expected=hashlib.md5(b'').hexdigest(), test=test, msg=self._MSG1)
+
+    def test08__xxh64__no_extension(self):
+        """Test the xxh64 algorithm when the C extension is not available.
+
+        :Test:
+            - Simulate the ``xxhash`` extension not being built.
+            - Verify ``checksum_xxh64`` and ``checksum_many`` raise an
+              ImportError, rather than a NameError.
+
+        """
+        with mock.patch.object(crypto_, 'xxhash', None):
+            with self.assertRaises(ImportError):
+                crypto.checksum_xxh64(path=__file__, verify=True)
+            with self.assertRaises(ImportError):
+                list(crypto.checksum_many(paths=[__file__], algorithm='xxh64'))
@@ -18,6 +18,8 @@ try:
     import contextlib
     import os
     import shutil
+    import tempfile
+    from unittest import mock
     from .base import TestBase
     from .testlibs import msgs
     from .testlibs.utilities import utilities
@@ -25,6 +27,8 @@ except ImportError:
     import contextlib
     import os
     import shutil
+    import tempfile
+    from unittest import mock
     from base import TestBase
     from testlibs import msgs
     from testlibs.utilities import utilities
@@ -100,6 +104,55 @@ class TestFileSys(TestBase):
         test = filesys.compare_files(file1=f1, file2=f2, contents_only=True)
         utilities.assert_true(expected=True, test=test, msg=self._MSG1)
 
+    def test01__compare_files__modes(self):
+        """Test the ``compare_files`` method, for each comparison mode.
+
+        :Test:
+            - Verify files with different line endings are the same in
+              ``'text'`` and ``'newline'`` modes, and differ in ``'binary'``
+              mode.
+            - Verify differing files are not the same in any mode.
+            - Verify an invalid mode raises a ValueError.
+
+        """
+        dos = os.path.join(self._DIR_RESRC, 'test_filesys__file1__dos.txt')
+        unix = os.path.join(self._DIR_RESRC, 'test_filesys__file2__unix.txt')
+        diff1 = os.path.join(self._DIR_RESRC, 'test_filesys__file1__diff1.txt')
+        diff2 = os.path.join(self._DIR_RESRC, 'test_filesys__file2__diff1.txt')
+        test = []
+        for mode in ('text', 'newline', 'binary'):
+            test.append(filesys.compare_files(file1=dos, file2=unix, contents_only=True, mode=mode))
+            test.append(filesys.compare_files(file1=diff1, file2=diff2, mode=mode))
+        with self.assertRaises(ValueError):
+            filesys.compare_files(file1=dos, file2=unix, mode='invalid')
+        utilities.assert_true(expected=[True, False, True, False, False, False],
+                              test=test,
+                              msg=self._MSG1)
+
+    def test01__compare_files__binary_large(self):
+        """Test the ``compare_files`` method in binary mode, for large files.
+
+        :Test:
+            - Create two identical 5 MiB files, and verify they are the same
+              using sequential, sampled and parallel comparison.
+            - Change a single byte in the middle of the second file, and
+              verify the files differ for each type of comparison.
+
+        """
+        data = bytearray(os.urandom((5 << 20) + 123))
+        with tempfile.TemporaryDirectory() as tmp:
+            f1, f2 = os.path.join(tmp, 'file1.bin'), os.path.join(tmp, 'file2.bin')
+            for f in (f1, f2):
+                with open(f, 'wb') as fp:
+                    fp.write(data)
+            opts = [{}, {'sample': 8}, {'workers': 4}, {'sample': 2, 'workers': 2}]
+            test = [filesys.compare_files(file1=f1, file2=f2, mode='binary', **o) for o in opts]
+            data[len(data) // 2] ^= 0xff
+            with open(f2, 'wb') as fp:
+                fp.write(data)
+            test += [filesys.compare_files(file1=f1, file2=f2, mode='binary', **o) for o in opts]
+        utilities.assert_true(expected=[True]*4 + [False]*4, test=test, msg=self._MSG1)
+
     def test01__compare_files__same(self):
         """Test the ``compare_files`` method, for the same files.
 
@@ -208,6 +261,58 @@ class TestFileSys(TestBase):
                                      test=(tst1, tst2, tst3, tst4),
                                      msg=self._MSG1)
 
+    def test03__dirsplit__dry_run(self):
+        """Test the ``dirsplit`` function as a dry run, with a callback.
+
+        :Test:
+            - Create a temp/<hash> directory and create 25 paired empty
+              testing files.
+            - Run a dry run and verify the plan is reported through the
+              progress callback, and no files are moved.
+            - Split the directory and verify the progress callback is called
+              for each file, and the files are where the plan reported.
+
+        """
+        path = self._create_temp_files(nfiles=25, pairs=True)
+        kwargs = {'path': path, 'nfiles': 10, 'pattern': '*.csv', 'pairs': True,
+                  'repl': ('_thing1.csv', '_thing2.txt')}
+        plan, moved = [], []
+        tst1 = filesys.dirsplit(**kwargs, dry_run=True, progress=lambda *a: plan.append(a))
+        tst2 = len(os.listdir(path))
+        tst3 = filesys.dirsplit(**kwargs, progress=lambda *a: moved.append(a), workers=2)
+        tst4 = sorted(os.listdir(path))
+        tst5 = all(os.path.isfile(dst) and not os.path.exists(src) for _, _, src, dst in plan)
+        tst6 = [os.path.basename(dst) for *_, dst in plan[:2]]
+        utilities.assert_true_pyiter(expected=(True, 50, True, ['01', '02', '03'], True,
+                                               ['file_0_thing1.csv', 'file_0_thing2.txt']),
+                                     test=(tst1, tst2, tst3, tst4, tst5, tst6),
+                                     msg=self._MSG1)
+        utilities.assert_true(expected=[(n, 50) for n in range(1, 51)],
+                              test=[a[:2] for a in moved],
+                              msg=self._MSG1)
+
+    def test03__dirsplit__hidden(self):
+        """Test the ``dirsplit`` function with hidden files.
+
+        :Test:
+            - Create a temp/<hash> directory containing 4 hidden and 4
+              visible files.
+            - Verify the default pattern only moves the visible files, and
+              a pattern starting with '.' moves the hidden files, as with
+              ``glob``.
+
+        """
+        path = self._create_temp_files(nfiles=4)
+        for i in range(4):
+            with open(os.path.join(path, f'.hidden_{i}'), 'w', encoding='utf-8'):
+                pass
+        tst1 = len(filesys.dirsplit_plan(path=path, nfiles=10))
+        plan = filesys.dirsplit_plan(path=path, nfiles=10, pattern='.*')
+        tst2 = [os.path.basename(src) for src, _ in plan]
+        utilities.assert_true_pyiter(expected=(4, [f'.hidden_{i}' for i in range(4)]),
+                                     test=(tst1, tst2),
+                                     msg=self._MSG1)
+
     def test04__dirsplit__path_not_exist(self):
         """Test the ``dirsplit`` function with a path which does not exist.
 
@@ -220,6 +325,21 @@ class TestFileSys(TestBase):
         with self.assertRaises(FileNotFoundError):
             filesys.dirsplit(path=path, nfiles=10)
 
+    def test05__move_xdev(self):
+        """Test the ``_move_xdev`` function, used for cross-device moves.
+
+        :Test:
+            - Move a file and verify the paths are returned, and the file
+              has been moved.
+
+        """
+        path = self._create_temp_files(nfiles=1)
+        src, dst = os.path.join(path, 'file_0'), os.path.join(path, 'moved')
+        tst = filesys._move_xdev((src, dst))
+        utilities.assert_true_pyiter(expected=((src, dst), ['moved']),
+                                     test=(tst, os.listdir(path)),
+                                     msg=self._MSG1)
+
     def test05__file_move_test(self):
         """Test the ``_file_move_test`` function.
 
@@ -230,6 +350,273 @@ class TestFileSys(TestBase):
         with self.assertRaises(FileNotFoundError):
             filesys._file_move_test('/not/a/real/path')
 
+    def test06__find_duplicates(self):
+        """Test the ``find_duplicates`` function.
+
+        :Test:
+            - Create a directory tree containing small duplicates, a file of
+              the same size with different content, large duplicates, a
+              large file differing from them only in the middle, a hard
+              link and empty files.
+            - Verify only the groups of identical files are returned, the
+              hard link is counted once and the empty files are ignored.
+
+        """
+        big = bytearray(os.urandom(300_000))
+        files = {'a.txt': b'spam and eggs', 'sub/b.txt': b'spam and eggs',
+                 'c.txt': b'eggs and spam', 'd.bin': bytes(big), 'sub/deep/e.bin': bytes(big),
+                 'e1.txt': b'', 'e2.txt': b''}
+        big[150_000] ^= 0xff
+        files['f.bin'] = bytes(big)
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, data in files.items():
+                os.makedirs(os.path.dirname(os.path.join(tmp, name)), exist_ok=True)
+                with open(os.path.join(tmp, name), 'wb') as f:
+                    f.write(data)
+            os.link(os.path.join(tmp, 'd.bin'), os.path.join(tmp, 'sub', 'g.bin'))
+            test = filesys.find_duplicates(roots=[tmp, os.path.join(tmp, 'sub')], workers=2)
+            test = [[os.path.relpath(p, tmp) for p in g] for g in test]
+        exp = [['a.txt', 'sub/b.txt'], [test[1][0], 'sub/deep/e.bin']]
+        utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+        utilities.assert_true(expected=True,
+                              test=test[1][0] in ('d.bin', 'sub/g.bin'),
+                              msg=self._MSG1)
+
+    def test06__find_duplicates__unreadable(self):
+        """Test the ``find_duplicates`` function skips unreadable files.
+
+        :Test:
+            - Create three identical large files, and simulate one of them
+              becoming unreadable before its full hash.
+            - Verify the remaining pair is returned, without an error.
+
+        """
+        data = os.urandom(300_000)
+        checksum_multi = filesys.crypto.checksum_multi
+
+        def _checksum_multi(path, **kwargs):
+            if os.path.basename(path) == 'c.bin':
+                raise PermissionError(path)
+            return checksum_multi(path=path, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('a.bin', 'b.bin', 'c.bin'):
+                with open(os.path.join(tmp, name), 'wb') as f:
+                    f.write(data)
+            with mock.patch.object(filesys.crypto, 'checksum_multi', side_effect=_checksum_multi):
+                test = filesys.find_duplicates(roots=tmp, workers=2)
+            test = [[os.path.basename(p) for p in g] for g in test]
+        utilities.assert_true(expected=[['a.bin', 'b.bin']], test=test, msg=self._MSG1)
+
+    def test06__find_duplicates__no_inode(self):
+        """Test the ``find_duplicates`` function where no inode is reported.
+
+        :Test:
+            - Create two identical files, and simulate a platform (e.g.
+              Windows) whose ``DirEntry.stat`` reports an inode of 0.
+            - Verify the pair is returned, rather than being dropped as
+              paths to the same inode.
+
+        """
+        iterfiles = filesys.iterfiles
+
+        def _iterfiles(**kwargs):
+            for entry in iterfiles(**kwargs):
+                st = entry.stat(follow_symlinks=False)
+                yield mock.Mock(path=entry.path,
+                                stat=mock.Mock(return_value=mock.Mock(st_size=st.st_size,
+                                                                      st_dev=0,
+                                                                      st_ino=0)))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('a.txt', 'b.txt'):
+                with open(os.path.join(tmp, name), 'wb') as f:
+                    f.write(b'spam and eggs')
+            with mock.patch.object(filesys, 'iterfiles', side_effect=_iterfiles):
+                test = filesys.find_duplicates(roots=tmp, workers=2)
+            test = [[os.path.basename(p) for p in g] for g in test]
+        utilities.assert_true(expected=[['a.txt', 'b.txt']], test=test, msg=self._MSG1)
+
+    def test07__compare_dirs(self):
+        """Test the ``compare_dirs`` function.
+
+        :Test:
+            - Create two directory trees containing same, differing,
+              one-sided files and directories, and symbolic links.
+            - Verify each entry is classified as expected, for both a full
+              and a shallow comparison.
+            - Verify an invalid mode raises a ValueError.
+
+        """
+        common = {'same.txt': b'spam', 'sub/same.txt': b'eggs', 'sub/deep/same.bin': b'x' * 5000}
+        lfiles = {**common, 'content.txt': b'spam', 'size.txt': b'spam', 'left.txt': b'',
+                  'leftdir/a.txt': b'a', 'type': b''}
+        rfiles = {**common, 'content.txt': b'eggs', 'size.txt': b'spam!', 'sub/right.txt': b'',
+                  'type/a.txt': b'a'}
+        with tempfile.TemporaryDirectory() as tmp:
+            left, right = os.path.join(tmp, 'left'), os.path.join(tmp, 'right')
+            for root, files in ((left, lfiles), (right, rfiles)):
+                for name, data in files.items():
+                    os.makedirs(os.path.dirname(os.path.join(root, name)), exist_ok=True)
+                    with open(os.path.join(root, name), 'wb') as f:
+                        f.write(data)
+                os.symlink('same.txt', os.path.join(root, 'link'))
+            os.symlink('size.txt', os.path.join(left, 'link2'))
+            os.symlink('same.txt', os.path.join(right, 'link2'))
+            test1 = sorted(filesys.compare_dirs(left=left, right=right, workers=2))
+            test2 = {r: s for s, r in filesys.compare_dirs(left=left, right=right, shallow=True)}
+            test2 = test2['content.txt']
+            with self.assertRaises(ValueError):
+                next(filesys.compare_dirs(left=left, right=right, mode='invalid'))
+        exp = [('differs', 'content.txt'), ('differs', 'link2'), ('differs', 'size.txt'),
+               ('differs', 'type'), ('left', 'left.txt'), ('left', 'leftdir'),
+               ('right', os.path.join('sub', 'right.txt')), ('same', 'link'), ('same', 'same.txt'),
+               ('same', os.path.join('sub', 'deep', 'same.bin')),
+               ('same', os.path.join('sub', 'same.txt'))]
+        utilities.assert_true(expected=exp, test=test1, msg=self._MSG1)
+        utilities.assert_true(expected='same', test=test2, msg=self._MSG1)
+
+    def test07__compare_dirs__errors(self):
+        """Test the ``compare_dirs`` function continues after read errors.
+
+        :Test:
+            - Create two directory trees, and simulate a permission error
+              reading one sub-directory, and a file which disappears
+              before its content is compared.
+            - Verify both are reported as ``'error'``, and the remaining
+              entries are still compared.
+
+        """
+        scandir, compare = os.scandir, filesys._compare_content
+
+        def _scandir(path):
+            if os.path.basename(path) == 'locked':
+                raise PermissionError(path)
+            return scandir(path)
+
+        def _compare(file1, **kwargs):
+            if os.path.basename(file1) == 'gone.txt':
+                raise FileNotFoundError(file1)
+            return compare(file1=file1, **kwargs)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            left, right = os.path.join(tmp, 'left'), os.path.join(tmp, 'right')
+            for root in (left, right):
+                for name in ('a.txt', 'gone.txt', 'locked/b.txt', 'z/c.txt'):
+                    os.makedirs(os.path.dirname(os.path.join(root, name)), exist_ok=True)
+                    with open(os.path.join(root, name), 'w', encoding='utf-8') as f:
+                        f.write(name)
+            with mock.patch('os.scandir', side_effect=_scandir), \
+                    mock.patch.object(filesys, '_compare_content', side_effect=_compare):
+                test = sorted(filesys.compare_dirs(left=left, right=right, workers=2))
+        exp = [('error', 'gone.txt'), ('error', 'locked'), ('same', 'a.txt'),
+               ('same', os.path.join('z', 'c.txt'))]
+        utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
+    def test07__compare_dirs__undecodable(self):
+        """Test the ``compare_dirs`` function with an undecodable file.
+
+        :Test:
+            - Create two directory trees, where one pair of files is not
+              valid UTF-8, and compare them in text mode.
+            - Verify the pair is reported as ``'error'``, and the
+              remaining entries are still compared.
+
+        """
+        files = {'a.txt': b'spam and eggs', 'b.bin': b'\xff\xfe\x00spam\x80'}
+        with tempfile.TemporaryDirectory() as tmp:
+            left, right = os.path.join(tmp, 'left'), os.path.join(tmp, 'right')
+            for root in (left, right):
+                os.makedirs(root)
+                for name, data in files.items():
+                    with open(os.path.join(root, name), 'wb') as f:
+                        f.write(data)
+            test = sorted(filesys.compare_dirs(left=left, right=right, mode='text', workers=2))
+        exp = [('error', 'b.bin'), ('same', 'a.txt')]
+        utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
+    def test08__iterfiles(self):
+        """Test the ``iterfiles`` function.
+
+        :Test:
+            - Create a directory tree containing files, hidden files and
+              symbolic links, over three levels.
+            - Verify the files are collected as expected for a combination
+              of pattern, recursion, depth, hidden and symbolic link
+              arguments, and are sorted naturally if requested.
+            - Verify a path which does not exist yields no files.
+
+        """
+        names = ['f10.csv', 'f2.csv', 'f1.txt', '.hidden.csv', 'a/f3.csv', 'a/b/f4.csv',
+                 '.h/f5.csv']
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in names:
+                os.makedirs(os.path.dirname(os.path.join(tmp, name)), exist_ok=True)
+                with open(os.path.join(tmp, name), 'w', encoding='utf-8'):
+                    pass
+            os.symlink('f1.txt', os.path.join(tmp, 'link.txt'))
+            os.symlink('a', os.path.join(tmp, 'linkdir'))
+
+            def _files(path=tmp, **kwargs):
+                entries = filesys.iterfiles(path=path, **kwargs)
+                return [os.path.relpath(e.path, tmp) for e in entries]
+
+            tests = [(_files(pattern='*.csv', sort=True), ['.hidden.csv', 'f2.csv', 'f10.csv']),
+                     (_files(pattern='*.csv', sort=True, hidden=False), ['f2.csv', 'f10.csv']),
+                     (sorted(_files(pattern='*.txt')), ['f1.txt']),
+                     (sorted(_files(pattern='*.txt', follow_symlinks=True)),
+                      ['f1.txt', 'link.txt']),
+                     (sorted(_files(pattern='*.csv', recursive=True)),
+                      sorted(['.hidden.csv', 'f10.csv', 'f2.csv', 'a/f3.csv', 'a/b/f4.csv',
+                              '.h/f5.csv'])),
+                     (_files(pattern='*.csv', recursive=True, maxdepth=1, sort=True, hidden=False),
+                      ['f2.csv', 'f10.csv', 'a/f3.csv'])]
+            tests.append((_files(path=os.path.join(tmp, 'missing')), []))
+        for tst, exp in tests:
+            with self.subTest(msg=f'{exp=}'):
+                utilities.assert_true(expected=exp, test=tst, msg=self._MSG1)
+
+    def test08__iterfiles__listing_error(self):
+        """Test the ``iterfiles`` function when a listing fails part way.
+
+        :Test:
+            - Create a directory containing a sub-directory and files, and
+              simulate an error after the sub-directory has been listed.
+            - Verify the files in the sub-directory are still collected.
+
+        """
+        scandir = os.scandir
+
+        class _Failing:
+            """Wrap a ``scandir`` iterator, failing after the first entry."""
+
+            def __init__(self, path):
+                self._it = scandir(path)
+                self._entries = sorted(self._it, key=lambda e: e.name)
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                self._it.close()
+
+            def __iter__(self):
+                yield self._entries[0]
+                raise PermissionError('Listing failed.')
+
+        def _scandir(path):
+            return _Failing(path) if os.path.basename(path) == 'top' else scandir(path)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            top = os.path.join(tmp, 'top')
+            for name in ('a_sub/f1.txt', 'b.txt', 'c.txt'):
+                os.makedirs(os.path.dirname(os.path.join(top, name)), exist_ok=True)
+                with open(os.path.join(top, name), 'w', encoding='utf-8'):
+                    pass
+            with mock.patch('os.scandir', side_effect=_scandir):
+                test = [e.name for e in filesys.iterfiles(path=top, recursive=True)]
+        utilities.assert_true(expected=['f1.txt'], test=test, msg=self._MSG1)
+
     def _create_temp_files(self, nfiles: int=50, pairs: bool=False) -> str:
         """Create a /temp/<hash> directory and populate with testing files.
 
@@ -164,3 +164,68 @@ class TestLog(TestBase):
         """
         with self.assertRaises(UserWarning):
             Log(**self.log_spec_03)
+
+    def test04__persistent(self):
+        """Test the persistent (handle holding) mode.
+
+        :Test:
+            - Create a new log file in persistent mode, using a context
+              manager.
+            - Write (n) lines and verify they are buffered, and not yet
+              written to the file.
+            - Flush the buffer and verify the lines are written.
+            - Write another line, then verify the line is written when the
+              context manager exits.
+
+        """
+        n = 5
+        exp = [f'{self._host},{self._user},line{i}' for i in range(n+1)]
+        with Log(**self.log_spec_01, persistent=True) as l:
+            for i in range(n):
+                l.write(f'line{i}')
+            tst1 = self._read()
+            l.flush()
+            tst2 = self._read()
+            l.write(f'line{n}')
+        tst3 = self._read()
+        utilities.assert_true_pyiter(expected=([self._HEAD],
+                                               [self._HEAD, *exp[:n]],
+                                               [self._HEAD, *exp]),
+                                     test=(tst1, tst2, tst3),
+                                     msg=self._MSG1)
+
+    def test05__write_many(self):
+        """Test the ``write_many`` method.
+
+        :Test:
+            - Create a new log file, in each of the default and persistent
+              modes.
+            - Write (n) lines (including a blank line) in a single call.
+            - Verify the blank line is skipped, the contents are as
+              expected, and all lines share the same datetime.
+
+        """
+        lines = ['line0', 'line1', '', 'line3']
+        exp = [self._HEAD] + [f'{self._host},{self._user},{i}' for i in lines if i]
+        for persistent in (False, True):
+            with self.subTest(msg=f'{persistent=}'):
+                self.setUp()
+                l = Log(**self.log_spec_01, persistent=persistent)
+                l.write_many(lines=lines)
+                l.close()
+                with open(self._FPATH, 'r', encoding='utf-8') as f:
+                    stamps = {i.split(',')[0] for i in f.readlines()[1:]}
+                utilities.assert_true_pyiter(expected=(exp, 1),
+                                             test=(self._read(), len(stamps)),
+                                             msg=self._MSG1)
+
+    def _read(self) -> list:
+        """Read the log file, removing the datetime from each line.
+
+        Returns:
+            list: The header, followed by each line without its datetime.
+
+        """
+        with open(self._FPATH, 'r', encoding='utf-8') as f:
+            lines = [i.strip() for i in f.readlines()]
+        return lines[:1] + [','.join(i.split(',')[1:]) for i in lines[1:]]
@@ -23,6 +23,7 @@ except ImportError:
     from testlibs.utilities import utilities
 import io
 import os
+import tempfile
 from contextlib import redirect_stdout
 from glob import glob
 # The imports for utils4 must be after TestBase.
@@ -178,6 +179,50 @@ class TestSourceCheck(TestBase):
             with self.assertRaises(FileNotFoundError):
                 srccheck.check(ref_file='path/does/not/exist.ref')
 
+    def test03__check_stream__binary(self):
+        """Test the ``check_stream`` method with a binary reference file.
+
+        :Test:
+            - Generate a binary reference file for a temporary set of files,
+              including a path containing a comma.
+            - Verify the full check passes.
+            - Modify one file and verify a partial check of an unmodified
+              file passes, while a full check reports the change.
+            - Verify a partial check reports a file not in the reference
+              file as extra.
+            - Tamper with the reference file, and verify a ValueError is
+              raised.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            files = [os.path.join(tmp, f'file,{i:02d}.txt') for i in range(10)]
+            for f in files:
+                self._write(f, f'Content of {f}')
+            refpath = os.path.join(self._DIR_DSK, 'srccheck.ref')
+            keypath = os.path.join(self._DIR_DSK, 'srccheck.key')
+            with redirect_stdout(None):
+                srccheck.generate(files, algorithm='crc32', binary=True)
+            res1 = srccheck.check_stream(ref_file=refpath, key_file=keypath)
+            self._write(files[5], 'modified')
+            res2 = srccheck.check_stream(ref_file=refpath, key_file=keypath, only=files[:2])
+            res3 = srccheck.check_stream(ref_file=refpath, key_file=keypath)
+            res4 = srccheck.check_stream(ref_file=refpath, key_file=keypath, only=['/not/in/ref'])
+            with open(refpath, 'r+b') as f:
+                f.seek(-1, os.SEEK_END)
+                b = f.read(1)
+                f.seek(-1, os.SEEK_END)
+                f.write(bytes([b[0] ^ 0xff]))
+            with self.assertRaises(ValueError):
+                srccheck.check_stream(ref_file=refpath, key_file=keypath)
+            with self.assertRaises(ValueError):
+                srccheck.check_stream(ref_file=refpath)
+        tst = [(bool(res1), res1.matched),
+               (bool(res2), res2.matched),
+               (bool(res3), res3.changed),
+               (bool(res4), res4.extra)]
+        exp = [(True, 10), (True, 2), (False, [files[5]]), (False, ['/not/in/ref'])]
+        utilities.assert_true(expected=exp, test=tst, msg=self._MSG1)
+
     def test03__check__key_not_exist(self):
         """Verify a FileNotFoundError is raised for a non-existant key file.
 
@@ -190,3 +235,139 @@ class TestSourceCheck(TestBase):
             with self.assertRaises(FileNotFoundError):
                 srccheck.check(ref_file=os.path.join(self._DIR_DSK, 'srccheck.ref'),
                                key_file='path/does/not/exist.ref')
+
+    def test03__generate__algorithm(self):
+        """Test the ``generate`` and ``check`` methods with another algorithm.
+
+        :Test:
+            - Generate a reference file using the ``blake2b`` algorithm.
+            - Verify each checksum is prefixed with the algorithm name.
+            - Verify the check passes, using the stored algorithm.
+
+        """
+        files = sorted(glob(os.path.join(self._DIR_RESRC, 'lorem*')))
+        refpath = os.path.join(self._DIR_DSK, 'srccheck.ref')
+        with redirect_stdout(None):
+            srccheck.generate(files, algorithm='blake2b')
+        with open(refpath, 'r', encoding='utf-8') as f:
+            tst1 = all(line.split(',')[1].startswith('blake2b:') for line in f)
+        tst2 = srccheck.check(refpath)
+        utilities.assert_true(expected=[True, True], test=[tst1, tst2], msg=self._MSG1)
+
+    def test03__check_stream(self):
+        """Test the ``check_stream`` method.
+
+        :Test:
+            - Generate a plaintext reference file for a temporary set of
+              files, and verify the result passes.
+            - Modify one file, remove another, and provide an extra file.
+            - Verify the result lists the changed, missing and extra files.
+            - Verify ``fail_fast=True`` returns a failed, incomplete result.
+            - Verify an extra file passed in both ``files`` and ``only`` is
+              reported once.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            files = [os.path.join(tmp, f'file{i:02d}.txt') for i in range(20)]
+            for f in files:
+                self._write(f, f'Content of {f}')
+            refpath = os.path.join(self._DIR_DSK, 'srccheck.ref')
+            with redirect_stdout(None):
+                srccheck.generate(files)
+            res1 = srccheck.check_stream(ref_file=refpath, files=files)
+            extra = os.path.join(tmp, 'extra.txt')
+            self._write(extra, 'extra')
+            self._write(files[3], 'modified')
+            os.remove(files[7])
+            res2 = srccheck.check_stream(ref_file=refpath, files=files[:7] + [extra], workers=4)
+            res3 = srccheck.check_stream(ref_file=refpath, fail_fast=True)
+            res4 = srccheck.check_stream(ref_file=refpath, files=[extra], only=[extra, files[0]])
+        tst = [(bool(res1), res1.matched, res1.complete),
+               (bool(res2), res2.matched, res2.changed, res2.missing, res2.extra),
+               (bool(res3), res3.complete),
+               (bool(res4), res4.matched, res4.extra)]
+        exp = [(True, 20, True),
+               (False, 18, [files[3]], [files[7]], [extra]),
+               (False, False),
+               (False, 1, [extra])]
+        utilities.assert_true(expected=exp, test=tst, msg=self._MSG1)
+
+    def test04a__tree__pass(self):
+        """Test the ``generate_tree`` and ``check_tree`` methods.
+
+        :Test:
+            - Build a temporary directory tree and generate a tree manifest.
+            - Verify the check passes.
+            - Touch a file without changing its content, and verify the
+              check still passes.
+            - Verify the check passes with ``verify=True``.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            root = self._build_tree(tmp)
+            mfst = os.path.join(tmp, 'srccheck.tree')
+            with redirect_stdout(None):
+                srccheck.generate_tree(root=root, out_path=mfst)
+            tst1 = srccheck.check_tree(ref_file=mfst)
+            path = os.path.join(root, 'pkg', 'sub', 'c.txt')
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+            tst2 = srccheck.check_tree(ref_file=mfst)
+            tst3 = srccheck.check_tree(ref_file=mfst, verify=True)
+        utilities.assert_true(expected=[True, True, True], test=[tst1, tst2, tst3], msg=self._MSG1)
+
+    def test04b__tree__fail(self):
+        """Test the ``check_tree`` method for a modified directory tree.
+
+        :Test:
+            - Build a temporary directory tree and generate a tree manifest.
+            - Modify one file, add one file, and remove a subdirectory.
+            - Verify the check fails and the terminal output is as
+              expected.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            root = self._build_tree(tmp)
+            mfst = os.path.join(tmp, 'srccheck.tree')
+            with redirect_stdout(None):
+                srccheck.generate_tree(root=root, out_path=mfst)
+            self._write(os.path.join(root, 'a.txt'), 'modified')
+            self._write(os.path.join(root, 'pkg', 'd.txt'), 'extra')
+            os.remove(os.path.join(root, 'pkg', 'sub', 'c.txt'))
+            os.rmdir(os.path.join(root, 'pkg', 'sub'))
+            buff = io.StringIO()
+            with redirect_stdout(buff):
+                tst1 = srccheck.check_tree(ref_file=mfst)
+        exp = ('\nChecksum verification has failed for the following:\n'
+               '- ./\n  - changed: a.txt\n'
+               '- pkg/\n  - missing: pkg/sub/c.txt\n  - extra: pkg/d.txt\n\n')
+        tst2 = buff.getvalue()
+        utilities.assert_true(expected=[False, exp], test=[tst1, tst2], msg=self._MSG1)
+
+    def test04c__check_tree__not_tree(self):
+        """Verify a ValueError is raised for a non-tree reference file.
+
+        :Test:
+            - Verify a ValueError is raised if the reference file is not a
+              tree manifest.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'srccheck.tree')
+            self._write(path, '{"format": "other"}')
+            with self.assertRaises(ValueError):
+                srccheck.check_tree(ref_file=path)
+
+    def _build_tree(self, tmp: str) -> str:
+        """Build a small directory tree for testing, and return its root."""
+        root = os.path.join(tmp, 'root')
+        os.makedirs(os.path.join(root, 'pkg', 'sub'))
+        self._write(os.path.join(root, 'a.txt'), 'alpha')
+        self._write(os.path.join(root, 'pkg', 'b.txt'), 'bravo')
+        self._write(os.path.join(root, 'pkg', 'sub', 'c.txt'), 'charlie')
+        return root
+
+    @staticmethod
+    def _write(path: str, text: str):
+        """Write text to the given file."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
@@ -14,6 +14,8 @@
 # pylint: disable=too-many-public-methods
 
 import contextlib
+import gzip
+import hashlib
 import io
 import os
 import pandas as pd
@@ -280,6 +282,86 @@ class TestUtils(TestBase):
         test2 = md5_1 == md5_2
         utilities.assert_true_pyiter(expected=exp, test=[test1, test2], msg=self._MSG1)
 
+    def test10__3__gzip_compress_parallel(self):
+        """Test the ``gzip_compress`` method, using multiple workers.
+
+        :Test:
+            - Compress the backup of the original file using small chunks,
+              several workers and various compression levels.
+            - Verify the output is a single, valid gzip stream whose
+              decompressed content matches the original file.
+            - Verify the output also round-trips through
+              ``gzip_decompress``, with a read size smaller than the
+              compressed file, so the single member spans several reads.
+
+        """
+        path = os.path.join(self._DIR_TMP, 'rand_par.txt.gz')
+        out_path = os.path.join(self._DIR_TMP, 'rand_par.out')
+        with open(self._FP10_3, 'rb') as f:
+            exp = hashlib.md5(f.read()).hexdigest()
+        for level in (1, 6, 9):
+            with self.subTest(msg=f'level={level}'):
+                utils.gzip_compress(in_path=self._FP10_3,
+                                    out_path=path,
+                                    size=1<<20,
+                                    level=level,
+                                    workers=4)
+                with gzip.open(path, 'rb') as f:
+                    test = hashlib.md5(f.read()).hexdigest()
+                utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+                utils.gzip_decompress(path=path,
+                                      size=os.path.getsize(path) // 3,
+                                      binary=True,
+                                      out_path=out_path)
+                with open(out_path, 'rb') as f:
+                    test = hashlib.md5(f.read()).hexdigest()
+                utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
+    def test10__4__gzip_stream(self):
+        """Test the ``gzip_stream`` method with a multi-member file.
+
+        :Test:
+            - Create a gzip file of three concatenated members, with zero
+              padding between members.
+            - Verify the joined blocks match the original data, and that
+              no block exceeds the requested size.
+            - Verify an EOFError is raised for a truncated file.
+
+        """
+        path = os.path.join(self._DIR_TMP, 'rand_multi.bin.gz')
+        parts = [os.urandom(5000), b'abc' * 100000, b'']
+        with open(path, 'wb') as f:
+            for part in parts:
+                f.write(gzip.compress(part) + b'\x00' * 4)
+        blocks = list(utils.gzip_stream(path=path, size=4096))
+        utilities.assert_true(expected=b''.join(parts), test=b''.join(blocks), msg=self._MSG1)
+        utilities.assert_true(expected=True,
+                              test=all(len(b) <= 4096 for b in blocks),
+                              msg=self._MSG1)
+        with open(path, 'wb') as f:
+            f.write(gzip.compress(parts[1])[:-4])
+        with self.assertRaises(EOFError):
+            list(utils.gzip_stream(path=path))
+
+    def test10__5__gzip_decompress_binary(self):
+        """Test the ``gzip_decompress`` method in binary mode.
+
+        :Test:
+            - Decompress a file of random bytes in binary mode, to a
+              given output path.
+            - Verify the output matches the original data.
+
+        """
+        path = os.path.join(self._DIR_TMP, 'rand_bin.gz')
+        out_path = os.path.join(self._DIR_TMP, 'rand_bin.out')
+        data = os.urandom(1 << 18)
+        with open(path, 'wb') as f:
+            f.write(gzip.compress(data))
+        test1 = utils.gzip_decompress(path=path, size=1000, binary=True, out_path=out_path)
+        with open(out_path, 'rb') as f:
+            test2 = f.read() == data
+        utilities.assert_true_pyiter(expected=[True, True], test=[test1, test2], msg=self._MSG1)
+
     def test07__ping__127001(self):
         """Test the ``ping`` method, on 127.0.0.1.
 
@@ -23,9 +23,16 @@
 # pylint: disable=import-error
 # pylint: disable=import-outside-toplevel
 
+import bz2
+import lzma
 import os
+import sqlite3
 import sys
+import tarfile
+import tempfile
+import zipfile
 from glob import glob
+from unittest import mock
 from pip._internal.utils.appdirs import user_cache_dir
 # locals
 from base import TestBase
@@ -129,6 +136,34 @@ class TestFutils(TestBase):
             with self.subTest(msg=f'File: {f}'):
                 self.assertTrue(utils.isbinary(f))
 
+    def test02c__isbinary__generated(self):
+        """Test the ``isbinary`` method with a single non-printable byte.
+
+        :Test:
+            - Create a plain-text file larger than the minimum chunk
+              size, containing tabs and newlines.
+            - Verify the file is detected as plain-text.
+            - For various positions (including within the trailing,
+              partial word and after the first chunk), replace a single
+              byte with a non-printable byte and verify the file is
+              detected as binary.
+
+        """
+        text = bytearray(b'Lorem ipsum,\tdolor sit amet.\r\n' * 5000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'file.txt')
+            with open(path, 'wb') as f:
+                f.write(text)
+            self.assertFalse(utils.isbinary(path))
+            for pos in (0, 7, 8, 65535, 65536, 100001, len(text)-1):
+                for byte in (0x00, 0x7f, 0x80, 0xff):
+                    with self.subTest(msg=f'Position: {pos}; byte: {byte}'):
+                        data = text.copy()
+                        data[pos] = byte
+                        with open(path, 'wb') as f:
+                            f.write(data)
+                        self.assertTrue(utils.isbinary(path))
+
     def test03a__iszip__plaintext(self):
         """Test the ``iszip`` method with plain-text files.
 
@@ -314,3 +349,132 @@ class TestFutils(TestBase):
         for f in files:
             with self.subTest(msg=f'File: {f}'):
                 self.assertTrue(utils.isgzip(f))
+
+    def test07a__sniff__resources(self):
+        """Test the ``sniff`` method with the resource files.
+
+        :Test:
+            - For each PDF, GZIP and 7-zip file in the resources
+              directory, verify the detected type agrees with the
+              file extension.
+
+        """
+        exts = {'.7z': '7zip', '.gz': 'gzip', '.pdf': 'pdf'}
+        files = glob(os.path.join(self._DIR_DATA, '*.*'))
+        for f in files:
+            with self.subTest(msg=f'File: {f}'):
+                exp = exts[os.path.splitext(f)[1]]
+                self.assertEqual(exp, utils.sniff(f))
+
+    def test07b__sniff__generated(self):
+        """Test the ``sniff`` method with generated archives.
+
+        :Test:
+            - Create a bzip2, xz, ZIP, tar and SQLite file in a
+              temporary directory using the standard library.
+            - Verify each file type is detected as expected.
+            - Verify plain-text files are detected as unknown and a
+              missing file returns an error.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            exp = {}
+            path = os.path.join(tmp, 'file.bz2')
+            with bz2.open(path, 'wb') as f:
+                f.write(b'data')
+            exp[path] = 'bzip2'
+            path = os.path.join(tmp, 'file.xz')
+            with lzma.open(path, 'wb') as f:
+                f.write(b'data')
+            exp[path] = 'xz'
+            path = os.path.join(tmp, 'file.zip')
+            with zipfile.ZipFile(path, 'w') as f:
+                f.writestr('data.txt', 'data')
+            exp[path] = 'zip'
+            path = os.path.join(tmp, 'file.tar')
+            with tarfile.open(path, 'w', format=tarfile.USTAR_FORMAT) as f:
+                f.add(__file__, arcname='data.py')
+            exp[path] = 'tar'
+            path = os.path.join(tmp, 'file.db')
+            with sqlite3.connect(path) as cnxn:
+                cnxn.execute('create table t (x int)')
+            cnxn.close()
+            exp[path] = 'sqlite'
+            exp[__file__] = 'unknown'
+            exp[os.path.join(tmp, 'missing')] = 'error'
+            for path, e in exp.items():
+                with self.subTest(msg=f'File: {path}'):
+                    self.assertEqual(e, utils.sniff(path))
+
+    def test07c__sniff_many(self):
+        """Test the ``sniff_many`` method.
+
+        :Test:
+            - Verify the results for a list of files match the results
+              from the ``sniff`` method, in order.
+            - Verify an empty list returns an empty list.
+
+        """
+        files = glob(os.path.join(self._DIR_DATA, '*.*'))
+        files += glob(os.path.join(self._DIR_ROOT, 'utils4', '*.py'))
+        self.assertEqual([utils.sniff(f) for f in files], utils.sniff_many(files))
+        self.assertEqual([], utils.sniff_many([]))
+
+    def test08a__scan_tree(self):
+        """Test the ``scan_tree`` method against the individual checks.
+
+        :Test:
+            - Scan the resources directory using multiple workers.
+            - Verify every file is yielded exactly once.
+            - Verify each result agrees with the individual ``is*``
+              functions.
+
+        """
+        funcs = {'ascii': utils.isascii, 'binary': utils.isbinary,
+                 '7zip': utils.is7zip, 'gzip': utils.isgzip,
+                 'pdf': utils.ispdf, 'zip': utils.iszip}
+        files = glob(os.path.join(self._DIR_DATA, '*'))
+        results = dict(utils.scan_tree(self._DIR_DATA, workers=4))
+        self.assertEqual(sorted(files), sorted(results))
+        for path, result in results.items():
+            with self.subTest(msg=f'File: {path}'):
+                self.assertEqual({**{k: f(path) for k, f in funcs.items()}, 'error': False},
+                                 result)
+
+    def test08b__scan_tree__checks(self):
+        """Test the ``scan_tree`` method with a subset of checks.
+
+        :Test:
+            - Verify only the requested checks, and the error flag, are
+              returned.
+            - Verify a ValueError is raised for an invalid check.
+
+        """
+        for _, result in utils.scan_tree(self._DIR_DATA, checks=('pdf', 'ascii')):
+            self.assertEqual(['pdf', 'ascii', 'error'], list(result))
+        with self.assertRaises(ValueError):
+            next(utils.scan_tree(self._DIR_DATA, checks=('exe',)))
+
+    def test08c__scan_tree__errors(self):
+        """Test the ``scan_tree`` method with awkward and unreadable files.
+
+        :Test:
+            - Create a file whose name is not valid UTF-8, and verify it is
+              classified by the ``is*`` functions and ``scan_tree``.
+            - Simulate a file being removed after the walk, and verify it
+              is reported with the error flag, rather than as ASCII.
+
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, os.fsdecode(b'caf\xe9.txt'))
+            with open(path, 'w', encoding='ascii') as f:
+                f.write('spam and eggs')
+            self.assertTrue(utils.isascii(path))
+            self.assertFalse(utils.iszip(path))
+            self.assertEqual([(path, {'ascii': True, 'zip': False, 'error': False})],
+                             list(utils.scan_tree(tmp, checks=('ascii', 'zip'))))
+            missing = os.path.join(tmp, 'missing.txt')
+            with mock.patch.object(utils.filesys, 'iterfiles',
+                                   return_value=[mock.Mock(path=missing)]):
+                test = list(utils.scan_tree(tmp, checks=('ascii', 'zip')))
+            self.assertEqual([(missing, {'ascii': False, 'zip': False, 'error': True})], test)
@@ -32,8 +32,10 @@
 # pylint: disable=no-name-in-module
 # pylint: disable=too-many-public-methods
 
+import array
 import ctypes
 import sys
+import numpy as np
 try:
     from .base import TestBase
     from .testlibs import msgs
@@ -267,6 +269,53 @@ class TestMathfunc(TestBase):
             with self.subTest(msg=f'exp={e} test={t}'):
                 utilities.assert_true_pyiter(expected=e, test=t, msg=self._MSG1)
 
+    def test02__esieve_range_vs_esieve(self):
+        """Test the ``esieve_range`` method against ``esieve``.
+
+        :Test:
+            - Verify the primes for various [lo, hi) ranges up to 1M
+              match those returned by ``esieve``, including ranges which
+              span multiple segments.
+
+        """
+        ref = np.array(mathfunc.esieve(1_000_000, True), dtype=np.uint64)
+        inp = [(0, 10), (1, 3), (2, 3), (3, 100), (7919, 7920), (500_000, 1_000_000),
+               (0, 1_000_000), (123_457, 987_653)]
+        for lo, hi in inp:
+            with self.subTest(msg=f'lo={lo} hi={hi}'):
+                exp = ref[(ref >= lo) & (ref < hi)].tolist()
+                test = mathfunc.esieve_range(lo, hi)
+                utilities.assert_true(expected=np.uint64, test=test.dtype.type, msg=self._MSG1)
+                utilities.assert_true(expected=exp, test=test.tolist(), msg=self._MSG1)
+
+    def test02__esieve_range_empty(self):
+        """Test the ``esieve_range`` method for empty ranges.
+
+        :Test:
+            - Verify an empty array is returned for ranges containing no
+              primes, and where ``lo >= hi``.
+
+        """
+        for lo, hi in [(0, 0), (0, 2), (24, 29), (10, 5)]:
+            with self.subTest(msg=f'lo={lo} hi={hi}'):
+                test = mathfunc.esieve_range(lo, hi)
+                utilities.assert_true(expected=0, test=len(test), msg=self._MSG1)
+
+    def test02__esieve_range_large(self):
+        """Test the ``esieve_range`` method for large bounds.
+
+        :Test:
+            - Verify the first and last primes in a block above 1e11.
+            - Verify a ``ValueError`` is raised for an upper bound
+              greater than 2**63.
+
+        """
+        test = mathfunc.esieve_range(10**11, 10**11 + 1000)
+        utilities.assert_true(expected=100000000003, test=int(test[0]), msg=self._MSG1)
+        utilities.assert_true(expected=100000000951, test=int(test[-1]), msg=self._MSG1)
+        with self.assertRaises(ValueError):
+            mathfunc.esieve_range(0, (1 << 63) + 1)
+
     def test06__fib(self):
         """Test the ``fib`` method.
 
@@ -308,6 +357,57 @@ class TestMathfunc(TestBase):
                 test = mathfunc.fib_index(i)
                 utilities.assert_true(expected=e, test=test, msg=self._MSG1)
 
+    def test06__fib_large(self):
+        """Test the ``fib`` method beyond 64-bit values.
+
+        :Test:
+            - Verify the sequence continues exactly past F(93), the
+              largest value to fit into 64 bits, by comparing against
+              a pure Python generation.
+
+        """
+        exp = [0, 1]
+        for _ in range(298):
+            exp.append(exp[-1] + exp[-2])
+        test = mathfunc.fib(299)
+        utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
+    def test06__fib_iter(self):
+        """Test the ``fib_iter`` lazy iterator.
+
+        :Test:
+            - Verify the iterator is its own iterator.
+            - Verify the first 500 values match the ``fib`` method.
+            - Verify the ``FibIter`` type cannot be instantiated directly.
+
+        """
+        it = mathfunc.fib_iter()
+        test = [next(it) for _ in range(500)]
+        utilities.assert_true(expected=True, test=iter(it) is it, msg=self._MSG1)
+        utilities.assert_true(expected=mathfunc.fib(499), test=test, msg=self._MSG1)
+        with self.assertRaises(TypeError):
+            mathfunc.FibIter()
+
+    def test06__fib_nth(self):
+        """Test the ``fib_nth`` method.
+
+        :Test:
+            - Verify F(n) matches the ``fib`` sequence for each index
+              on either side of the 64-bit boundary.
+            - Verify the bit length of a very large F(n).
+            - Verify a ValueError is raised for a negative index.
+
+        """
+        exp = mathfunc.fib(1000)
+        test = [mathfunc.fib_nth(i) for i in range(1001)]
+        utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+        # F(100000) contains 20899 digits, or 69424 bits.
+        utilities.assert_true(expected=69424,
+                              test=mathfunc.fib_nth(100000).bit_length(),
+                              msg=self._MSG1)
+        with self.assertRaises(ValueError):
+            mathfunc.fib_nth(-1)
+
     def test03__gcd(self):
         """Test the ``gcd`` method.
 
@@ -417,6 +517,37 @@ class TestMathfunc(TestBase):
                 test = mathfunc.is_prime(i)
                 utilities.assert_true(expected=0, test=test, msg=self._MSG1)
 
+    def test05__is_prime_64bit(self):
+        """Test the ``is_prime`` method for large 64-bit inputs.
+
+        :Test:
+            - Verify large 64-bit primes are identified as prime.
+            - Verify strong pseudoprimes (to several bases) and large
+              composites are identified as composite.
+
+        """
+        inp = [(4294967291, 1), (1000000000000000003, 1),
+               (9223372036854775783, 1), (18446744073709551557, 1),
+               (3215031751, 0), (341550071728321, 0),
+               (3825123056546413051, 0), (18446744073709551559, 0),
+               (4294967291 * 4294967279, 0)]
+        for i, e in inp:
+            with self.subTest(msg=f'input={i} exp={e}'):
+                test = mathfunc.is_prime(i)
+                utilities.assert_true(expected=e, test=test, msg=self._MSG1)
+
+    def test05__is_prime_vs_esieve(self):
+        """Test the ``is_prime`` method against the ``esieve`` method.
+
+        :Test:
+            - Verify ``is_prime`` agrees with the sieve for all values
+              up to 100K.
+
+        """
+        exp = mathfunc.esieve(100_000, False)
+        test = [mathfunc.is_prime(i) for i in range(100_000)]
+        utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
     def test08__is_triangular_true(self):
         """Test the ``is_triangular`` method.
 
@@ -677,3 +808,151 @@ class TestMathfunc(TestBase):
             with self.subTest(msg=f'input={i}'):
                 test = mathfunc.phi(i)
                 utilities.assert_true(expected=e, test=test, msg=self._MSG1)
+
+    def test21__vec_unary(self):
+        """Test the vectorised unary methods.
+
+        :Test:
+            - Verify each ``*_vec`` method returns the same values as its
+              scalar counterpart, for a range of integers.
+
+        """
+        inp = np.arange(1, 2000, dtype=np.int64)
+        funcs = ('digits', 'int_nbits', 'is_palindrome_num', 'is_pandigital',
+                 'is_pentagonal', 'is_perfect', 'is_prime', 'is_triangular',
+                 'phi', 'reverse', 'rotate')
+        for f in funcs:
+            with self.subTest(msg=f'func={f}'):
+                exp = [getattr(mathfunc, f)(int(i)) for i in inp]
+                test = getattr(mathfunc, f'{f}_vec')(inp)
+                utilities.assert_true(expected=len(inp), test=len(test), msg=self._MSG1)
+                self.assertTrue(all(int(t) == e for t, e in zip(test, exp)))
+
+    def test22__vec_binary(self):
+        """Test the vectorised binary methods.
+
+        :Test:
+            - Verify each ``*_vec`` method returns the same values as its
+              scalar counterpart, for arrays of integer pairs.
+
+        """
+        a = np.arange(1, 500, dtype=np.int64)
+        b = a[::-1].copy()
+        for f in ('gcd', 'intconcat', 'is_permutation', 'lcm'):
+            with self.subTest(msg=f'func={f}'):
+                exp = [getattr(mathfunc, f)(int(i), int(j)) for i, j in zip(a, b)]
+                test = getattr(mathfunc, f'{f}_vec')(a, b)
+                self.assertTrue(all(int(t) == e for t, e in zip(test, exp)))
+
+    def test23__vec_dtypes(self):
+        """Test the vectorised methods with varying input buffer types.
+
+        :Test:
+            - Verify numpy arrays of various integer dtypes and an
+              ``array.array`` are all accepted.
+            - Verify the output dtypes are as expected.
+
+        """
+        exp = [0, 0, 1, 1, 0, 1, 0, 1, 0, 0]
+        for dtype in (np.int8, np.uint8, np.int16, np.int32, np.uint32, np.int64):
+            with self.subTest(msg=f'dtype={dtype}'):
+                test = mathfunc.is_prime_vec(np.arange(10, dtype=dtype))
+                utilities.assert_true(expected=np.bool_, test=test.dtype.type, msg=self._MSG1)
+                utilities.assert_true(expected=exp, test=test.tolist(), msg=self._MSG1)
+        test = mathfunc.digits_vec(array.array('l', [-7, 0, 123, -4567]))
+        utilities.assert_true(expected=np.int64, test=test.dtype.type, msg=self._MSG1)
+        utilities.assert_true(expected=[1, 1, 3, 4], test=test.tolist(), msg=self._MSG1)
+
+    def test24__vec_errors(self):
+        """Test the vectorised methods raise errors for invalid input.
+
+        :Test:
+            - Verify a ``TypeError`` is raised for a float array.
+            - Verify a ``TypeError`` is raised for a non-buffer object.
+            - Verify a ``ValueError`` is raised for mismatched lengths.
+            - Verify an ``OverflowError`` is raised for unsigned 64-bit
+              values above the int64 range, and values within the range
+              are accepted.
+            - Verify the LCM of a (0, 0) pair is 0, rather than
+              dividing by zero.
+
+        """
+        with self.assertRaises(TypeError):
+            mathfunc.is_prime_vec(np.arange(5, dtype=float))
+        with self.assertRaises(TypeError):
+            mathfunc.is_prime_vec([1, 2, 3])
+        with self.assertRaises(ValueError):
+            mathfunc.gcd_vec(np.arange(5), np.arange(4))
+        big = np.array([7, 2**64 - 59], dtype=np.uint64)
+        with self.assertRaises(OverflowError):
+            mathfunc.is_prime_vec(big)
+        with self.assertRaises(OverflowError):
+            mathfunc.gcd_vec(np.arange(2, dtype=np.uint64), big)
+        with self.assertRaises(OverflowError):
+            mathfunc.digits_vec(array.array('Q', [2**63]))
+        test = mathfunc.is_prime_vec(np.array([2**63 - 25, 2**63 - 1], dtype=np.uint64))
+        utilities.assert_true(expected=[True, False], test=test.tolist(), msg=self._MSG1)
+        test = mathfunc.lcm_vec(np.array([0, 0, 4]), np.array([0, 6, 6]))
+        utilities.assert_true(expected=[0, 0, 12], test=test.tolist(), msg=self._MSG1)
+
+    def test25__factorise(self):
+        """Test the ``factorise`` method.
+
+        :Test:
+            - Verify the (prime, exponent) pairs for a series of inputs,
+              including 64-bit semiprimes which require Pollard's rho.
+
+        """
+        inp = [0, 1, 7, 360, 123456, 987654321, (1 << 64) - 1,
+               4294967291 * 4294967279, 18446744073709551557]
+        exp = [[], [], [(7, 1)], [(2, 3), (3, 2), (5, 1)],
+               [(2, 6), (3, 1), (643, 1)], [(3, 2), (17, 2), (379721, 1)],
+               [(3, 1), (5, 1), (17, 1), (257, 1), (641, 1), (65537, 1), (6700417, 1)],
+               [(4294967279, 1), (4294967291, 1)], [(18446744073709551557, 1)]]
+        for i, e in zip(inp, exp):
+            with self.subTest(msg=f'input={i} exp={e}'):
+                test = mathfunc.factorise(i)
+                utilities.assert_true(expected=e, test=test, msg=self._MSG1)
+
+    def test26__sigma(self):
+        """Test the ``sigma`` method.
+
+        :Test:
+            - Verify the sum of divisors against a brute force sum.
+            - Verify an ``OverflowError`` is raised if the sum exceeds
+              64 bits.
+
+        """
+        for i in (1, 2, 12, 28, 360, 997, 1024, 5040):
+            with self.subTest(msg=f'input={i}'):
+                exp = sum(d for d in range(1, i+1) if not i % d)
+                test = mathfunc.sigma(i)
+                utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+        with self.assertRaises(OverflowError):
+            mathfunc.sigma((1 << 64) - 1)
+
+    def test27__num_divisors(self):
+        """Test the ``num_divisors`` method.
+
+        :Test:
+            - Verify the number of divisors against a brute force count.
+
+        """
+        for i in (1, 2, 12, 28, 360, 997, 1024, 5040):
+            with self.subTest(msg=f'input={i}'):
+                exp = sum(1 for d in range(1, i+1) if not i % d)
+                test = mathfunc.num_divisors(i)
+                utilities.assert_true(expected=exp, test=test, msg=self._MSG1)
+
+    def test28__is_perfect_large(self):
+        """Test the ``is_perfect`` method for large perfect numbers.
+
+        :Test:
+            - Verify the 6th, 7th and 8th perfect numbers are identified,
+              and their neighbours are not.
+
+        """
+        for i in (8589869056, 137438691328, 2305843008139952128):
+            with self.subTest(msg=f'input={i}'):
+                utilities.assert_true(expected=1, test=mathfunc.is_perfect(i), msg=self._MSG1)
+                utilities.assert_true(expected=0, test=mathfunc.is_perfect(i+2), msg=self._MSG1)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+:Purpose:   Testing module for the ``xxhash`` module.
+
+:Note:
+            This test module tests the **installed** ``utils4.xxhash``
+            module, as this is a C implementation and therefore cannot be
+            tested directly. Preferably, there should be an
+            *dev release* of utils4 which can be installed locally where
+            this module can be tested.
+
+:Developer: J Berendt
+:Email:     development@s3dev.uk
+
+:Comments:  Because this test module fiddles with (**destroys**)
+            ``sys.path`` and ``sys.modules``, it's best to ensure this
+            test runs **last**. Hence the ``_x_`` in the test module
+            name.
+
+"""
+# pylint: disable=global-statement
+# pylint: disable=import-error
+# pylint: disable=import-outside-toplevel
+
+import os
+import sys
+import tempfile
+# locals
+from base import TestBase
+from testlibs import msgs
+from testlibs.utilities import utilities
+crypto = None  # Global placeholder for import
+xxhash = None  # Global placeholder for import
+
+
+class TestXXHash(TestBase):
+    """Testing class used to test the ``xxhash`` module."""
+
+    _MSG1 = msgs.templates.not_as_expected.general
+    # Reference XXH64 digests (seed=0), from the xxHash specification.
+    _VECTORS = {b'': 'ef46db3751d8e999',
+                b'abc': '44bc2cf5ad770999',
+                b'Nobody inspects the spammish repetition': 'fbcea83c8a378bf1'}
+
+    @classmethod
+    def setUpClass(cls):
+        """Tasks to be run at the testing startup.
+
+        :Tasks:
+            - Print the start of test message.
+            - Hack ``sys.modules`` and ``sys.path`` to allow import from
+              *installed* ``utils4`` for C library testing.
+
+        """
+        msgs.startoftest.startoftest(module_name='xxhash')
+        # Clear utils4 from imports to allow re-import from installed.
+        keys = [k for k in sys.modules if 'utils4' in k]
+        for k in keys:
+            del sys.modules[k]
+        # Force import from *installed* library.
+        sys.path = [i for i in map(str.lower, sys.path) if 'python' in i or 'site-packages' in i]
+        from utils4 import xxhash as xxhash_
+        from utils4.crypto import crypto as crypto_
+        # Export the imports to global namespace.
+        global crypto, xxhash
+        crypto = crypto_
+        xxhash = xxhash_
+
+    def test01__xxh64_hexdigest(self):
+        """Test the ``xxh64_hexdigest`` function.
+
+        :Test:
+            - Verify the digest for each reference vector.
+
+        """
+        test = [xxhash.xxh64_hexdigest(k) for k in self._VECTORS]
+        utilities.assert_true(expected=list(self._VECTORS.values()), test=test, msg=self._MSG1)
+
+    def test02__xxh64__streaming(self):
+        """Test the streaming ``xxh64`` hasher.
+
+        :Test:
+            - Hash random data of an odd length in irregular chunks,
+              exercising the partial-stripe buffering.
+            - Verify the digest matches the single-shot digest, with a
+              seed.
+            - Verify the ``digest``, ``intdigest`` and ``copy`` methods
+              agree with ``hexdigest``.
+            - Verify ``reset`` returns the hasher to the seeded, empty
+              state.
+
+        """
+        data = os.urandom((1 << 20) + 37)
+        h = xxhash.xxh64(seed=42)
+        for i in range(0, len(data), 7777):
+            h.update(data[i:i+7777])
+        exp = xxhash.xxh64_hexdigest(data, seed=42)
+        test1 = [h.hexdigest(), h.digest().hex(), f'{h.intdigest():016x}', h.copy().hexdigest()]
+        h.reset()
+        test2 = [h.hexdigest(), h.seed, h.name, h.digest_size]
+        exp2 = [xxhash.xxh64_hexdigest(b'', seed=42), 42, 'xxh64', 8]
+        utilities.assert_true(expected=[[exp]*4, exp2],
+                              test=[test1, test2],
+                              msg=self._MSG1)
+
+    def test03__xxh64_file(self):
+        """Test the ``xxh64_file`` function.
+
+        :Test:
+            - Write random data to a file and verify the file's digest
+              matches the digest of the data.
+            - Verify the ``crypto.checksum_xxh64`` method agrees.
+            - Verify an OSError is raised for a file which does not
+              exist.
+
+        """
+        data = os.urandom((3 << 20) + 11)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.bin')
+            with open(path, 'wb') as f:
+                f.write(data)
+            test = [xxhash.xxh64_file(path), crypto.checksum_xxh64(path=path)]
+            with self.assertRaises(OSError):
+                xxhash.xxh64_file(os.path.join(tmp, 'missing.bin'))
+        utilities.assert_true(expected=[xxhash.xxh64_hexdigest(data)]*2, test=test, msg=self._MSG1)
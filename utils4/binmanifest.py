@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+:Purpose:   This module provides a compact, authenticated, binary file
+            manifest, mapping file paths to checksum digests.
+
+            The manifest supports lookup of a single path, and partial
+            verification, by reading and authenticating only the blocks
+            required, rather than decoding the whole file.
+
+:Developer: J Berendt
+:Email:     development@s3dev.uk
+
+:Comments:  The manifest is authenticated (using HMAC-SHA256), but *not*
+            encrypted. The paths and digests can be read by anyone with
+            access to the file; however, any modification is detected
+            by anyone holding the key.
+
+:Layout:
+
+    All integers are little-endian. The file contains the following
+    sections, in order:
+
+    - **Header:** Magic (``U4BM``), version, digest size, algorithm name
+      length, a reserved byte, the number of entries, and the number of
+      entries per block; followed by the algorithm name.
+    - **Header tag:** HMAC over the header and all block tags.
+    - **Block tags:** One HMAC per block, over the block number, the
+      header, the block's slice of the offset index and the block's
+      records.
+    - **Offset index:** ``count + 1`` unsigned 64-bit offsets to each
+      record, relative to the start of the records section. The last
+      offset is the length of the records section.
+    - **Records:** For each entry, sorted by the UTF-8 encoded path:
+      a 16-bit path length, the UTF-8 encoded path, and the raw digest.
+
+:Example:
+
+    Write a manifest::
+
+        >>> import os
+        >>> from utils4.binmanifest import BinaryManifest
+
+        >>> key = os.urandom(32)
+        >>> BinaryManifest.write(path='/tmp/files.bm',
+                                 entries={'/tmp/a.txt': '9ec06901e8f25eb9810c5e0db88e7dcd'},
+                                 algorithm='md5',
+                                 key=key)
+
+
+    Look up a single path::
+
+        >>> with BinaryManifest(path='/tmp/files.bm', key=key) as mfst:
+        >>>     print(mfst.get('/tmp/a.txt'))
+
+        9ec06901e8f25eb9810c5e0db88e7dcd
+
+"""
+
+import hashlib
+import hmac
+import mmap
+import struct
+from typing import Generator, Iterable, Union
+
+_MAGIC = b'U4BM'
+_VERSION = 1
+_HEADER = struct.Struct('<4sBBBBQI')
+_TAGSZ = 32
+_REC = struct.Struct('<H')
+_OFF = struct.Struct('<Q')
+
+
+class BinaryManifest:
+    """Read-only access to a binary manifest.
+
+    Args:
+        path (str): Full path to the manifest file.
+        key (bytes): Key used to authenticate the manifest.
+
+    :Design:
+        The file is memory-mapped, and only the header and block tags are
+        authenticated on open. Lookups binary search the offset index,
+        then authenticate only the block(s) holding the neighbouring
+        records. As the records are sorted, this also proves a path is
+        *not* in the manifest. Each block is authenticated at most once.
+
+    Raises:
+        ValueError: If the file is not a binary manifest, or if the
+            manifest fails authentication.
+
+    """
+
+    def __init__(self, path: str, key: bytes):
+        """Binary manifest class initialiser."""
+        self._path = path
+        self._key = key
+        self._verified = set()
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def __contains__(self, path: str) -> bool:
+        """Test if a path is in the manifest."""
+        return self.get(path) is not None
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, *args):
+        """Context manager exit point; close the manifest."""
+        self.close()
+
+    def __getitem__(self, path: str) -> str:
+        """Return the hex digest for a path.
+
+        Raises:
+            KeyError: If the path is not in the manifest.
+
+        """
+        if (digest := self.get(path)) is None:
+            raise KeyError(path)
+        return digest
+
+    def __iter__(self) -> Generator[str, None, None]:
+        """Iterate over the paths, in sorted order."""
+        for path, _ in self.items():
+            yield path
+
+    def __len__(self) -> int:
+        """Return the number of entries in the manifest."""
+        return self._count
+
+    @property
+    def algorithm(self) -> str:
+        """Accessor to the name of the checksum algorithm."""
+        return self._algorithm
+
+    @property
+    def path(self) -> str:
+        """Accessor to the path of the manifest file."""
+        return self._path
+
+    @staticmethod
+    def is_manifest(path: str) -> bool:
+        """Test if a file is a binary manifest, by its leading bytes.
+
+        Args:
+            path (str): Full path to the file.
+
+        Returns:
+            bool: True if the file starts with the manifest's magic bytes,
+            otherwise False.
+
+        """
+        with open(path, 'rb') as f:
+            return f.read(len(_MAGIC)) == _MAGIC
+
+    @staticmethod
+    def write(path: str,
+              entries: Union[dict, Iterable[tuple]],
+              algorithm: str,
+              key: bytes,
+              block_size: int=1024):
+        """Write a binary manifest.
+
+        Args:
+            path (str): Full path to the manifest file.
+            entries (Union[dict, Iterable[tuple]]): A dictionary, or
+                iterable of tuples, of ``(path, hexdigest)``.
+            algorithm (str): Name of the checksum algorithm.
+            key (bytes): Key used to authenticate the manifest.
+            block_size (int, optional): Number of entries per
+                authenticated block. Smaller blocks make lookups cheaper,
+                at the cost of 32 bytes per block. Defaults to 1024.
+
+        Raises:
+            ValueError: If a digest is not a hex string.
+
+        """
+        items = sorted((p.encode(), d) for p, d in dict(entries).items())
+        # Digests (e.g. CRC32) may not be zero-padded; size to the longest.
+        dsize = max((len(d) + 1) // 2 for _, d in items) if items else 0
+        hdr = _HEADER.pack(_MAGIC, _VERSION, dsize, len(algorithm), 0, len(items), block_size)
+        hdr += algorithm.encode()
+        offsets = [0]
+        records = bytearray()
+        for p, d in items:
+            records += _REC.pack(len(p))
+            records += p
+            records += bytes.fromhex(d.zfill(dsize * 2))
+            offsets.append(len(records))
+        index = struct.pack(f'<{len(offsets)}Q', *offsets)
+        tags = bytearray()
+        for b, first in enumerate(range(0, len(items), block_size)):
+            last = min(first + block_size, len(items))
+            tags += BinaryManifest._block_tag(key=key,
+                                              header=hdr,
+                                              block=b,
+                                              index=index[first*_OFF.size:(last+1)*_OFF.size],
+                                              records=records[offsets[first]:offsets[last]])
+        with open(path, 'wb') as f:
+            f.write(hdr)
+            f.write(hmac.digest(key, hdr + tags, hashlib.sha256))
+            f.write(tags)
+            f.write(index)
+            f.write(records)
+
+    def close(self):
+        """Close the manifest file."""
+        self._mm.close()
+
+    def get(self, path: str, default: str=None) -> Union[str, None]:
+        """Return the hex digest for a path.
+
+        Args:
+            path (str): Path to be found.
+            default (str, optional): Value returned if the path is not
+                found. Defaults to None.
+
+        Raises:
+            ValueError: If a block read by the lookup fails authentication.
+
+        Returns:
+            Union[str, None]: The hex digest, if found. Otherwise the
+            ``default`` value.
+
+        """
+        target = path.encode()
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record(mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        # Authenticate the neighbouring records, then re-test.
+        for i in {max(lo - 1, 0), min(lo, self._count - 1)} if self._count else ():
+            self._verify_block(i // self._bsize)
+        if lo < self._count and (rec := self._record(lo))[0] == target:
+            return rec[1].hex()
+        if ((lo == 0 or self._record(lo - 1)[0] < target)
+                and (lo == self._count or self._record(lo)[0] > target)):
+            return default
+        raise ValueError(f'Manifest index is inconsistent: {self._path}')
+
+    def items(self) -> Generator[tuple[str, str], None, None]:
+        """Iterate over the entries, authenticating each block in turn.
+
+        Raises:
+            ValueError: If a block fails authentication.
+
+        Yields:
+            tuple: A ``(path, hexdigest)`` tuple for each entry, sorted
+            by path.
+
+        """
+        for i in range(self._count):
+            if i % self._bsize == 0:
+                self._verify_block(i // self._bsize)
+            p, d = self._record(i)
+            yield p.decode(), d.hex()
+
+    def verify(self) -> bool:
+        """Authenticate every block in the manifest.
+
+        Returns:
+            bool: True if all blocks are authentic, otherwise False.
+
+        """
+        try:
+            for b in range(self._nblocks):
+                self._verify_block(b)
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def _block_tag(key: bytes, header: bytes, block: int, index: bytes, records: bytes) -> bytes:
+        """Calculate the authentication tag for a block.
+
+        Args:
+            key (bytes): Authentication key.
+            header (bytes): The manifest header, including the algorithm.
+            block (int): Block number.
+            index (bytes): The block's slice of the offset index, including
+                the offset to the following block.
+            records (bytes): The block's records.
+
+        Returns:
+            bytes: The HMAC-SHA256 tag.
+
+        """
+        h = hmac.new(key, _OFF.pack(block), hashlib.sha256)
+        h.update(header)
+        h.update(index)
+        h.update(records)
+        return h.digest()
+
+    def _read_header(self):
+        """Read the header, and authenticate it against the block tags.
+
+        Raises:
+            ValueError: If the file is not a binary manifest, or the header
+                fails authentication.
+
+        """
+        mm = self._mm
+        if len(mm) < _HEADER.size or mm[:len(_MAGIC)] != _MAGIC:
+            raise ValueError(f'Not a binary manifest: {self._path}')
+        _, ver, self._dsize, alen, _, self._count, self._bsize = _HEADER.unpack_from(mm)
+        if ver != _VERSION:
+            raise ValueError(f'Unsupported binary manifest version: {ver}')
+        self._hdrlen = _HEADER.size + alen
+        self._algorithm = mm[_HEADER.size:self._hdrlen].decode()
+        self._nblocks = -(-self._count // self._bsize)
+        self._tags = self._hdrlen + _TAGSZ
+        self._index = self._tags + self._nblocks * _TAGSZ
+        self._records = self._index + (self._count + 1) * _OFF.size
+        tag = hmac.digest(self._key, mm[:self._hdrlen] + mm[self._tags:self._index], hashlib.sha256)
+        if not hmac.compare_digest(tag, mm[self._hdrlen:self._tags]):
+            raise ValueError(f'Binary manifest failed authentication: {self._path}')
+
+    def _record(self, i: int) -> tuple[bytes, bytes]:
+        """Read the record at the given position.
+
+        Args:
+            i (int): Position of the record.
+
+        Raises:
+            ValueError: If the record's offset is outside of the file.
+
+        Returns:
+            tuple: The ``(path, digest)`` as raw bytes.
+
+        """
+        try:
+            pos = self._records + _OFF.unpack_from(self._mm, self._index + i * _OFF.size)[0]
+            (plen,) = _REC.unpack_from(self._mm, pos)
+        except struct.error as err:
+            raise ValueError(f'Binary manifest is corrupt: {self._path}') from err
+        pos += _REC.size
+        return self._mm[pos:pos + plen], self._mm[pos + plen:pos + plen + self._dsize]
+
+    def _verify_block(self, block: int):
+        """Authenticate a block, if not already authenticated.
+
+        Args:
+            block (int): Block number.
+
+        Raises:
+            ValueError: If the block fails authentication.
+
+        """
+        if block in self._verified:
+            return
+        first = block * self._bsize
+        last = min(first + self._bsize, self._count)
+        index = self._mm[self._index + first * _OFF.size:self._index + (last + 1) * _OFF.size]
+        start, end = _OFF.unpack_from(index)[0], _OFF.unpack_from(index, len(index) - _OFF.size)[0]
+        tag = self._block_tag(key=self._key,
+                              header=self._mm[:self._hdrlen],
+                              block=block,
+                              index=index,
+                              records=self._mm[self._records + start:self._records + end])
+        pos = self._tags + block * _TAGSZ
+        if not hmac.compare_digest(tag, self._mm[pos:pos + _TAGSZ]):
+            raise ValueError(f'Binary manifest block {block} failed authentication: {self._path}')
+        self._verified.add(block)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+:Purpose:   This module provides a persistent, on-disk cache of file
+            checksums, enabling unchanged files to be verified without
+            being re-read.
+
+            Each entry is keyed on the file's device, inode, size and
+            modification time (in nanoseconds), along with the algorithm.
+            If any of these change, the cached digest is no longer found
+            and the file is re-hashed.
+
+:Developer: J Berendt
+:Email:     development@s3dev.uk
+
+:Comments:  The cache is stored in a SQLite database, using the
+            built-in ``sqlite3`` library.
+
+            The cache trusts the file's metadata. A file which has been
+            modified *and* had its size and modification time restored
+            will return a stale digest. Where this matters, pass
+            ``verify=True`` to the checksum method to bypass the cache.
+
+:Example:
+
+    Enable the cache for all ``crypto`` checksum methods::
+
+        >>> from utils4.crypto import crypto
+
+        >>> crypto.enable_cache()
+        >>> crypto.checksum_md5(path='/tmp/test.txt')  # Hashed and cached.
+        '9ec06901e8f25eb9810c5e0db88e7dcd'
+
+        >>> crypto.checksum_md5(path='/tmp/test.txt')  # From the cache.
+        '9ec06901e8f25eb9810c5e0db88e7dcd'
+
+
+    Use the cache directly::
+
+        >>> from utils4.checksumcache import ChecksumCache
+
+        >>> cache = ChecksumCache(path='/tmp/checksums.db', max_entries=1000)
+        >>> key = cache.key(path='/tmp/test.txt', algorithm='md5')
+        >>> cache.get(key)  # Not yet cached.
+        >>> cache.put(key=key, digest='9ec06901e8f25eb9810c5e0db88e7dcd',
+                      path='/tmp/test.txt')
+        True
+
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Union
+
+
+class ChecksumCache:
+    """Persistent checksum cache, with least-recently-used eviction.
+
+    Args:
+        path (str, optional): Full path to the cache database. If the
+            database does not exist, it is created. Defaults to None,
+            which uses ``~/.cache/utils4/checksums.db``.
+        max_entries (int, optional): Maximum number of entries held in the
+            cache. When exceeded, the least recently used entries are
+            evicted, down to 90% of this value. Defaults to 1,000,000.
+
+    :Design:
+        The database is opened in write-ahead-log (WAL) mode, with
+        ``synchronous=NORMAL``, so each write does not wait on a disk
+        sync. A single connection is shared between threads, with access
+        serialised by a lock. Therefore, the cache is safe to use from a
+        thread pool.
+
+        Each entry records a 'last used' timestamp, which is updated on
+        each hit and used to select the entries for eviction.
+
+    """
+
+    _DEFAULT = os.path.join(os.path.expanduser('~'), '.cache', 'utils4', 'checksums.db')
+    _WHERE = 'dev=? AND ino=? AND size=? AND mtime_ns=? AND algorithm=?'
+
+    def __init__(self, path: str=None, max_entries: int=1_000_000):
+        """Checksum cache class initialiser."""
+        self._path = path or self._DEFAULT
+        self._max = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.realpath(self._path)), exist_ok=True)
+        self._cnxn = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None)
+        self._cnxn.execute('PRAGMA journal_mode=WAL')
+        self._cnxn.execute('PRAGMA synchronous=NORMAL')
+        self._cnxn.execute('CREATE TABLE IF NOT EXISTS checksums ('
+                           'dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER, '
+                           'algorithm TEXT, digest TEXT, used INTEGER, '
+                           'PRIMARY KEY (dev, ino, size, mtime_ns, algorithm))')
+        self._cnxn.execute('CREATE INDEX IF NOT EXISTS ix_used ON checksums (used)')
+        self._count = len(self)
+
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, *args):
+        """Context manager exit point; close the cache."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of entries in the cache."""
+        with self._lock:
+            return self._cnxn.execute('SELECT COUNT(*) FROM checksums').fetchone()[0]
+
+    @property
+    def path(self) -> str:
+        """Accessor to the path of the cache database."""
+        return self._path
+
+    @staticmethod
+    def key(path: str, algorithm: str) -> tuple:
+        """Build the cache key for a file.
+
+        Args:
+            path (str): Full path to the file.
+            algorithm (str): Name of the checksum algorithm.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+
+        Returns:
+            tuple: The cache key, as::
+
+                (st_dev, st_ino, st_size, st_mtime_ns, algorithm)
+
+        """
+        st = os.stat(path)
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm.lower()
+
+    def clear(self):
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._cnxn.execute('DELETE FROM checksums')
+            self._count = 0
+
+    def close(self):
+        """Close the connection to the cache database."""
+        with self._lock:
+            self._cnxn.close()
+
+    def get(self, key: tuple) -> Union[str, None]:
+        """Retrieve a digest from the cache.
+
+        Args:
+            key (tuple): The cache key, as returned by :meth:`key`.
+
+        Returns:
+            Union[str, None]: The cached digest, if found. Otherwise None.
+
+        """
+        with self._lock:
+            row = self._cnxn.execute(f'SELECT digest FROM checksums WHERE {self._WHERE}',
+                                     key).fetchone()
+            if row:
+                self._cnxn.execute(f'UPDATE checksums SET used=? WHERE {self._WHERE}',
+                                   (time.time_ns(), *key))
+        return row[0] if row else None
+
+    def put(self, key: tuple, digest: str, path: str=None) -> bool:
+        """Store a digest in the cache.
+
+        Args:
+            key (tuple): The cache key, as returned by :meth:`key`, which
+                must have been built *before* the file was hashed.
+            digest (str): The digest to be stored.
+            path (str, optional): Full path to the file. If provided, the
+                file's key is rebuilt and the digest is only stored if the
+                file has not changed while being hashed. Defaults to None.
+
+        Returns:
+            bool: True if the digest was stored, otherwise False.
+
+        """
+        if path is not None:
+            try:
+                if self.key(path=path, algorithm=key[-1]) != key:
+                    return False
+            except OSError:
+                return False
+        with self._lock:
+            exists = self._cnxn.execute(f'SELECT 1 FROM checksums WHERE {self._WHERE}',
+                                        key).fetchone()
+            self._cnxn.execute('INSERT OR REPLACE INTO checksums '
+                               'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                               (*key, digest, time.time_ns()))
+            if not exists:
+                self._count += 1
+            if self._count > self._max:
+                self._evict()
+        return True
+
+    def _evict(self):
+        """Evict the least recently used entries from the cache.
+
+        The cache is reduced to 90% of ``max_entries``, so eviction is not
+        triggered again by the next insert.
+
+        Note:
+            The caller must hold the lock.
+
+        """
+        self._count = self._cnxn.execute('SELECT COUNT(*) FROM checksums').fetchone()[0]
+        n = self._count - int(self._max * 0.9)
+        if n > 0:
+            self._cnxn.execute('DELETE FROM checksums WHERE rowid IN '
+                               '(SELECT rowid FROM checksums ORDER BY used LIMIT ?)', (n,))
+            self._count -= n
@@ -34,22 +34,124 @@
         OWUxMDdkOWQzNzJiYjY4MjZiZDgxZDM1NDJhNDE5ZDY=
 
 
+    To build truncated Base64 MD5 surrogate keys for every row of a
+    DataFrame::
+
+        >>> df['key'] = crypto.b64md5_many(df[['name', 'dob']], trunc=16)
+
+
     For examples on checksumming a file, please refer to:
 
+        - :meth:`Crypto.checksum_blake2b`
         - :meth:`Crypto.checksum_crc32`
+        - :meth:`Crypto.checksum_many`
         - :meth:`Crypto.checksum_md5`
+        - :meth:`Crypto.checksum_multi`
         - :meth:`Crypto.checksum_sha1`
         - :meth:`Crypto.checksum_sha256`
         - :meth:`Crypto.checksum_sha512`
+        - :meth:`Crypto.checksum_xxh64`
 
 """
 # pylint: disable=invalid-name
 
 import base64
+import binascii
 import hashlib
+import mmap
+import os
 import zlib
-from typing import Union
+from concurrent.futures import (FIRST_COMPLETED,
+                                ProcessPoolExecutor,
+                                ThreadPoolExecutor,
+                                wait)
+from itertools import islice, repeat
+from typing import Generator, Iterable, Union
 from utils4 import convert
+from utils4.checksumcache import ChecksumCache
+try:
+    # The C library is only available if installed.
+    from . import xxhash  # pylint: disable=no-name-in-module
+except ImportError:
+    xxhash = None
+
+_SIZE = 1 << 20  # 1 MiB default chunk size.
+
+
+class _CRC32:
+    """Minimal ``hashlib``-style wrapper around ``zlib.crc32``.
+
+    This allows a CRC32 checksum to be calculated alongside ``hashlib``
+    digests, using the same ``update`` / ``hexdigest`` interface.
+
+    """
+
+    name = 'crc32'
+
+    def __init__(self):
+        """CRC32 wrapper class initialiser."""
+        self._crc = 0
+
+    def update(self, data: bytes):
+        """Update the checksum with a bytes-like object."""
+        self._crc = zlib.crc32(data, self._crc)
+
+    def hexdigest(self) -> str:
+        """Return the checksum as a hex string."""
+        return convert.int2hex(self._crc & 0xFFFFFFFF)
+
+
+def _md5_batch(rows: list, b64: bool=False, trunc: int=None) -> list:
+    """Calculate the (optionally Base64 encoded) MD5 hash for a batch of rows.
+
+    This function is defined at module level so it can be pickled and
+    sent to a process pool by :meth:`Crypto.b64md5_many`.
+
+    Args:
+        rows (list): Strings, or iterables of strings, to be hashed. Each
+            row is joined with ``''.join`` before hashing.
+        b64 (bool, optional): Base64 encode each hex digest, per
+            :meth:`Crypto.b64md5`. Defaults to False.
+        trunc (int, optional): Truncate each Base64 string to (n)
+            characters. Defaults to None.
+
+    Returns:
+        list: A list of hex digests, or (truncated) Base64 strings.
+
+    """
+    # Bind the per-row callables locally, to avoid repeated lookups.
+    b2a, join, md5 = binascii.b2a_base64, ''.join, hashlib.md5
+    if not b64:
+        return [md5(join(r).encode()).hexdigest() for r in rows]
+    if trunc and trunc > 0:
+        # Base64 encodes each 3 bytes to 4 characters, so only the leading
+        # hex characters which encode to the first (trunc) characters are
+        # needed.
+        n = -(-trunc // 4) * 3
+        return [b2a(md5(join(r).encode()).hexdigest()[:n].encode(), newline=False)[:trunc].decode()
+                for r in rows]
+    return [b2a(md5(join(r).encode()).hexdigest().encode(), newline=False)[:trunc or None].decode()
+            for r in rows]
+
+
+def _checksum_batch(paths: list, algorithm: str, size: int) -> list:
+    """Calculate the checksum for a batch of files.
+
+    This function is defined at module level so it can be pickled and
+    sent to a process pool by :meth:`Crypto.checksum_many`.
+
+    Args:
+        paths (list): Full paths to the files to be checksummed.
+        algorithm (str): Name of the algorithm to be used.
+        size (int): Size of the read buffer, in bytes.
+
+    Returns:
+        list: A list of ``(path, hexdigest)`` tuples.
+
+    """
+    # pylint: disable=protected-access
+    return [(p, Crypto._digest(path=p, algorithms=(algorithm,), size=size)[algorithm])
+            for p in paths]
 
 
 class Crypto:
@@ -58,8 +160,15 @@ class Crypto:
     This class acts as a simple wrapper around the ``base64`` and
     ``hashlib`` libraries, providing additional functionality.
 
+    If enabled via :meth:`enable_cache`, the ``checksum_*`` methods use a
+    persistent :class:`~utils4.checksumcache.ChecksumCache`, so unchanged
+    files are not re-read. Each method accepts a ``verify`` argument which
+    bypasses the cache lookup, forcing the file to be re-hashed.
+
     """
 
+    _cache = None
+
     def b64(self, data: str, decode: bool=True) -> Union[bytes, str]:
         """Create an encoded or decoded Base64 encryption.
 
@@ -100,14 +209,133 @@ class Crypto:
         b = b[:trunc] if trunc else b
         return b
 
+    def b64md5_many(self,
+                    data: Iterable,
+                    trunc: int=None,
+                    workers: int=None,
+                    chunksize: int=100_000) -> 'pd.Series':  # noqa: F821
+        """Create an optionally truncated Base64 encoded MD5 hash for each
+        row of a pandas Series, DataFrame or iterable.
+
+        Each result is identical to calling :meth:`b64md5` on the row.
+
+        Args:
+            data (Iterable): A ``pandas.Series`` of strings, a
+                ``pandas.DataFrame`` of string columns (whose values are
+                joined per row), or an iterable of strings or tuples of
+                strings.
+            trunc (int, optional): Truncate each Base64 string to (n)
+                characters. Defaults to None.
+            workers (int, optional): Number of worker processes. Defaults to
+                None, which hashes in the calling process.
+            chunksize (int, optional): Number of rows sent to each worker
+                process per task. Defaults to 100,000.
+
+        :Design:
+            Rather than calling :meth:`b64md5` per row (via ``.apply``),
+            the rows are hashed in a single list comprehension with the
+            hashing and encoding functions bound locally, avoiding the
+            per-row method call, type check and re-encoding overhead. For
+            truncated output, only the leading hex characters needed are
+            Base64 encoded.
+
+            As MD5 hashing of short strings holds the GIL, multiple cores
+            are used via a *process* pool, with rows sent in chunks to
+            amortise the IPC overhead. This is worthwhile for
+            multi-million-row inputs.
+
+        :Example:
+
+            Create 16-character surrogate keys for each row of a DataFrame::
+
+                >>> import pandas as pd
+                >>> from utils4.crypto import crypto
+
+                >>> df = pd.DataFrame({'name': ['Ann', 'Bob'],
+                                       'dob': ['1980-01-01', '1990-02-02']})
+                >>> df['key'] = crypto.b64md5_many(df, trunc=16)
+
+        Returns:
+            pd.Series: A Series of (optionally truncated) Base64 encoded MD5
+            hashes. If a Series or DataFrame is passed, its index is
+            retained.
+
+        """
+        return self._md5_many(data=data,
+                              b64=True,
+                              trunc=trunc,
+                              workers=workers,
+                              chunksize=chunksize)
+
     @staticmethod
-    def checksum_crc32(path: str, return_integer: bool=False) -> Union[int, str]:
+    def checksum_blake2b(path: str,
+                         verify: bool=False,
+                         size: int=_SIZE,
+                         use_mmap: bool=False) -> str:
+        """Generate a 512-bit BLAKE2b checksum for the given file.
+
+        Args:
+            path (str): Full path to the file.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash the file. Defaults to False.
+            size (int, optional): Size of each chunk passed to the hasher,
+                in bytes. Defaults to 1 MiB.
+            use_mmap (bool, optional): Memory-map the file, rather than
+                reading it into a buffer. Refer to the warning in
+                :meth:`_read_chunks` before enabling. Defaults to False.
+
+        :Design:
+            BLAKE2b is a cryptographic hash which is typically faster than
+            MD5 and SHA256 on 64-bit platforms. As BLAKE2b uses 1024-bit
+            (128-byte) blocks, ``size`` should be a multiple of the block
+            size. For further detail, refer to the :meth:`_read_chunks`
+            documentation.
+
+        :Example:
+
+            Example calculating the BLAKE2b checksum for a file::
+
+                >>> from utils4.crypto import crypto
+
+                >>> crypto.checksum_blake2b(path='/tmp/test.txt')
+                ('a8add4bdddfd93e4877d2746e62817b1'
+                 '16364a1fa7bc148d95090bc7333b3673'
+                 'f82401cf7aa2e4cb1ecd90296e3f14cb'
+                 '5413f8ed77be73045b13914cdcd6a918')  # Single string
+
+        Returns:
+            str: A 512-bit BLAKE2b hex digest (checksum string) of the
+            file's contents.
+
+        """
+        digest, key = Crypto._cache_get(path=path, algorithm='blake2b', verify=verify)
+        if digest is None:
+            digest = Crypto._digest(path=path,
+                                    algorithms=('blake2b',),
+                                    size=size,
+                                    use_mmap=use_mmap)
+            digest = Crypto._cache_put(path=path, key=key, digest=digest['blake2b'])
+        return digest
+
+    @staticmethod
+    def checksum_crc32(path: str,
+                       return_integer: bool=False,
+                       verify: bool=False,
+                       size: int=_SIZE,
+                       use_mmap: bool=False) -> Union[int, str]:
         """Generate a 32-bit CRC32 checksum for the given file.
 
         Args:
             path (str): Full path to the file.
             return_integer (bool, optional): Return the original unsigned
                 32-bit integer, rather than the hex string. Defaults to False.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash the file. Defaults to False.
+            size (int, optional): Size of each chunk passed to the hasher,
+                in bytes. Defaults to 1 MiB.
+            use_mmap (bool, optional): Memory-map the file, rather than
+                reading it into a buffer. Refer to the warning in
+                :meth:`_read_chunks` before enabling. Defaults to False.
 
         Important:
             This algorithm is *not* cryptographically strong and should not be
@@ -119,9 +347,10 @@ class Crypto:
             .. _Documentation: https://docs.python.org/3/library/zlib.html#zlib.crc32
 
         :Design:
-            This method breaks the file into 32768-byte chunks for more memory
-            efficient reading. Meaning this method has a maximum memory use
-            overhead of ~32K.
+            This method passes the file to ``zlib.crc32`` in ``size``-byte
+            chunks, read into a single reusable buffer (or, if ``use_mmap``
+            is True, as zero-copy slices of a memory-mapped file). For
+            further detail, refer to the :meth:`_read_chunks` documentation.
 
         :Example:
 
@@ -149,32 +378,153 @@ class Crypto:
             integer is returned.
 
         """
-        size = 1024*32 # 32K chunks
-        with open(path, 'rb') as f:
-            crcval = 0
-            chunk = f.read(size)
-            while len(chunk) > 0:
-                crcval = zlib.crc32(chunk, crcval)
-                chunk = f.read(size)
+        digest, key = Crypto._cache_get(path=path, algorithm='crc32', verify=verify)
+        if digest is None:
+            digest = Crypto._digest(path=path, algorithms=('crc32',), size=size, use_mmap=use_mmap)
+            digest = Crypto._cache_put(path=path, key=key, digest=digest['crc32'])
         if return_integer:
-            rtn = crcval
-        else:
-            rtn = convert.int2hex(crcval & 0xFFFFFFFF)
-        return rtn
+            return int(digest, 16)
+        return digest
 
     @staticmethod
-    def checksum_md5(path: str) -> str:
+    def checksum_many(paths: Iterable[str],
+                      algorithm: str='md5',
+                      *,
+                      workers: int=None,
+                      executor: str='thread',
+                      size: int=_SIZE,
+                      verify: bool=False) -> Generator[tuple[str, str], None, None]:
+        """Generate checksums for many files, in parallel.
+
+        Args:
+            paths (Iterable[str]): Full paths to the files to be checksummed.
+                This may be a lazy iterable, such as a generator.
+            algorithm (str, optional): The algorithm to be used. Any of the
+                algorithms accepted by :meth:`checksum_multi`.
+                Defaults to ``'md5'``.
+            workers (int, optional): Number of workers. Defaults to None,
+                which uses the number of CPUs.
+            executor (str, optional): The type of pool used; either
+                ``'thread'`` or ``'process'``. Defaults to ``'thread'``.
+            size (int, optional): Size of each chunk passed to the hasher,
+                in bytes. Defaults to 1 MiB.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash every file. Defaults to False.
+
+        :Design:
+            Each file is hashed by :meth:`checksum_multi`, using a single
+            reusable read buffer. As ``hashlib`` and ``zlib`` release the GIL
+            while hashing large buffers, and file reads also release the GIL,
+            a thread pool scales across cores for most workloads.
+
+            A process pool may be used for many small files, where the
+            per-file Python overhead dominates. In this case, paths are
+            sent to the workers in batches to reduce the IPC overhead.
+
+            The number of tasks in flight is bounded to a small multiple of
+            ``workers``, so ``paths`` is consumed lazily and memory use is
+            constant.
+
+            If the cache is enabled, it is only accessed from the calling
+            process. Cache hits are yielded as soon as they are found, and
+            only the misses are sent to the pool.
+
+            If the generator is closed early (for example, by breaking out
+            of a loop), any queued tasks which have not yet started are
+            cancelled.
+
+        :Example:
+
+            Calculate the SHA256 checksum for all files in a directory::
+
+                >>> from glob import glob
+                >>> from utils4.crypto import crypto
+
+                >>> files = glob('/path/to/files/*')
+                >>> for path, digest in crypto.checksum_many(files, 'sha256'):
+                >>>     print(path, digest)
+
+        Raises:
+            OSError: If a file cannot be read, for example, if it is removed
+                or its permissions are changed while the stream is running.
+                The error is raised from the generator, which ends the
+                stream; the caller should filter the paths beforehand, or
+                use :meth:`checksum_multi` where per-file handling is
+                required.
+            ValueError: If the executor is not ``'thread'`` or ``'process'``.
+
+        Yields:
+            tuple: A ``(path, hexdigest)`` tuple for each file, as each
+            checksum completes. Therefore, the order is *not* guaranteed.
+
+        """
+        pools = {'thread': (ThreadPoolExecutor, 1), 'process': (ProcessPoolExecutor, 32)}
+        if executor not in pools:
+            raise ValueError('The executor must be either \'thread\' or \'process\'.')
+        Crypto._new_hasher(algorithm)  # Fail fast on an invalid algorithm.
+        pool_, bsize = pools[executor]
+        workers = workers or os.cpu_count() or 1
+        keys = {}
+
+        def _results(futures):
+            for f in futures:
+                for p, digest in f.result():
+                    yield p, Crypto._cache_put(path=p, key=keys.pop(p, None), digest=digest)
+
+        with pool_(max_workers=workers) as pool:
+            pending = set()
+            batch = []
+            try:
+                for p in paths:
+                    digest, key = Crypto._cache_get(path=p, algorithm=algorithm, verify=verify)
+                    if digest is not None:
+                        yield p, digest
+                        continue
+                    if key is not None:
+                        keys[p] = key
+                    batch.append(p)
+                    if len(batch) < bsize:
+                        continue
+                    pending.add(pool.submit(_checksum_batch, batch, algorithm, size))
+                    batch = []
+                    if len(pending) >= workers * 4:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        yield from _results(done)
+                if batch:
+                    pending.add(pool.submit(_checksum_batch, batch, algorithm, size))
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from _results(done)
+            except GeneratorExit:
+                # The caller stopped early; drop the tasks not yet started.
+                for f in pending:
+                    f.cancel()
+                raise
+
+    @staticmethod
+    def checksum_md5(path: str,
+                     verify: bool=False,
+                     size: int=_SIZE,
+                     use_mmap: bool=False) -> str:
         """Generate a 128-bit MD5 checksum for the given file.
 
         Args:
             path (str): Full path to the file.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash the file. Defaults to False.
+            size (int, optional): Size of each chunk passed to the hasher,
+                in bytes. Defaults to 1 MiB.
+            use_mmap (bool, optional): Memory-map the file, rather than
+                reading it into a buffer. Refer to the warning in
+                :meth:`_read_chunks` before enabling. Defaults to False.
 
         :Design:
-            This method breaks the file into 32768-byte chunks
-            (64-bytes * 512 blocks) for more memory efficient reading;
-            taking advantage of the fact that MD5 uses 512-bit (64-byte) digest
-            blocks. Meaning this method has a maximum memory use overhead of
-            ~32K.
+            This method passes the file to the hasher in ``size``-byte
+            chunks, read into a single reusable buffer (or, if ``use_mmap``
+            is True, as zero-copy slices of a memory-mapped file). As MD5
+            uses 512-bit (64-byte) blocks, ``size`` should be a multiple of
+            the block size. For further detail, refer to the
+            :meth:`_read_chunks` documentation.
 
         :Example:
 
@@ -190,28 +540,103 @@ class Crypto:
             contents.
 
         """
-        md5 = hashlib.md5()
-        size = 64*512  # 32K chunks - 64-byte digest blocks (x512 blocks)
-        with open(path, 'rb') as f:
-            chunk = f.read(size)
-            while len(chunk) > 0:
-                md5.update(chunk)
-                chunk = f.read(size)
-        return md5.hexdigest()
+        digest, key = Crypto._cache_get(path=path, algorithm='md5', verify=verify)
+        if digest is None:
+            digest = Crypto._digest(path=path, algorithms=('md5',), size=size, use_mmap=use_mmap)
+            digest = Crypto._cache_put(path=path, key=key, digest=digest['md5'])
+        return digest
+
+    @staticmethod
+    def checksum_multi(path: str,
+                       algorithms: Union[list, tuple]=('md5', 'sha256'),
+                       size: int=_SIZE,
+                       verify: bool=False,
+                       use_mmap: bool=False) -> dict:
+        """Generate multiple checksums for a file, with a single read.
+
+        Args:
+            path (str): Full path to the file.
+            algorithms (Union[list, tuple], optional): The algorithms to be
+                calculated. Any of ``'crc32'``, ``'xxh64'``, or an
+                algorithm name supported by :func:`hashlib.new` (e.g.
+                ``'md5'``, ``'sha1'``, ``'sha256'``, ``'sha512'``,
+                ``'blake2b'``).
+                Defaults to ``('md5', 'sha256')``.
+            size (int, optional): Size of each chunk passed to the
+                hashers, in bytes. Defaults to 1 MiB.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash the file. Defaults to False.
+            use_mmap (bool, optional): Memory-map the file, rather than
+                reading it into a buffer. Refer to the warning in
+                :meth:`_read_chunks` before enabling. Defaults to False.
+
+        :Design:
+            The file is read *once*, in chunks, and a ``memoryview`` of
+            each chunk is fed to every hasher in turn, so no new ``bytes``
+            object is created per chunk. The chunks are read into a single
+            reusable ``bytearray`` using ``readinto``, or (if ``use_mmap`` is
+            True) are zero-copy slices of a memory-mapped file. For further detail,
+            refer to the :meth:`_read_chunks` documentation.
+
+            The CRC32 checksum is returned as a hex string, in the same
+            format as :meth:`checksum_crc32`.
+
+            If the cache is enabled, only the algorithms which are not
+            cached are calculated.
+
+        :Example:
+
+            Example calculating the MD5 and SHA256 checksums for a file::
+
+                >>> from utils4.crypto import crypto
+
+                >>> crypto.checksum_multi(path='/tmp/test.txt',
+                                          algorithms=['md5', 'sha256'])
+                {'md5': '9ec06901e8f25eb9810c5e0db88e7dcd',
+                 'sha256': 'e899df8e51b60bf8a6ede73fe5c7b4267bf5e48937e848bac3c6efd906833821'}
+
+        Raises:
+            ValueError: If an algorithm is not supported.
+
+        Returns:
+            dict: A dictionary of ``{algorithm: hex digest}`` for each of the
+            requested algorithms.
+
+        """
+        digests = {}
+        keys = {}
+        for a in algorithms:
+            digests[a], keys[a] = Crypto._cache_get(path=path, algorithm=a, verify=verify)
+        if todo := [a for a in algorithms if digests[a] is None]:
+            digests.update(Crypto._digest(path=path, algorithms=todo, size=size, use_mmap=use_mmap))
+            for a in todo:
+                Crypto._cache_put(path=path, key=keys[a], digest=digests[a])
+        return {a: digests[a] for a in algorithms}
 
     @staticmethod
-    def checksum_sha1(path: str) -> str:
+    def checksum_sha1(path: str,
+                      verify: bool=False,
+                      size: int=_SIZE,
+                      use_mmap: bool=False) -> str:
         """Generate a 160-bit SHA1 checksum for the given file.
 
         Args:
             path (str): Full path to the file.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash the file. Defaults to False.
+            size (int, optional): Size of each chunk passed to the hasher,
+                in bytes. Defaults to 1 MiB.
+            use_mmap (bool, optional): Memory-map the file, rather than
+                reading it into a buffer. Refer to the warning in
+                :meth:`_read_chunks` before enabling. Defaults to False.
 
         :Design:
-            This method breaks the file into 32768-byte chunks
-            (64-bytes * 512 blocks) for more memory efficient reading;
-            taking advantage of the fact that SHA1 uses 512-bit (64-byte)
-            digest blocks. Meaning this method has a maximum memory use
-            overhead of ~32K.
+            This method passes the file to the hasher in ``size``-byte
+            chunks, read into a single reusable buffer (or, if ``use_mmap``
+            is True, as zero-copy slices of a memory-mapped file). As SHA1
+            uses 512-bit (64-byte) blocks, ``size`` should be a multiple of
+            the block size. For further detail, refer to the
+            :meth:`_read_chunks` documentation.
 
         :Example:
 
@@ -227,28 +652,36 @@ class Crypto:
             contents.
 
         """
-        sha1 = hashlib.sha1()
-        size = 64*512  # 32K chunks - 64-byte digest blocks (x512 blocks)
-        with open(path, 'rb') as f:
-            chunk = f.read(size)
-            while len(chunk) > 0:
-                sha1.update(chunk)
-                chunk = f.read(size)
-        return sha1.hexdigest()
+        digest, key = Crypto._cache_get(path=path, algorithm='sha1', verify=verify)
+        if digest is None:
+            digest = Crypto._digest(path=path, algorithms=('sha1',), size=size, use_mmap=use_mmap)
+            digest = Crypto._cache_put(path=path, key=key, digest=digest['sha1'])
+        return digest
 
     @staticmethod
-    def checksum_sha256(path: str) -> str:
+    def checksum_sha256(path: str,
+                        verify: bool=False,
+                        size: int=_SIZE,
+                        use_mmap: bool=False) -> str:
         """Generate a 256-bit SHA256 checksum for the given file.
 
         Args:
             path (str): Full path to the file.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash the file. Defaults to False.
+            size (int, optional): Size of each chunk passed to the hasher,
+                in bytes. Defaults to 1 MiB.
+            use_mmap (bool, optional): Memory-map the file, rather than
+                reading it into a buffer. Refer to the warning in
+                :meth:`_read_chunks` before enabling. Defaults to False.
 
         :Design:
-            This method breaks the file into 32768-byte chunks
-            (64-bytes * 512 blocks) for more memory efficient reading;
-            taking advantage of the fact that SHA256 uses 512-bit (64-byte)
-            digest blocks. Meaning this method has a maximum memory use
-            overhead of ~32K.
+            This method passes the file to the hasher in ``size``-byte
+            chunks, read into a single reusable buffer (or, if ``use_mmap``
+            is True, as zero-copy slices of a memory-mapped file). As SHA256
+            uses 512-bit (64-byte) blocks, ``size`` should be a multiple of
+            the block size. For further detail, refer to the
+            :meth:`_read_chunks` documentation.
 
         :Example:
 
@@ -264,28 +697,36 @@ class Crypto:
             contents.
 
         """
-        sha256 = hashlib.sha256()
-        size = 64*512  # 32K chunks - 64-byte digest blocks (x512 blocks)
-        with open(path, 'rb') as f:
-            chunk = f.read(size)
-            while len(chunk) > 0:
-                sha256.update(chunk)
-                chunk = f.read(size)
-        return sha256.hexdigest()
+        digest, key = Crypto._cache_get(path=path, algorithm='sha256', verify=verify)
+        if digest is None:
+            digest = Crypto._digest(path=path, algorithms=('sha256',), size=size, use_mmap=use_mmap)
+            digest = Crypto._cache_put(path=path, key=key, digest=digest['sha256'])
+        return digest
 
     @staticmethod
-    def checksum_sha512(path: str) -> str:
+    def checksum_sha512(path: str,
+                        verify: bool=False,
+                        size: int=_SIZE,
+                        use_mmap: bool=False) -> str:
         """Generate a 512-bit SHA512 checksum for the given file.
 
         Args:
             path (str): Full path to the file.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash the file. Defaults to False.
+            size (int, optional): Size of each chunk passed to the hasher,
+                in bytes. Defaults to 1 MiB.
+            use_mmap (bool, optional): Memory-map the file, rather than
+                reading it into a buffer. Refer to the warning in
+                :meth:`_read_chunks` before enabling. Defaults to False.
 
         :Design:
-            This method breaks the file into 32768-byte chunks
-            (128-bytes * 256 blocks) for more memory efficient reading;
-            taking advantage of the fact that SHA512 uses 1024-bit (128-byte)
-            digest blocks. Meaning this method has a maximum memory use
-            overhead of ~32K.
+            This method passes the file to the hasher in ``size``-byte
+            chunks, read into a single reusable buffer (or, if ``use_mmap``
+            is True, as zero-copy slices of a memory-mapped file). As SHA512
+            uses 1024-bit (128-byte) blocks, ``size`` should be a multiple of
+            the block size. For further detail, refer to the
+            :meth:`_read_chunks` documentation.
 
         :Example:
 
@@ -304,14 +745,98 @@ class Crypto:
             contents.
 
         """
-        sha512 = hashlib.sha512()
-        size = 128*256  # 32K chunks - 128-byte digest blocks (x256 blocks)
-        with open(path, 'rb') as f:
-            chunk = f.read(size)
-            while len(chunk) > 0:
-                sha512.update(chunk)
-                chunk = f.read(size)
-        return sha512.hexdigest()
+        digest, key = Crypto._cache_get(path=path, algorithm='sha512', verify=verify)
+        if digest is None:
+            digest = Crypto._digest(path=path, algorithms=('sha512',), size=size, use_mmap=use_mmap)
+            digest = Crypto._cache_put(path=path, key=key, digest=digest['sha512'])
+        return digest
+
+    @staticmethod
+    def checksum_xxh64(path: str,
+                       verify: bool=False,
+                       size: int=_SIZE,
+                       use_mmap: bool=False) -> str:
+        """Generate a 64-bit XXH64 checksum for the given file.
+
+        Args:
+            path (str): Full path to the file.
+            verify (bool, optional): Bypass the checksum cache (if enabled)
+                and re-hash the file. Defaults to False.
+            size (int, optional): Size of each chunk passed to the hasher,
+                in bytes. Defaults to 1 MiB.
+            use_mmap (bool, optional): Memory-map the file, rather than
+                reading it into a buffer. Refer to the warning in
+                :meth:`_read_chunks` before enabling. Defaults to False.
+
+        :Design:
+            XXH64 is a *non-cryptographic* hash, implemented in the bundled
+            :mod:`utils4.xxhash` C extension. It is many times faster than
+            MD5, and is suitable for integrity checks and change detection
+            only, as it offers no protection against deliberate tampering.
+            For further detail, refer to the :meth:`_read_chunks`
+            documentation.
+
+        :Example:
+
+            Example calculating the XXH64 checksum for a file::
+
+                >>> from utils4.crypto import crypto
+
+                >>> crypto.checksum_xxh64(path='/tmp/test.txt')
+                '0b242d361fda71bc'
+
+        Raises:
+            ImportError: If the :mod:`utils4.xxhash` C extension is not
+                available.
+
+        Returns:
+            str: A 64-bit XXH64 hex digest (checksum string) of the file's
+            contents.
+
+        """
+        digest, key = Crypto._cache_get(path=path, algorithm='xxh64', verify=verify)
+        if digest is None:
+            digest = Crypto._digest(path=path, algorithms=('xxh64',), size=size, use_mmap=use_mmap)
+            digest = Crypto._cache_put(path=path, key=key, digest=digest['xxh64'])
+        return digest
+
+    @staticmethod
+    def disable_cache():
+        """Disable and close the persistent checksum cache, if enabled."""
+        if Crypto._cache is not None:
+            Crypto._cache.close()
+        Crypto._cache = None
+
+    @staticmethod
+    def enable_cache(path: str=None, max_entries: int=1_000_000) -> ChecksumCache:
+        """Enable the persistent checksum cache for all checksum methods.
+
+        Args:
+            path (str, optional): Full path to the cache database.
+                Defaults to None, which uses the
+                :class:`~utils4.checksumcache.ChecksumCache` default.
+            max_entries (int, optional): Maximum number of cached entries,
+                after which the least recently used entries are evicted.
+                Defaults to 1,000,000.
+
+        :Example:
+
+            Enable the cache, then re-verify a file, bypassing the cache::
+
+                >>> from utils4.crypto import crypto
+
+                >>> crypto.enable_cache()
+                >>> crypto.checksum_sha256(path='/tmp/test.txt', verify=True)
+                'e899df8e51b60bf8a6ede73fe5c7b4267bf5e48937e848bac3c6efd906833821'
+
+        Returns:
+            ChecksumCache: The cache object, which can be used directly
+            (e.g. to clear the cache).
+
+        """
+        Crypto.disable_cache()
+        Crypto._cache = ChecksumCache(path=path, max_entries=max_entries)
+        return Crypto._cache
 
     def md5(self, data: str, decode: bool=True) -> str:
         """Create an optionally encoded or decoded MD5 hash.
@@ -332,6 +857,229 @@ class Crypto:
             h = h.encode()
         return h
 
+    def md5_many(self,
+                 data: Iterable,
+                 workers: int=None,
+                 chunksize: int=100_000) -> 'pd.Series':  # noqa: F821
+        """Create an MD5 hex digest for each row of a pandas Series,
+        DataFrame or iterable.
+
+        Args:
+            data (Iterable): A ``pandas.Series`` of strings, a
+                ``pandas.DataFrame`` of string columns (whose values are
+                joined per row), or an iterable of strings or tuples of
+                strings.
+            workers (int, optional): Number of worker processes. Defaults to
+                None, which hashes in the calling process.
+            chunksize (int, optional): Number of rows sent to each worker
+                process per task. Defaults to 100,000.
+
+        .. tip:: Refer to the :meth:`b64md5_many` documentation for the
+                 design notes.
+
+        Returns:
+            pd.Series: A Series of MD5 hex digests. If a Series or
+            DataFrame is passed, its index is retained.
+
+        """
+        return self._md5_many(data=data,
+                              b64=False,
+                              trunc=None,
+                              workers=workers,
+                              chunksize=chunksize)
+
+    @staticmethod
+    def _cache_get(path: str, algorithm: str, verify: bool) -> tuple:
+        """Look up a file's digest in the checksum cache.
+
+        Args:
+            path (str): Full path to the file.
+            algorithm (str): Name of the checksum algorithm.
+            verify (bool): Bypass the lookup; the key is still built, so the
+                newly calculated digest replaces the cached value.
+
+        Returns:
+            tuple: A tuple of ``(digest, key)``. The digest is None if not
+            found (or bypassed), and the key is None if the cache is
+            disabled.
+
+        """
+        cache = Crypto._cache
+        if cache is None:
+            return None, None
+        key = cache.key(path=path, algorithm=algorithm)
+        return (None if verify else cache.get(key)), key
+
+    @staticmethod
+    def _cache_put(path: str, key: tuple, digest: str) -> str:
+        """Store a digest in the checksum cache, if enabled.
+
+        Args:
+            path (str): Full path to the file.
+            key (tuple): The key returned by :meth:`_cache_get`.
+            digest (str): The calculated digest.
+
+        Returns:
+            str: The digest, for convenience.
+
+        """
+        cache = Crypto._cache
+        if key is not None and cache is not None:
+            cache.put(key=key, digest=digest, path=path)
+        return digest
+
+    @staticmethod
+    def _digest(path: str, algorithms: Iterable[str], size: int, use_mmap: bool=False) -> dict:
+        """Calculate one or more digests for a file, with a single read.
+
+        This is the worker behind :meth:`checksum_multi`, and does not
+        use the cache.
+
+        Args:
+            path (str): Full path to the file.
+            algorithms (Iterable[str]): Names of the algorithms.
+            size (int): Size of each chunk, in bytes.
+            use_mmap (bool, optional): Memory-map the file. Defaults to False.
+
+        Returns:
+            dict: A dictionary of ``{algorithm: hex digest}``.
+
+        """
+        hashers = {a: Crypto._new_hasher(a) for a in algorithms}
+        updates = [h.update for h in hashers.values()]
+        for chunk in Crypto._read_chunks(path=path, size=size, use_mmap=use_mmap):
+            for update in updates:
+                update(chunk)
+        return {a: h.hexdigest() for a, h in hashers.items()}
+
+    @staticmethod
+    def _md5_many(data: Iterable,
+                  b64: bool,
+                  trunc: Union[int, None],
+                  workers: Union[int, None],
+                  chunksize: int) -> 'pd.Series':  # noqa: F821
+        """Hash each row of the data, optionally over a process pool.
+
+        This is the worker behind :meth:`b64md5_many` and :meth:`md5_many`.
+
+        Args:
+            data (Iterable): A Series, DataFrame or iterable of rows.
+            b64 (bool): Base64 encode each hex digest.
+            trunc (Union[int, None]): Truncate each Base64 string to (n)
+                characters.
+            workers (Union[int, None]): Number of worker processes.
+            chunksize (int): Number of rows sent to each worker per task.
+
+        Returns:
+            pd.Series: A Series of the results.
+
+        """
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd  # Optional dependency; only required here.
+        index = data.index if isinstance(data, (pd.DataFrame, pd.Series)) else None
+        if isinstance(data, pd.DataFrame):
+            data = data.itertuples(index=False, name=None)
+        if not workers or workers < 2:
+            return pd.Series(_md5_batch(rows=data, b64=b64, trunc=trunc), index=index, dtype=object)
+        data = iter(data)
+        chunks = iter(lambda: list(islice(data, chunksize)), [])
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(_md5_batch, chunks, repeat(b64), repeat(trunc))
+            return pd.Series([h for chunk in results for h in chunk], index=index, dtype=object)
+
+    @staticmethod
+    def _new_hasher(algorithm: str) -> object:
+        """Create a new hasher object for the given algorithm.
+
+        Args:
+            algorithm (str): Name of the algorithm. Either ``'crc32'``,
+                ``'xxh64'``, or any name supported by :func:`hashlib.new`.
+
+        Raises:
+            ImportError: If ``'xxh64'`` is requested, but the
+                :mod:`utils4.xxhash` C extension is not available.
+            ValueError: If the algorithm is not supported.
+
+        Returns:
+            object: A hasher object exposing ``update`` and ``hexdigest``
+            methods.
+
+        """
+        if algorithm.lower() == 'crc32':
+            return _CRC32()
+        if algorithm.lower() == 'xxh64':
+            if xxhash is None:
+                raise ImportError('The xxh64 algorithm requires the utils4.xxhash C extension, '
+                                  'which is not available in this installation.')
+            return xxhash.xxh64()
+        return hashlib.new(algorithm)
+
+    @staticmethod
+    def _read_chunks(path: str,
+                     size: int,
+                     use_mmap: bool=False) -> Generator[memoryview, None, None]:
+        """Read a file in chunks, without allocating per chunk.
+
+        Args:
+            path (str): Full path to the file.
+            size (int): Size of each chunk, in bytes.
+            use_mmap (bool, optional): Memory-map the file. Defaults to False.
+
+        :Design:
+            If ``use_mmap`` is True, the file is memory-mapped (read-only)
+            and each chunk is a ``memoryview`` slice of the mapping, so the
+            data is passed to the hasher without being copied. Where
+            supported, the kernel is advised the mapping will be read
+            sequentially (``MADV_SEQUENTIAL``), enabling aggressive
+            read-ahead.
+
+            If the file cannot be mapped (e.g. an empty file, a pipe or
+            a special file), or ``use_mmap`` is False, the file is read into
+            a single reusable ``bytearray`` using ``readinto``.
+
+        Warning:
+            If the file is truncated (e.g. by another process) while it is
+            memory-mapped, reading past the new end of the file raises a
+            ``SIGBUS`` signal, which terminates the interpreter; it cannot
+            be caught as an exception. Therefore, ``use_mmap`` should only
+            be enabled for files which are not modified while being hashed.
+
+        Note:
+            Each yielded ``memoryview`` is released once the caller requests
+            the next chunk. Therefore, the caller must consume (not store)
+            each chunk.
+
+        Yields:
+            memoryview: A view of the next chunk of the file.
+
+        """
+        with open(path, 'rb', buffering=0) as f:
+            mm = None
+            if use_mmap:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (OSError, ValueError, OverflowError):
+                    pass  # Fall back to readinto.
+            if mm is not None:
+                if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with mm, memoryview(mm) as view:
+                    for i in range(0, len(mm), size):
+                        chunk = view[i:i+size]
+                        try:
+                            yield chunk
+                        finally:
+                            chunk.release()  # Required before the map is closed.
+            else:
+                buf = bytearray(size)
+                with memoryview(buf) as view:
+                    while n := f.readinto(buf):
+                        chunk = view[:n]
+                        try:
+                            yield chunk
+                        finally:
+                            chunk.release()
+
     @staticmethod
     def _encode(data: Union[bytes, str]) -> bytes:
         """Test if a string is ``str`` or ``bytes`` before processing.
@@ -31,13 +31,56 @@
                                   contents_only=True)
         True
 
+
+    For large files, compare the raw bytes (without decoding), testing a
+    few sampled blocks first for quick rejection, then comparing the
+    remainder using parallel reads::
+
+        >>> from utils4 import filesys
+
+        >>> filesys.compare_files(file1='/path/to/export1.csv',
+                                  file2='/path/to/export2.csv',
+                                  mode='binary',
+                                  sample=8,
+                                  workers=4)
+        True
+
+
+    Stream the differences between two directory trees::
+
+        >>> from utils4 import filesys
+
+        >>> for status, relpath in filesys.compare_dirs(left='/path/to/release1',
+                                                        right='/path/to/release2'):
+        >>>     if status != 'same':
+        >>>         print(status, relpath)
+        differs lib/module.py
+        left docs/old.txt
+        right docs/new.txt
+
+
+    Find groups of duplicate files across one or more directory trees::
+
+        >>> from utils4 import filesys
+
+        >>> filesys.find_duplicates(roots=['/path/to/share1', '/path/to/share2'],
+                                    workers=8)
+        [['/path/to/share1/a.csv', '/path/to/share2/copy_of_a.csv'], ...]
+
 """
 # pylint: disable=invalid-name
 
+import errno
+import hashlib
 import os
 import shutil
 import stat
-from glob import glob
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from itertools import repeat
+from typing import Callable, Generator, Iterable, Union
+from utils4.crypto import crypto
 from utils4.reporterror import reporterror
 try:
     from natsort import natsorted
@@ -47,13 +90,111 @@ except ImportError:
     _IMP_NATSORT = False
 
 _SIZE = 16*1024  # 16 KiB
+_BSIZE = 1 << 20  # 1 MiB; binary read size.
+_MODES = ('binary', 'newline', 'text')
+_PARTIAL = 64*1024  # 64 KiB; head and tail size for duplicate candidates.
+
+
+def compare_dirs(left: str,
+                 right: str,
+                 mode: str='binary',
+                 shallow: bool=False,
+                 workers: int=None) -> Generator[tuple[str, str], None, None]:
+    """Compare two directory trees, streaming the result for each entry.
+
+    Args:
+        left (str): Full path to the first directory.
+        right (str): Full path to the second directory.
+        mode (str, optional): The content comparison mode for regular
+            files. Refer to :func:`compare_files` for the options.
+            Defaults to 'binary'.
+        shallow (bool, optional): Only compare the file signatures. Files
+            with the same signature are reported as ``'same'`` without
+            their contents being read. Defaults to False.
+        workers (int, optional): Number of threads used for the content
+            comparisons. Defaults to None, which uses the number of CPUs.
+
+    :Design:
+        Both trees are walked together, one directory at a time, using
+        :func:`os.scandir`. The file type is taken from the directory
+        listing, and the ``stat`` result is cached on each entry, so each
+        file is stat'ed at most once.
+
+        Entries are classified as follows, and the cheap results are
+        yielded immediately:
+
+        - Present on only one side: ``'left'`` or ``'right'``. A directory
+          present on only one side is reported once, and not descended.
+        - Different file type or signature (see :func:`_sig`):
+          ``'differs'``, without the contents being read.
+        - Regular files with the same signature are content compared on a
+          thread pool, and reported as ``'same'`` or ``'differs'`` as each
+          comparison completes. The number of comparisons in flight is
+          bounded, so memory use does not grow with the size of the trees.
+        - Symbolic links (which are not followed) are compared by their
+          target.
+        - Entries which cannot be read (e.g. a permission error, a file
+          removed during the comparison, or a file which cannot be decoded
+          in ``'text'`` mode): ``'error'``. A directory which
+          cannot be read on either side is reported once, and not
+          descended. The comparison continues with the next entry.
+
+    Raises:
+        ValueError: If the ``mode`` argument is not valid.
 
+    Yields:
+        tuple: A ``(status, relpath)`` tuple for each entry, where
+        ``status`` is one of ``'left'``, ``'right'``, ``'same'``,
+        ``'differs'`` or ``'error'``, and ``relpath`` is relative to the
+        root directories.
+        As comparisons complete out of order, the order is *not*
+        guaranteed.
+
+    """
+    if mode not in _MODES:
+        raise ValueError(f'The mode must be one of: {", ".join(_MODES)}')
+    workers = workers or os.cpu_count() or 1
+
+    def _cmp(rel: str) -> tuple[str, str]:
+        try:
+            same = _compare_content(file1=os.path.join(left, rel),
+                                    file2=os.path.join(right, rel),
+                                    mode=mode)
+        except (OSError, ValueError):  # ValueError: e.g. Undecodable in text mode.
+            return 'error', rel
+        return ('same' if same else 'differs'), rel
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        try:
+            for status, rel in _compare_tree(left=left, right=right, shallow=shallow):
+                if status != 'content':
+                    yield status, rel
+                    continue
+                pending.add(pool.submit(_cmp, rel))
+                if len(pending) >= workers * 4:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for f in done:
+                        yield f.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for f in done:
+                    yield f.result()
+        except GeneratorExit:
+            # The caller stopped early; drop the comparisons not yet started.
+            for f in pending:
+                f.cancel()
+            raise
 
 def compare_files(file1: str,
                   file2: str,
                   encoding: str='utf-8',
                   contents_only: bool=False,
-                  sig_only: bool=False) -> bool:
+                  sig_only: bool=False,
+                  *,
+                  mode: str='text',
+                  sample: int=0,
+                  workers: int=None) -> bool:
     """Test if two files are the same.
 
     This method is *modelled* after the built-in :func:`~filecmp.cmp` function,
@@ -73,6 +214,25 @@ def compare_files(file1: str,
             the file signature test will *fail*. Defaults to False.
         sig_only (bool, optional): Only compare the file signatures. The files'
             contents are *not* compared. Defaults to False.
+        mode (str, optional): The content comparison mode. Defaults to
+            'text'. One of:
+
+            - ``'text'``: Decode the files using ``encoding`` and compare
+              the text, ignoring line endings (via universal newlines).
+            - ``'newline'``: Compare the raw bytes, with ``\r\n`` and
+              ``\r`` line endings normalised to ``\n``. This gives the
+              same result as ``'text'`` for any ASCII-compatible encoding
+              (e.g. UTF-8, Latin-1), without the cost of decoding.
+            - ``'binary'``: Compare the raw bytes exactly.
+
+        sample (int, optional): For ``'binary'`` mode, compare this many
+            64 KiB blocks, evenly spaced through the files, before the
+            full comparison. Files which differ in only a few places are
+            still rejected by the full comparison. Defaults to 0.
+        workers (int, optional): For ``'binary'`` mode, compare 1 MiB
+            chunks using this many threads, with parallel positional reads.
+            Useful for very large files on storage which benefits from
+            concurrent reads. Defaults to None (sequential).
 
     :Tests:
         If any of the following tests fail, a value of False is returned
@@ -83,15 +243,22 @@ def compare_files(file1: str,
         - Test both files are 'regular' files.
         - Test the files have the same size (in bytes), they are both regular
           files and their inode mode is the same.
-        - Test the contents are the same; ignoring line endings.
+        - Test the contents are the same; ignoring line endings, unless
+          ``mode='binary'``.
+
+    Raises:
+        ValueError: If the ``mode`` argument is not valid.
 
     Returns:
         bool: True if *all* tests pass, indicating the files are the same;
         otherwise False.
 
     """
+    if mode not in _MODES:
+        raise ValueError(f'The mode must be one of: {", ".join(_MODES)}')
+    kwargs = {'encoding': encoding, 'mode': mode, 'sample': sample, 'workers': workers}
     if contents_only:
-        return _compare_content(file1=file1, file2=file2, encoding=encoding)
+        return _compare_content(file1=file1, file2=file2, **kwargs)
     sig1 = _sig(file1)
     sig2 = _sig(file2)
     if sig1[1] != stat.S_IFREG | sig2[1] != stat.S_IFREG:
@@ -102,13 +269,17 @@ def compare_files(file1: str,
     if sig1 != sig2:
         # Shortcut to bypass file content compare.
         return False
-    return _compare_content(file1=file1, file2=file2, encoding=encoding)
+    return _compare_content(file1=file1, file2=file2, **kwargs)
 
 def dirsplit(path: str,
              nfiles: int,
              pattern: str='*',
              pairs: bool=False,
-             repl: tuple=(None,)) -> bool:
+             repl: tuple=(None,),
+             *,
+             dry_run: bool=False,
+             progress: Callable=None,
+             workers: int=None) -> bool:
     """Move all files from a single directory into (n) sub-directories.
 
     Args:
@@ -130,6 +301,27 @@ def dirsplit(path: str,
 
                 ('_input.csv', '_output.txt')
 
+        dry_run (bool, optional): Report the planned moves through
+            ``progress``, without creating any directories or moving any
+            files. Defaults to False.
+        progress (Callable, optional): A function called after each file is
+            moved, as ``progress(n, total, src, dst)``. Defaults to None,
+            which prints each move. For large directories, pass a function
+            which reports less often (or ``lambda *args: None``), as
+            printing each move is slow.
+        workers (int, optional): Number of threads used for moves which
+            cross filesystems (and must therefore be copied).
+            Defaults to None, which uses the number of CPUs.
+
+    :Design:
+        The complete move plan is built first (see :func:`dirsplit_plan`),
+        and all target directories are created up front. Each file is then
+        moved with :func:`os.rename`, which is a single metadata operation
+        on the same filesystem. Any moves which fail as they cross a
+        filesystem (e.g. a target directory is a mount point) are
+        collected and moved with :func:`shutil.move` on a thread pool, as
+        these copy the file contents.
+
     Raises:
         FileNotFoundError: If the input file path does not exist.
 
@@ -139,47 +331,304 @@ def dirsplit(path: str,
     """
     if not os.path.exists(path):
         raise FileNotFoundError('The requested path does not exist.')
+    progress = progress or _print_move
     success = False
     try:
-        # Setup.
-        files = [f for f in glob(os.path.join(path, pattern)) if os.path.isfile(f)]
-        files = natsorted(files) if _IMP_NATSORT else sorted(files)
-        total = len(files)
-        i = nfiles
-        dirnum = 0
-        # File iterator.
-        for idx, file in enumerate(files, 1):
-            # Define the (next) copy-to directory and create it.
-            if i >= nfiles:
-                i = 0
-                dirnum += 1
-                dirnam = str(dirnum).zfill(2)
-                dirpath = os.path.join(path, dirnam)
-                if not os.path.exists(dirpath):
-                    os.mkdir(path=dirpath)
-            # Copy source file.
-            base = os.path.basename(file)
-            dst = os.path.join(path, dirnam, base)
-            print(f'Moving {idx} of {total}: {base} -> {dirnam}')
-            shutil.move(src=file, dst=dst)
-            _file_move_test(fpath=dst)
-            if pairs:
-                # Copy paired file.
-                base2 = base.replace(*repl)
-                dst2 = os.path.join(path, dirnam, base2)
-                print(rf'\t\-- {base2} -> {dirnam}')
-                shutil.move(src=os.path.join(path, base2), dst=dst2)
-                _file_move_test(fpath=dst2)
-            i += 1
+        plan = dirsplit_plan(path=path, nfiles=nfiles, pattern=pattern, pairs=pairs, repl=repl)
+        total = len(plan)
+        if dry_run:
+            for n, (src, dst) in enumerate(plan, 1):
+                progress(n, total, src, dst)
+            return True
+        for dirpath in dict.fromkeys(os.path.dirname(dst) for _, dst in plan):
+            os.makedirs(dirpath, exist_ok=True)
+        n = 0
+        xdev = []
+        for src, dst in plan:
+            try:
+                os.rename(src, dst)
+            except OSError as err:
+                if err.errno != errno.EXDEV:
+                    raise
+                xdev.append((src, dst))
+                continue
+            n += 1
+            progress(n, total, src, dst)
+        if xdev:
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+                for src, dst in pool.map(_move_xdev, xdev):
+                    n += 1
+                    progress(n, total, src, dst)
         success = True
     except FileNotFoundError as ferr:  # progma nocover (cannot test)
-        # Designed to catch / print file move errors from _file_move_test().
+        # Designed to catch / print file move errors; for example, a missing
+        # paired file, or from _file_move_test().
         print(ferr)
     except Exception as err:
         reporterror(err)
     return success
 
-def _compare_content(file1: str, file2: str, encoding: str='utf-8') -> bool:
+def dirsplit_plan(path: str,
+                  nfiles: int,
+                  pattern: str='*',
+                  pairs: bool=False,
+                  repl: tuple=(None,)) -> list:
+    """Build the move plan for :func:`dirsplit`, without moving any files.
+
+    Args:
+        path (str): Full path to the source files.
+        nfiles (int): Number of source files to be moved into each directory.
+        pattern (str, optional): A shell-style wildcard pattern used for
+            collecting the source files. Defaults to '*'.
+        pairs (bool, optional): Are the files in pairs?. Defaults to False.
+        repl (tuple, optional): A tuple containing the old and new replacement
+            strings, used to name the paired file. Defaults to (None,).
+
+    Refer to :func:`dirsplit` for a full description of the arguments.
+
+    Returns:
+        list: A list of ``(src, dst)`` tuples, in the order the files are
+        to be moved. Paired files immediately follow their source file.
+        The target directories are named ``01``, ``02``, etc.
+
+    """
+    # As with glob, hidden files are only matched by a pattern starting with '.'.
+    hidden = pattern.startswith('.')
+    files = [e.path for e in iterfiles(path=path, pattern=pattern, sort=True, hidden=hidden)]
+    plan = []
+    for idx, file in enumerate(files):
+        dirpath = os.path.join(path, str(idx // nfiles + 1).zfill(2))
+        base = os.path.basename(file)
+        plan.append((file, os.path.join(dirpath, base)))
+        if pairs:
+            base2 = base.replace(*repl)
+            plan.append((os.path.join(path, base2), os.path.join(dirpath, base2)))
+    return plan
+
+def find_duplicates(roots: Union[str, Iterable[str]],
+                    workers: int=None,
+                    algorithm: str='blake2b',
+                    min_size: int=1) -> list:
+    """Find groups of files with identical contents.
+
+    Args:
+        roots (Union[str, Iterable[str]]): Full path to a directory, or an
+            iterable of directories, to be searched recursively.
+        workers (int, optional): Number of threads used for hashing.
+            Defaults to None, which uses the number of CPUs.
+        algorithm (str, optional): The algorithm used for the full file
+            hash. Any algorithm accepted by
+            :meth:`~utils4.crypto.Crypto.checksum_multi`.
+            Defaults to 'blake2b'.
+        min_size (int, optional): Ignore files smaller than this size, in
+            bytes. By default, empty files are ignored. Defaults to 1.
+
+    :Design:
+        Files are compared in three tiers, where each tier only considers
+        the files which are still candidates from the previous tier:
+
+        - **Size:** The directory trees are walked with :func:`os.scandir`,
+          using the cached ``stat`` result, and files are grouped by size.
+          Files with a unique size cannot have a duplicate, and are never
+          opened.
+        - **Partial hash:** A hash of the first and last 64 KiB of each
+          file, calculated on a thread pool. Files up to 128 KiB are hashed
+          in full at this stage, so they skip the next tier.
+        - **Full hash:** The remaining candidates are hashed in full on a
+          thread pool, using :meth:`~utils4.crypto.Crypto.checksum_multi`
+          (which also uses the checksum cache, if enabled).
+
+        Symbolic links are not followed. Multiple paths to the same inode
+        (e.g. hard links, or overlapping roots) are counted once, using
+        the first path found. Where the platform does not report an inode
+        number (e.g. Windows), the normalised path is used instead, so
+        hard links are counted separately. Files which cannot be
+        stat'ed or read at any tier (e.g. removed, or their permissions
+        changed, during the scan) are skipped.
+
+    Returns:
+        list: A list of groups of duplicate files, where each group is a
+        sorted list of two or more paths. The groups are sorted by their
+        first path.
+
+    """
+    roots = [roots] if isinstance(roots, str) else roots
+    workers = workers or os.cpu_count() or 1
+    seen = set()
+    sizes = defaultdict(list)
+    for root in roots:
+        for entry in iterfiles(path=root, recursive=True):
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            # On Windows, DirEntry.stat() reports an inode of 0 for every
+            # file, so fall back to the normalised path as the identity.
+            key = ((st.st_dev, st.st_ino) if st.st_ino
+                   else os.path.normcase(os.path.abspath(entry.path)))
+            if st.st_size >= min_size and key not in seen:
+                seen.add(key)
+                sizes[st.st_size].append(entry.path)
+    del seen
+    cands = [(p, size) for size, paths in sizes.items() if len(paths) > 1 for p in paths]
+    del sizes
+    groups = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (p, size), digest in zip(cands, pool.map(_partial_hash, cands)):
+            if digest is not None:
+                groups[(size, digest)].append(p)
+    dupes = []
+    full = {}
+    for (size, _), paths in groups.items():
+        if len(paths) > 1:
+            if size <= _PARTIAL * 2:
+                dupes.append(sorted(paths))
+            else:
+                full.update(dict.fromkeys(paths, size))
+    del groups
+    groups = defaultdict(list)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for p, digest in zip(full, pool.map(_full_hash, full, repeat(algorithm))):
+            if digest is not None:
+                groups[(full[p], digest)].append(p)
+    dupes.extend(sorted(paths) for paths in groups.values() if len(paths) > 1)
+    return sorted(dupes)
+
+def iterfiles(path: str,
+              pattern: str='*',
+              recursive: bool=False,
+              *,
+              maxdepth: int=None,
+              sort: bool=False,
+              hidden: bool=True,
+              follow_symlinks: bool=False) -> Generator[os.DirEntry, None, None]:
+    """Lazily collect the files in a directory (tree).
+
+    Args:
+        path (str): Full path to the directory to be searched.
+        pattern (str, optional): A shell-style wildcard pattern, matched
+            against each file's name. For example: ``*.csv``.
+            Defaults to '*'.
+        recursive (bool, optional): Search the sub-directories.
+            Defaults to False.
+        maxdepth (int, optional): If ``recursive`` is True, the maximum
+            depth of sub-directories to be searched, where 1 is the
+            immediate sub-directories of ``path``. Defaults to None
+            (unlimited).
+        sort (bool, optional): Sort the files (naturally, if ``natsort``
+            is installed) within each directory. Defaults to False.
+        hidden (bool, optional): Include hidden files and directories
+            (whose name starts with ``.``). Defaults to True.
+        follow_symlinks (bool, optional): Include symbolic links to files.
+            Symbolic links to directories are never followed.
+            Defaults to False.
+
+    :Design:
+        The directory (tree) is read with :func:`os.scandir`, and the file
+        type is taken from the directory listing using
+        :meth:`os.DirEntry.is_file`. Unlike :func:`glob.glob` followed by
+        :func:`os.path.isfile`, there is no extra ``stat`` call per file,
+        which is costly on network filesystems. Additionally, the
+        ``stat`` result of each yielded entry is cached on first use.
+
+        Files are yielded as each directory is read. If ``sort`` is True,
+        only a single directory listing is held in memory at a time,
+        rather than the whole tree. As with :func:`os.walk`, directories
+        which cannot be read (including ``path`` itself) are skipped.
+
+    :Example:
+
+        Collect all CSV files in a directory tree, to a depth of two::
+
+            >>> from utils4 import filesys
+
+            >>> for entry in filesys.iterfiles(path='/path/to/data',
+                                               pattern='*.csv',
+                                               recursive=True,
+                                               maxdepth=2):
+            >>>     print(entry.path, entry.stat().st_size)
+
+    Yields:
+        os.DirEntry: A directory entry for each matching file.
+
+    """
+    sorter = natsorted if _IMP_NATSORT else sorted
+    stack = [(path, 0)]
+    while stack:
+        dirpath, depth = stack.pop()
+        dirs = []
+        try:
+            with os.scandir(dirpath) as it:
+                entries = sorter(it, key=lambda e: e.name) if sort else it
+                for entry in entries:
+                    if not hidden and entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and (maxdepth is None or depth < maxdepth):
+                                dirs.append((entry.path, depth + 1))
+                            continue
+                        isfile = entry.is_file(follow_symlinks=follow_symlinks)
+                    except OSError:
+                        continue
+                    if isfile and fnmatch(entry.name, pattern):
+                        yield entry
+        except OSError:
+            pass  # Keep the sub-directories collected before the error.
+        stack.extend(reversed(dirs))
+
+def _compare_binary(file1: str, file2: str, sample: int=0, workers: int=None) -> bool:
+    """Compare the raw bytes of each file.
+
+    Args:
+        file1 (str): Full path to a file to be tested.
+        file2 (str): Full path to a file to be tested.
+        sample (int, optional): Number of sampled blocks to be compared
+            first. Defaults to 0.
+        workers (int, optional): Number of threads used to compare chunks
+            in parallel. Defaults to None.
+
+    :Design:
+        The files are opened unbuffered and read into two reusable 1 MiB
+        ``bytearray`` buffers using ``readinto``, which are compared
+        directly (a ``memcmp``). No per-chunk objects are created, and
+        nothing is decoded, so the comparison is I/O-bound.
+
+        If ``workers`` is given (and the platform supports
+        :func:`os.pread`), chunks are read with positional reads on a
+        thread pool, as the reads release the GIL. Outstanding chunks are
+        cancelled at the first difference.
+
+    Returns:
+        bool: True if the file contents are the same, otherwise False.
+
+    """
+    with open(file1, 'rb', buffering=0) as f1, open(file2, 'rb', buffering=0) as f2:
+        size = os.fstat(f1.fileno()).st_size
+        if size != os.fstat(f2.fileno()).st_size:
+            return False
+        if sample and not _compare_sampled(f1=f1, f2=f2, size=size, n=sample):
+            return False
+        if workers and workers > 1 and hasattr(os, 'pread'):
+            return _compare_parallel(fd1=f1.fileno(), fd2=f2.fileno(), size=size, workers=workers)
+        f1.seek(0)
+        f2.seek(0)
+        b1, b2 = bytearray(_BSIZE), bytearray(_BSIZE)
+        while n1 := _readfull(f1, b1):
+            n2 = _readfull(f2, b2)
+            if n1 != n2:
+                return False
+            if not (b1 == b2 if n1 == _BSIZE else b1[:n1] == b2[:n2]):
+                return False
+        return not _readfull(f2, b2)
+
+def _compare_content(file1: str,
+                     file2: str,
+                     encoding: str='utf-8',
+                     *,
+                     mode: str='text',
+                     sample: int=0,
+                     workers: int=None) -> bool:
     """Compare the content of each file.
 
     Args:
@@ -187,6 +636,12 @@ def _compare_content(file1: str, file2: str, encoding: str='utf-8') -> bool:
         file2 (str): Full path to a file to be tested.
         encoding (str, optional): Encoding to be used when reading the files.
             Defaults to 'utf-8'.
+        mode (str, optional): Comparison mode. Refer to
+            :func:`compare_files` for the options. Defaults to 'text'.
+        sample (int, optional): Number of sampled blocks to be compared
+            first, in binary mode. Defaults to 0.
+        workers (int, optional): Number of threads, in binary mode.
+            Defaults to None.
 
     This function short-circuits once a difference is found and immediately
     returns False.
@@ -195,6 +650,10 @@ def _compare_content(file1: str, file2: str, encoding: str='utf-8') -> bool:
         bool: True if the file contents are the same, otherwise False.
 
     """
+    if mode == 'binary':
+        return _compare_binary(file1=file1, file2=file2, sample=sample, workers=workers)
+    if mode == 'newline':
+        return _compare_newline(file1=file1, file2=file2)
     with open(file1, 'r', encoding=encoding) as f1, open(file2, 'r', encoding=encoding) as f2:
         while True:
             data1 = f1.read(_SIZE)
@@ -205,6 +664,161 @@ def _compare_content(file1: str, file2: str, encoding: str='utf-8') -> bool:
             if not data1 and not data2:
                 return True
 
+def _compare_newline(file1: str, file2: str) -> bool:
+    """Compare the bytes of each file, ignoring line endings.
+
+    Args:
+        file1 (str): Full path to a file to be tested.
+        file2 (str): Full path to a file to be tested.
+
+    :Design:
+        Each file is read in 1 MiB chunks with its line endings normalised
+        to ``\n`` (via :func:`_read_newline`). As the normalised chunks
+        may differ in length, the common prefix of the pending data from
+        each file is compared, and the remainder is carried forward.
+
+    Returns:
+        bool: True if the file contents are the same, otherwise False.
+
+    """
+    g1, g2 = _read_newline(path=file1), _read_newline(path=file2)
+    d1 = d2 = b''
+    while True:
+        d1 = d1 or next(g1, b'')
+        d2 = d2 or next(g2, b'')
+        if not d1 or not d2:
+            # Same only if both files have reached EOF.
+            return not d1 and not d2
+        n = min(len(d1), len(d2))
+        if d1[:n] != d2[:n]:
+            return False
+        d1, d2 = d1[n:], d2[n:]
+
+def _compare_parallel(fd1: int, fd2: int, size: int, workers: int) -> bool:
+    """Compare two open files in chunks, on a thread pool.
+
+    Args:
+        fd1 (int): File descriptor for the first file.
+        fd2 (int): File descriptor for the second file.
+        size (int): Size of the files, in bytes.
+        workers (int): Number of threads.
+
+    Returns:
+        bool: True if all chunks are the same, otherwise False.
+
+    """
+    def _cmp(offset: int) -> bool:
+        return os.pread(fd1, _BSIZE, offset) == os.pread(fd2, _BSIZE, offset)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for same in pool.map(_cmp, range(0, size, _BSIZE)):
+            if not same:
+                pool.shutdown(wait=True, cancel_futures=True)
+                return False
+    return True
+
+def _compare_sampled(f1: object, f2: object, size: int, n: int, bsize: int=64*1024) -> bool:
+    """Compare (n) blocks, evenly spaced through two open files.
+
+    The first and last blocks are always included, as these are where
+    headers, footers and appended data typically differ.
+
+    Args:
+        f1 (object): First open (binary) file object.
+        f2 (object): Second open (binary) file object.
+        size (int): Size of the files, in bytes.
+        n (int): Number of blocks to be compared.
+        bsize (int, optional): Size of each block, in bytes.
+            Defaults to 64 KiB.
+
+    Returns:
+        bool: True if all sampled blocks are the same, otherwise False.
+
+    """
+    span = max(size - bsize, 0)
+    for offset in sorted({span * i // max(n - 1, 1) for i in range(n)}):
+        f1.seek(offset)
+        f2.seek(offset)
+        if f1.read(bsize) != f2.read(bsize):
+            return False
+    return True
+
+def _compare_tree(left: str,
+                  right: str,
+                  shallow: bool=False) -> Generator[tuple[str, str], None, None]:
+    """Walk two directory trees together and classify each entry.
+
+    Args:
+        left (str): Full path to the first directory.
+        right (str): Full path to the second directory.
+        shallow (bool, optional): Report files with the same signature as
+            ``'same'``, rather than as content candidates.
+            Defaults to False.
+
+    Yields:
+        tuple: A ``(status, relpath)`` tuple for each entry, where
+        ``status`` is one of ``'left'``, ``'right'``, ``'same'``,
+        ``'differs'``, ``'error'`` or ``'content'``. The ``'content'``
+        status marks a pair of regular files with the same signature,
+        whose contents are yet to be compared.
+
+    """
+    stack = ['']
+    while stack:
+        rel = stack.pop()
+        try:
+            with os.scandir(os.path.join(left, rel)) as it:
+                lents = {e.name: e for e in it}
+            with os.scandir(os.path.join(right, rel)) as it:
+                rents = {e.name: e for e in it}
+        except OSError:
+            yield 'error', rel or os.curdir
+            continue
+        for name in sorted(lents.keys() | rents.keys()):
+            path = os.path.join(rel, name)
+            if name not in rents:
+                yield 'left', path
+            elif name not in lents:
+                yield 'right', path
+            else:
+                try:
+                    status = _compare_entries(le=lents[name], re_=rents[name], shallow=shallow)
+                except OSError:
+                    status = 'error'
+                if status == 'dir':
+                    stack.append(path)
+                else:
+                    yield status, path
+
+def _compare_entries(le: os.DirEntry, re_: os.DirEntry, shallow: bool=False) -> str:
+    """Classify a pair of directory entries with the same name.
+
+    Args:
+        le (os.DirEntry): Entry from the left directory.
+        re_ (os.DirEntry): Entry from the right directory.
+        shallow (bool, optional): Report files with the same signature as
+            ``'same'``, rather than as content candidates.
+            Defaults to False.
+
+    Raises:
+        OSError: If either entry cannot be stat'ed or read.
+
+    Returns:
+        str: ``'dir'`` if both entries are directories, otherwise one of
+        the statuses yielded by :func:`_compare_tree`.
+
+    """
+    if le.is_dir(follow_symlinks=False) and re_.is_dir(follow_symlinks=False):
+        return 'dir'
+    st1, st2 = le.stat(follow_symlinks=False), re_.stat(follow_symlinks=False)
+    if _stat_sig(st1) != _stat_sig(st2):
+        return 'differs'
+    if stat.S_ISLNK(st1.st_mode):
+        return 'same' if os.readlink(le.path) == os.readlink(re_.path) else 'differs'
+    if shallow or not stat.S_ISREG(st1.st_mode):
+        return 'same'
+    return 'content'
+
 def _file_move_test(fpath: str) -> bool:
     """Test a file exists.
 
@@ -226,6 +840,128 @@ def _file_move_test(fpath: str) -> bool:
         raise FileNotFoundError(msg)
     return True
 
+def _move_xdev(item: tuple) -> tuple:
+    """Move a file across filesystems, and verify it was moved.
+
+    Args:
+        item (tuple): A tuple of ``(src, dst)`` paths.
+
+    Raises:
+        FileNotFoundError: If the file was not moved successfully.
+
+    Returns:
+        tuple: The ``(src, dst)`` tuple, unchanged.
+
+    """
+    src, dst = item
+    shutil.move(src=src, dst=dst)
+    _file_move_test(fpath=dst)
+    return item
+
+def _full_hash(path: str, algorithm: str) -> Union[str, None]:
+    """Hash a whole file, for :func:`find_duplicates`.
+
+    Args:
+        path (str): Full path to the file.
+        algorithm (str): Name of the algorithm.
+
+    Returns:
+        Union[str, None]: The hex digest, or None if the file cannot be
+        read.
+
+    """
+    try:
+        return crypto.checksum_multi(path=path, algorithms=(algorithm,))[algorithm]
+    except OSError:
+        return None
+
+def _partial_hash(item: tuple) -> Union[str, None]:
+    """Hash the first and last 64 KiB of a file.
+
+    Args:
+        item (tuple): A tuple of ``(path, size)`` for the file.
+
+    Returns:
+        Union[str, None]: The hex digest, or None if the file cannot be
+        read. If the file is no larger than 128 KiB, the whole file is
+        hashed.
+
+    """
+    path, size = item
+    try:
+        with open(path, 'rb') as f:
+            h = hashlib.blake2b(f.read(_PARTIAL), digest_size=16)
+            if size > _PARTIAL:
+                f.seek(max(size - _PARTIAL, _PARTIAL))
+                h.update(f.read(_PARTIAL))
+    except OSError:
+        return None
+    return h.hexdigest()
+
+def _print_move(n: int, total: int, src: str, dst: str):
+    """Default progress function for :func:`dirsplit`; print the move.
+
+    Args:
+        n (int): Number of files moved.
+        total (int): Total number of files to be moved.
+        src (str): Full path to the source file.
+        dst (str): Full path to the destination file.
+
+    """
+    print(f'Moving {n} of {total}: {os.path.basename(src)} -> '
+          f'{os.path.basename(os.path.dirname(dst))}')
+
+def _read_newline(path: str) -> Generator[bytes, None, None]:
+    """Read a file in binary chunks, with line endings normalised to ``\n``.
+
+    Args:
+        path (str): Full path to the file.
+
+    :Design:
+        Both ``\r\n`` and a lone ``\r`` are converted to ``\n``, per
+        universal newlines mode. Chunks without a ``\r`` are yielded
+        unchanged. A ``\r`` at the end of a chunk is carried into the next
+        chunk, so a ``\r\n`` pair split across two reads is converted to
+        a single ``\n``.
+
+    Yields:
+        bytes: Each normalised, non-empty chunk.
+
+    """
+    carry = b''
+    with open(path, 'rb') as f:
+        while chunk := f.read(_BSIZE):
+            chunk, carry = carry + chunk, b''
+            if chunk.endswith(b'\r'):
+                chunk, carry = chunk[:-1], b'\r'
+            if b'\r' in chunk:
+                # bytes.splitlines only splits on \r\n, \r and \n.
+                end = b'\n' if chunk[-1:] == b'\n' else b''
+                chunk = b'\n'.join(chunk.splitlines()) + end
+            if chunk:
+                yield chunk
+    if carry:
+        yield b'\n'
+
+def _readfull(f: object, buf: bytearray) -> int:
+    """Fill a buffer from an unbuffered file, allowing for short reads.
+
+    Args:
+        f (object): Open (unbuffered, binary) file object.
+        buf (bytearray): Buffer to be filled.
+
+    Returns:
+        int: Number of bytes read. This is only less than the buffer size
+        at the end of the file.
+
+    """
+    view = memoryview(buf)
+    n = 0
+    while n < len(buf) and (r := f.readinto(view[n:])):
+        n += r
+    view.release()
+    return n
+
 def _sig(file: str) -> tuple:
     """Build a tuple containing elements of a file's signature.
 
@@ -238,5 +974,16 @@ def _sig(file: str) -> tuple:
             (file size, file type, inode mode)
 
     """
-    st = os.stat(file)
+    return _stat_sig(os.stat(file))
+
+def _stat_sig(st: os.stat_result) -> tuple:
+    """Build a file's signature tuple from a ``stat`` result.
+
+    Args:
+        st (os.stat_result): The ``stat`` result for the file.
+
+    Returns:
+        tuple: The file's signature. Refer to :func:`_sig`.
+
+    """
     return (st.st_size, stat.S_IFMT(st.st_mode), st.st_mode)
@@ -30,45 +30,157 @@ const char _DOC_ISZIP[] =
 { "Test if a file is a ZIP archive.\n\n"
   "Refer to the utils.iszip docstring for further detail."
 };
+const char _DOC_SNIFF[] = 
+{ "Determine a file's type from its leading bytes.\n\n"
+  "The file is opened once and a single header buffer is tested against\n"
+  "the signature table.\n\n"
+  "Args:\n"
+  "    path (str): Full path to the file to be tested.\n\n"
+  "Returns:\n"
+  "    int: One of the FT_* type codes. FT_UNKNOWN is returned if no\n"
+  "    signature matched, and FT_ERROR if the file could not be read.\n"
+  "    Use the FILETYPES dict to map a code to its name.\n\n"
+  "Refer to the utils.sniff docstring for further detail."
+};
+const char _DOC_SNIFF_MANY[] = 
+{ "Determine the file type for each path in a sequence.\n\n"
+  "The paths are converted up front, after which the GIL is released\n"
+  "while the files are classified in C.\n\n"
+  "Args:\n"
+  "    paths (list): A sequence of full paths to be tested.\n\n"
+  "Returns:\n"
+  "    list: A list of FT_* type codes, in the same order as the paths.\n\n"
+  "Refer to the utils.sniff_many docstring for further detail."
+};
 
 // Method definitions.
+// The GIL is released around all file I/O, enabling these functions to
+// be called concurrently from a thread pool.
 static PyObject *futils_is7zip(PyObject *self, PyObject *args) {
-    const char *path;
-    if ( !PyArg_ParseTuple(args, "s", &path) )
+    PyObject *path;
+    bool rtn;
+    if ( !PyArg_ParseTuple(args, "O&", PyUnicode_FSConverter, &path) )
         return NULL;
-    return Py_BuildValue("i", is7zip_(path));
+    Py_BEGIN_ALLOW_THREADS
+    rtn = is7zip_(PyBytes_AsString(path));
+    Py_END_ALLOW_THREADS
+    Py_DECREF(path);
+    return Py_BuildValue("i", rtn);
 }
 static PyObject *futils_isascii(PyObject *self, PyObject *args) {
-    const char *path;
-    size_t sz;
-    if ( !PyArg_ParseTuple(args, "sK", &path, &sz) )
+    PyObject *path;
+    unsigned long long sz;
+    bool rtn;
+    if ( !PyArg_ParseTuple(args, "O&K", PyUnicode_FSConverter, &path, &sz) )
         return NULL;
-    return Py_BuildValue("i", isascii_(path, sz));
+    Py_BEGIN_ALLOW_THREADS
+    rtn = isascii_(PyBytes_AsString(path), (size_t)sz);
+    Py_END_ALLOW_THREADS
+    Py_DECREF(path);
+    return Py_BuildValue("i", rtn);
 }
 static PyObject *futils_isbinary(PyObject *self, PyObject *args) {
-    const char *path;
-    size_t sz;
-    if ( !PyArg_ParseTuple(args, "sK", &path, &sz) )
+    PyObject *path;
+    unsigned long long sz;
+    bool rtn;
+    if ( !PyArg_ParseTuple(args, "O&K", PyUnicode_FSConverter, &path, &sz) )
         return NULL;
-    return Py_BuildValue("i", isbinary_(path, sz));
+    Py_BEGIN_ALLOW_THREADS
+    rtn = isbinary_(PyBytes_AsString(path), (size_t)sz);
+    Py_END_ALLOW_THREADS
+    Py_DECREF(path);
+    return Py_BuildValue("i", rtn);
 }
 static PyObject *futils_isgzip(PyObject *self, PyObject *args) {
-    const char *path;
-    if ( !PyArg_ParseTuple(args, "s", &path) )
+    PyObject *path;
+    bool rtn;
+    if ( !PyArg_ParseTuple(args, "O&", PyUnicode_FSConverter, &path) )
         return NULL;
-    return Py_BuildValue("i", isgzip_(path));
+    Py_BEGIN_ALLOW_THREADS
+    rtn = isgzip_(PyBytes_AsString(path));
+    Py_END_ALLOW_THREADS
+    Py_DECREF(path);
+    return Py_BuildValue("i", rtn);
 }
 static PyObject *futils_ispdf(PyObject *self, PyObject *args) {
-    const char *path;
-    if ( !PyArg_ParseTuple(args, "s", &path) )
+    PyObject *path;
+    bool rtn;
+    if ( !PyArg_ParseTuple(args, "O&", PyUnicode_FSConverter, &path) )
         return NULL;
-    return Py_BuildValue("i", ispdf_(path));
+    Py_BEGIN_ALLOW_THREADS
+    rtn = ispdf_(PyBytes_AsString(path));
+    Py_END_ALLOW_THREADS
+    Py_DECREF(path);
+    return Py_BuildValue("i", rtn);
 }
 static PyObject *futils_iszip(PyObject *self, PyObject *args) {
-    const char *path;
-    if ( !PyArg_ParseTuple(args, "s", &path) )
+    PyObject *path;
+    bool rtn;
+    if ( !PyArg_ParseTuple(args, "O&", PyUnicode_FSConverter, &path) )
         return NULL;
-    return Py_BuildValue("i", iszip_(path));
+    Py_BEGIN_ALLOW_THREADS
+    rtn = iszip_(PyBytes_AsString(path));
+    Py_END_ALLOW_THREADS
+    Py_DECREF(path);
+    return Py_BuildValue("i", rtn);
+}
+
+static PyObject *futils_sniff(PyObject *self, PyObject *args) {
+    PyObject *path;
+    int rtn;
+    if ( !PyArg_ParseTuple(args, "O&", PyUnicode_FSConverter, &path) )
+        return NULL;
+    Py_BEGIN_ALLOW_THREADS
+    rtn = sniff_(PyBytes_AsString(path));
+    Py_END_ALLOW_THREADS
+    Py_DECREF(path);
+    return Py_BuildValue("i", rtn);
+}
+static PyObject *futils_sniff_many(PyObject *self, PyObject *args) {
+    PyObject *paths, *seq, *list = NULL, **conv = NULL;
+    const char **cpaths = NULL;
+    int *codes = NULL;
+    Py_ssize_t i, n, done = 0;
+    if ( !PyArg_ParseTuple(args, "O", &paths) )
+        return NULL;
+    if ( (seq = PySequence_Fast(paths, "Expected a sequence of paths.")) == NULL )
+        return NULL;
+    n = PySequence_Fast_GET_SIZE(seq);
+    conv = PyMem_Calloc(n ? n : 1, sizeof(PyObject *));
+    cpaths = PyMem_Calloc(n ? n : 1, sizeof(char *));
+    codes = PyMem_Calloc(n ? n : 1, sizeof(int));
+    if ( conv == NULL || cpaths == NULL || codes == NULL ) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    // Convert each path while holding the GIL.
+    for ( ; done < n; ++done ) {
+        if ( !PyUnicode_FSConverter(PySequence_Fast_GET_ITEM(seq, done), &conv[done]) )
+            goto done;
+        cpaths[done] = PyBytes_AsString(conv[done]);
+    }
+    Py_BEGIN_ALLOW_THREADS
+    for ( i = 0; i < n; ++i )
+        codes[i] = sniff_(cpaths[i]);
+    Py_END_ALLOW_THREADS
+    if ( (list = PyList_New(n)) == NULL )
+        goto done;
+    for ( i = 0; i < n; ++i ) {
+        PyObject *item = PyLong_FromLong(codes[i]);
+        if ( item == NULL ) {
+            Py_CLEAR(list);
+            goto done;
+        }
+        PyList_SetItem(list, i, item);  // Steals the reference.
+    }
+done:
+    for ( i = 0; conv && i < done; ++i )
+        Py_XDECREF(conv[i]);
+    PyMem_Free(conv);
+    PyMem_Free(cpaths);
+    PyMem_Free(codes);
+    Py_DECREF(seq);
+    return list;
 }
 
 static PyMethodDef futils_methods[] = {
@@ -78,6 +190,8 @@ static PyMethodDef futils_methods[] = {
     {"isgzip", futils_isgzip, METH_VARARGS, _DOC_ISGZIP},
     {"ispdf", futils_ispdf, METH_VARARGS, _DOC_ISPDF},
     {"iszip", futils_iszip, METH_VARARGS, _DOC_ISZIP},
+    {"sniff", futils_sniff, METH_VARARGS, _DOC_SNIFF},
+    {"sniff_many", futils_sniff_many, METH_VARARGS, _DOC_SNIFF_MANY},
     {NULL, NULL, 0, NULL}
 };
 
@@ -89,7 +203,52 @@ static struct PyModuleDef futils_module = {
     futils_methods
 };
 
+// File type code constants, exposed as module attributes.
+static const struct {
+    const char *name;
+    int code;
+} _FT_CONSTANTS[] = {
+    {"FT_ERROR", FT_ERROR},
+    {"FT_UNKNOWN", FT_UNKNOWN},
+    {"FT_7ZIP", FT_7ZIP},
+    {"FT_BZIP2", FT_BZIP2},
+    {"FT_GIF", FT_GIF},
+    {"FT_GZIP", FT_GZIP},
+    {"FT_JPEG", FT_JPEG},
+    {"FT_PARQUET", FT_PARQUET},
+    {"FT_PDF", FT_PDF},
+    {"FT_PNG", FT_PNG},
+    {"FT_SQLITE", FT_SQLITE},
+    {"FT_TAR", FT_TAR},
+    {"FT_XZ", FT_XZ},
+    {"FT_ZIP", FT_ZIP},
+    {"FT_ZSTD", FT_ZSTD},
+};
+
 PyMODINIT_FUNC PyInit_futils(void) {
-    return PyModule_Create(&futils_module);
+    PyObject *m, *names, *key, *val;
+    size_t i;
+    int err = 0;
+    if ( (m = PyModule_Create(&futils_module)) == NULL )
+        return NULL;
+    if ( (names = PyDict_New()) == NULL )
+        goto error;
+    for ( i = 0; !err && i < sizeof(_FT_CONSTANTS) / sizeof(_FT_CONSTANTS[0]); ++i ) {
+        err = PyModule_AddIntConstant(m, _FT_CONSTANTS[i].name, _FT_CONSTANTS[i].code);
+        key = PyLong_FromLong(_FT_CONSTANTS[i].code);
+        val = PyUnicode_FromString(filetype_name_(_FT_CONSTANTS[i].code));
+        err = err || key == NULL || val == NULL || PyDict_SetItem(names, key, val);
+        Py_XDECREF(key);
+        Py_XDECREF(val);
+    }
+    // PyModule_AddObject steals the reference on success only.
+    if ( err || PyModule_AddObject(m, "FILETYPES", names) ) {
+        Py_DECREF(names);
+        goto error;
+    }
+    return m;
+error:
+    Py_DECREF(m);
+    return NULL;
 }
 
@@ -19,8 +19,11 @@
 */
 
 #include <stdbool.h>
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
+#include "_futils.h"
 
 /* Prototypes */
 bool is7zip_(const char *path);
@@ -29,7 +32,58 @@ bool isbinary_(const char *path, size_t sz);
 bool isgzip_(const char *path);
 bool ispdf_(const char *path);
 bool iszip_(const char *path);
-static bool _inasciirange(char c);
+const char *filetype_name_(int code);
+int sniff_(const char *path);
+int sniffbuf_(const unsigned char *buf, size_t n);
+static bool _hasbinary(const unsigned char *buf, size_t n);
+
+/**
+    File signature table.
+
+    Each entry maps a magic byte sequence, found at the given offset
+    from the start of the file, to a file type code. The table is
+    ordered loosely by expected frequency, as the first match wins.
+*/
+static const struct {
+    int type;
+    size_t offset;
+    size_t len;
+    const char *magic;
+} _SIGNATURES[] = {
+    {FT_ZIP,     0,   4,  "\x50\x4b\x03\x04"},
+    {FT_ZIP,     0,   4,  "\x50\x4b\x05\x06"},
+    {FT_ZIP,     0,   4,  "\x50\x4b\x07\x08"},
+    {FT_GZIP,    0,   2,  "\x1f\x8b"},
+    {FT_PDF,     0,   5,  "%PDF-"},
+    {FT_7ZIP,    0,   6,  "\x37\x7a\xbc\xaf\x27\x1c"},
+    {FT_BZIP2,   0,   3,  "BZh"},
+    {FT_XZ,      0,   6,  "\xfd\x37\x7a\x58\x5a\x00"},
+    {FT_ZSTD,    0,   4,  "\x28\xb5\x2f\xfd"},
+    {FT_PNG,     0,   8,  "\x89\x50\x4e\x47\x0d\x0a\x1a\x0a"},
+    {FT_JPEG,    0,   3,  "\xff\xd8\xff"},
+    {FT_GIF,     0,   4,  "GIF8"},
+    {FT_PARQUET, 0,   4,  "PAR1"},
+    {FT_SQLITE,  0,   16, "SQLite format 3\x00"},
+    {FT_TAR,     257, 5,  "ustar"},
+};
+
+/* Names for each file type code, indexed by code. */
+static const char *_FILETYPE_NAMES[FT_COUNT] = {
+    [FT_UNKNOWN] = "unknown",
+    [FT_7ZIP]    = "7zip",
+    [FT_BZIP2]   = "bzip2",
+    [FT_GIF]     = "gif",
+    [FT_GZIP]    = "gzip",
+    [FT_JPEG]    = "jpeg",
+    [FT_PARQUET] = "parquet",
+    [FT_PDF]     = "pdf",
+    [FT_PNG]     = "png",
+    [FT_SQLITE]  = "sqlite",
+    [FT_TAR]     = "tar",
+    [FT_XZ]      = "xz",
+    [FT_ZIP]     = "zip",
+    [FT_ZSTD]    = "zstd",
+};
 
 /**
     Determine if a file is a 7-zip archive.
@@ -115,25 +169,33 @@ isascii_(const char *path, size_t sz) {
 bool
 isbinary_(const char *path, size_t sz) {
 
-    char buf[sz];
-    size_t i;
+    bool rtn = false;
+    unsigned char *buf;
     size_t bytes;
     FILE *fp;
 
+    // Round the chunk up to a whole number of words, with a floor.
+    sz = sz < ISBINARY_BUFMIN ? ISBINARY_BUFMIN : sz;
+    sz = (sz + sizeof(uint64_t) - 1) & ~(sizeof(uint64_t) - 1);
     if ( (fp = fopen(path, "rb")) == NULL ) {
         perror("Error opening file");
         return false;
     }
+    if ( (buf = malloc(sz)) == NULL ) {
+        perror("Error allocating read buffer");
+        fclose(fp);
+        return false;
+    }
+    setvbuf(fp, NULL, _IONBF, 0);  // Reads bypass the stdio buffer.
     while ( (bytes = fread(buf, 1, sz, fp)) ) {
-        for ( i = 0; i < bytes; ++i ) {
-            if ( !_inasciirange(buf[i]) ) {
-                fclose(fp);
-                return true;  // Quick escape for binary files.
-            }    
+        if ( _hasbinary(buf, bytes) ) {
+            rtn = true;  // Quick escape for binary files.
+            break;
         }
     }
+    free(buf);
     fclose(fp);
-    return false;
+    return rtn;
 }
 
 /**
@@ -262,21 +324,140 @@ iszip_(const char *path) {
 }
 
 /**
-    Determine if a character is in the printable ASCII range.
+    Return the short name for a file type code.
 
-    As a micro-optimisation (given short-circuiting), the 
-    range [0x20, 0x7e] is evaluated *first*, followed by [0x07, 0x0d]
-    and finally 0x1b.
-    
-    @param c Character to be tested.
-    @return Returns True if the character is in the printable ASCII range,
+    @param code A file type code, as returned by sniff_().
+    @return A pointer to a static string (e.g. "gzip"), or "unknown"
+            for an unrecognised code.
+*/
+const char *
+filetype_name_(int code) {
+
+    if ( code == FT_ERROR )
+        return "error";
+    if ( code < 0 || code >= FT_COUNT )
+        return _FILETYPE_NAMES[FT_UNKNOWN];
+    return _FILETYPE_NAMES[code];
+}
+
+/**
+    Determine a file's type from its leading bytes.
+
+    Notes:
+        The file is opened *once* and a single header buffer of up to
+        SNIFF_BUFSZ bytes is read, which is then tested against each
+        entry of the signature table. The file extension is *not* used.
+
+        The stream is unbuffered, as only a single read is made.
+
+    @param path Pointer to the full path of the file to be tested.
+    @return Returns the matching filetype code, FT_UNKNOWN if no
+            signature matched, or FT_ERROR if the file could not be read.
+*/
+int
+sniff_(const char *path) {
+
+    size_t bytes;
+    unsigned char buf[SNIFF_BUFSZ];
+    FILE *fp;
+
+    if ( (fp = fopen(path, "rb")) == NULL )
+        return FT_ERROR;
+    setvbuf(fp, NULL, _IONBF, 0);
+    bytes = fread(buf, 1, SNIFF_BUFSZ, fp);
+    if ( ferror(fp) ) {
+        fclose(fp);
+        return FT_ERROR;
+    }
+    fclose(fp);
+    return sniffbuf_(buf, bytes);
+}
+
+/**
+    Determine a file type from a buffer of leading bytes.
+
+    @param buf Pointer to the header bytes of a file.
+    @param n Number of valid bytes in buf.
+    @return Returns the matching filetype code, or FT_UNKNOWN.
+*/
+int
+sniffbuf_(const unsigned char *buf, size_t n) {
+
+    size_t i;
+
+    for ( i = 0; i < sizeof(_SIGNATURES) / sizeof(_SIGNATURES[0]); ++i ) {
+        if ( _SIGNATURES[i].offset + _SIGNATURES[i].len <= n
+             && memcmp(buf + _SIGNATURES[i].offset,
+                       _SIGNATURES[i].magic,
+                       _SIGNATURES[i].len) == 0 )
+            return _SIGNATURES[i].type;
+    }
+    return FT_UNKNOWN;
+}
+
+/* Byte value broadcast to each byte of a 64-bit word. */
+#define _BCAST(b) (0x0101010101010101ULL * (uint64_t)(b))
+
+/**
+    Lookup table of the printable ASCII range.
+
+    A byte is printable if it is within [0x20, 0x7e], [0x07, 0x0d] or
+    is 0x1b. Every byte >= 0x80 is non-printable.
+*/
+static const bool _ASCIIOK[256] = {
+    0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 0, 0,  // 0x00
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0,  // 0x10
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,  // 0x20
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,  // 0x30
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,  // 0x40
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,  // 0x50
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1,  // 0x60
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 0,  // 0x70
+    // 0x80 - 0xff: All zero.
+};
+
+/**
+    Determine if a buffer contains a byte outside the printable ASCII
+    range.
+
+    Design:
+        The buffer is scanned one 64-bit word at a time. A word is
+        accepted outright if none of its bytes has the high bit set, is
+        below 0x20 or is equal to 0x7f, which is tested with the
+        'has less than' bit trick. Only words which fail this
+        test (e.g. those containing a newline or tab) are checked
+        byte-by-byte against the lookup table. Any tail bytes are also
+        checked using the lookup table.
+
+    @param buf Pointer to the buffer to be tested.
+    @param n Number of bytes in the buffer.
+    @return Returns True if any byte is outside ASCII's printable range,
             otherwise False.
 */
 static bool
-_inasciirange(char c) {
-
-    if ( (0x20 <= c && c <= 0x7e) || (0x07 <= c && c <= 0x0d) || (c == 0x1b) ) 
-        return true;
+_hasbinary(const unsigned char *buf, size_t n) {
+
+    const uint64_t hi = _BCAST(0x80);
+    size_t i = 0;
+    size_t j;
+    uint64_t w;
+    uint64_t x;
+
+    for ( ; i + sizeof(w) <= n; i += sizeof(w) ) {
+        memcpy(&w, buf + i, sizeof(w));
+        if ( w & hi )
+            return true;
+        // With the high bits clear, a subtraction borrows into a high
+        // bit only if a byte is < 0x20, or (after the xor) is 0x7f.
+        x = w ^ _BCAST(0x7f);
+        if ( ((w - _BCAST(0x20)) | (x - _BCAST(0x01))) & hi ) {
+            for ( j = i; j < i + sizeof(w); ++j )
+                if ( !_ASCIIOK[buf[j]] )
+                    return true;
+        }
+    }
+    for ( ; i < n; ++i )
+        if ( !_ASCIIOK[buf[i]] )
+            return true;
     return false;
 }
-
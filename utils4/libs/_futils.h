@@ -3,8 +3,48 @@
 */
 
 #ifndef _FUTILS_H
+#define _FUTILS_H
 
 #include <stdbool.h>
+#include <stddef.h>
+
+/**
+    Number of bytes read from the head of a file by sniff_().
+
+    This must cover the largest (offset + length) in the signature
+    table; the tar 'ustar' magic sits at offset 257.
+*/
+#define SNIFF_BUFSZ 264
+
+/**
+    Minimum chunk size, in bytes, used by isbinary_().
+
+    Smaller chunk sizes are rounded up to this value, as reading a large
+    file in small chunks is bound by the per-read overhead.
+*/
+#define ISBINARY_BUFMIN 65536
+
+/**
+    File type codes returned by the sniff_() functions.
+*/
+enum filetype {
+    FT_ERROR = -1,  // The file could not be opened or read.
+    FT_UNKNOWN,     // No signature matched.
+    FT_7ZIP,
+    FT_BZIP2,
+    FT_GIF,
+    FT_GZIP,
+    FT_JPEG,
+    FT_PARQUET,
+    FT_PDF,
+    FT_PNG,
+    FT_SQLITE,
+    FT_TAR,
+    FT_XZ,
+    FT_ZIP,
+    FT_ZSTD,
+    FT_COUNT        // Sentinel; the number of file type codes.
+};
 
 /**
     Determine if a file is a 7-zip archive.
@@ -54,8 +94,12 @@ isascii_(const char *path, size_t sz);
         ASCII's printable range, False is returned as the file is
         plain-text (ASCII).
 
+        Each chunk is scanned a 64-bit word at a time, falling back to a
+        lookup table only for words containing a control character.
+
     @param path Pointer to the full path of the file to be tested.
-    @param sz Number of bytes to be read in a each chunk.
+    @param sz Number of bytes to be read in a each chunk. This is
+              rounded up to a minimum of ISBINARY_BUFMIN.
     @return Returns True if any of the characters in the file are outside
             ASCII's printable range. Otherwise, False.
 */
@@ -118,4 +162,43 @@ ispdf_(const char *path);
 bool
 iszip_(const char *path);
 
+/**
+    Return the short name for a file type code.
+
+    @param code A file type code, as returned by sniff_().
+    @return A pointer to a static string (e.g. "gzip"), or "unknown"
+            for an unrecognised code.
+*/
+const char *
+filetype_name_(int code);
+
+/**
+    Determine a file's type from its leading bytes.
+
+    Notes:
+        The file is opened *once* and a single header buffer of up to
+        SNIFF_BUFSZ bytes is read, which is then tested against each
+        entry of the signature table. The file extension is *not* used.
+
+        Unlike the is*_() functions, no error message is printed if the
+        file cannot be opened, as this function is designed for bulk
+        classification. FT_ERROR is returned instead.
+
+    @param path Pointer to the full path of the file to be tested.
+    @return Returns the matching filetype code, FT_UNKNOWN if no
+            signature matched, or FT_ERROR if the file could not be read.
+*/
+int
+sniff_(const char *path);
+
+/**
+    Determine a file type from a buffer of leading bytes.
+
+    @param buf Pointer to the header bytes of a file.
+    @param n Number of valid bytes in buf.
+    @return Returns the matching filetype code, or FT_UNKNOWN.
+*/
+int
+sniffbuf_(const unsigned char *buf, size_t n);
+
 #endif /* _FUTILS_H */
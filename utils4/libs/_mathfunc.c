@@ -9,18 +9,26 @@
 #include <limits.h>
 #include <math.h>
 #include <stdbool.h>
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
 
 // The version is found in the header file.
 #define _PHI (1 + sqrt(5)) / 2
+// Maximum number of distinct prime factors for a 64-bit integer (15),
+// rounded up.
+#define FACTORS_MAX 16
 
 /* -----------------------------------------------------------------
   Function prototypes on which other functions rely are placed here
   at the top of the module.
   --------------------------------------------------------------- */
-unsigned long *primefactors(unsigned long N);
-long long reverse(long n);
+bool is_prime(unsigned long long n);
+unsigned long long sigma(unsigned long long n);
+unsigned long long *primefactors(unsigned long long N);
+long long reverse(long long n);
+static uint64_t _mulmod(uint64_t a, uint64_t b, uint64_t m);
 
 // ------------------------------------------------------------------
 
@@ -39,7 +47,7 @@ double PHI(void) {
     @param n  Number whose digits are to be counted.
     @return   Number of digits in the number (n).
 */
-int digits(long n) {
+int digits(long long n) {
     int c = 0;
     n = ( n > 0 ) ? n : -n;  // Support for negative numbers;
     if ( n == 0 )
@@ -51,72 +59,6 @@ int digits(long n) {
     return c;
 }
 
-/**
-    Populate distinct integers to the passed array.
-
-    This function uses a hash-table to identify distinct integers from the
-    passed array.
-
-    @param pvals  Pointer to an array containing integers.
-                  Note: The end of this array is identified when a zero is 
-                  encountered.
-    @param pdist  Pointer to an array to contain the distinct values.
-                  This array can be initialised to a single value,
-                  as the function will reallocate as required.
-                  Note: This array must be created using malloc and passed
-                  as an address.
-    @return       Number of distinct values added to the `pdist` array.
-
-    Usage:
-
-        int size;
-        unsigned long *pfac = primefactors(n);
-        unsigned long *pdist = (unsigned long *)malloc(sizeof(unsigned long));
-
-        size = distinctn(pfac, &pdist);
-
-        // ...
-
-        free(pfac);
-        free(pdist);
-
-    Reminder:
-        The *caller* is responsible for freeing values and distinct values
-        arrays. 
-
-*/
-int distinctn(unsigned long *pvals, unsigned long **pdist) {
-
-    int size = 0;               // Number of distinct values, for return.
-    unsigned long maxf = 0;     // Max factor
-    unsigned long *ht;          // Hash-table
-
-    // Get max factor. Used for initialising the size of the hashtable.
-    for ( unsigned long i = 0; *(pvals + i) != 0; ++i ) {
-        maxf = *(pvals + i) > maxf ? *(pvals + i) : maxf;
-    }
-    ++maxf;
-
-    // Allocate space for the hash-table.
-    ht = (unsigned long *)calloc(maxf, sizeof(unsigned long));
-
-    // Populate the hash-table.
-    for ( unsigned long i = 0; *(pvals + i) != 0; ++i ) {
-        ht[pvals[i]] += 1;
-    }
-
-    // Populate the distinct array.
-    for ( unsigned long i = 0; i < maxf; ++i ) {
-        if ( *(ht + i) ) {
-            *pdist = (unsigned long *)realloc(*pdist, ++size * sizeof(unsigned long));
-            (*pdist)[size-1] = i;
-        }
-    }
-    free(ht);
-
-    return size;
-}
-
 /**
     Implementation of the Sieve of Eratosthenes.
 
@@ -153,6 +95,287 @@ void esieve(bool *P, int n) {
     P[1] = 0;
 }
 
+/**
+    Generate the odd base primes used by the segmented sieve.
+
+    A bit-packed, odd-only Sieve of Eratosthenes is used to collect all
+    odd primes less than or equal to (limit). The prime 2 is *not*
+    included, as the segmented sieve only stores odd numbers.
+
+    Reminder:
+        It is the responsibility of the *caller* to free the memory
+        allocated by this function.
+
+    @param limit  Largest value to be tested, inclusive.
+    @param count  Pointer to a value populated with the number of primes.
+    @return       A pointer to the base primes array, or NULL if the
+                  allocation failed.
+*/
+uint32_t *esieve_base(uint32_t limit, size_t *count) {
+
+    size_t n = 0;
+    size_t nbits = limit / 2 + 1;  // Bit k represents 2k+1.
+    uint64_t *bits = (uint64_t *)calloc(nbits / 64 + 1, sizeof(uint64_t));
+    uint32_t *primes;
+
+    *count = 0;
+    if ( bits == NULL )
+        return NULL;
+    for ( size_t k = 1; (2*k+1) * (2*k+1) <= limit; ++k ) {
+        if ( !(bits[k >> 6] & (1ULL << (k & 63))) ) {
+            size_t p = 2*k+1;
+            for ( size_t j = (p*p) / 2; j < nbits; j += p )
+                bits[j >> 6] |= 1ULL << (j & 63);
+        }
+    }
+    // Composites are set; count and collect the clear bits.
+    for ( size_t k = 1; k < nbits && 2*k+1 <= limit; ++k )
+        n += !(bits[k >> 6] & (1ULL << (k & 63)));
+    if ( (primes = (uint32_t *)malloc((n ? n : 1) * sizeof(uint32_t))) != NULL ) {
+        for ( size_t k = 1, i = 0; k < nbits && 2*k+1 <= limit; ++k ) {
+            if ( !(bits[k >> 6] & (1ULL << (k & 63))) )
+                primes[i++] = 2*k+1;
+        }
+        *count = n;
+    }
+    free(bits);
+    return primes;
+}
+
+/**
+    Sieve a single segment of odd numbers in the range [lo, hi).
+
+    The segment is stored as a bit-array of odd numbers only, where bit
+    (k) represents the number (base + 2k + 1), and base is (lo) rounded
+    down to an even number. On return, a set bit indicates a prime
+    number within [lo, hi). The prime 2 is never represented.
+
+    The segment should be sized to fit in the L1/L2 cache; for example
+    32 KiB of bits covers 524288 integers.
+
+    @param lo     Start of the range, inclusive.
+    @param hi     End of the range, exclusive. (hi - base) must not
+                  exceed (nwords * 128).
+    @param bp     Pointer to the odd base primes, up to sqrt(hi).
+    @param nbp    Number of base primes.
+    @param bits   Pointer to the segment's bit-array.
+    @param nwords Number of 64-bit words in the bit-array.
+    @return       Number of primes in the segment.
+*/
+size_t esieve_segment(uint64_t lo,
+                      uint64_t hi,
+                      const uint32_t *bp,
+                      size_t nbp,
+                      uint64_t *bits,
+                      size_t nwords) {
+
+    size_t count = 0;
+    uint64_t base = lo & ~1ULL;
+    uint64_t nbits = (hi - base) / 2;  // Odd numbers in [base, hi).
+
+    memset(bits, 0xff, nwords * sizeof(uint64_t));
+    for ( size_t i = 0; i < nbp; ++i ) {
+        uint64_t p = bp[i];
+        uint64_t j = p * p;
+        if ( j >= hi )
+            break;
+        if ( j < base + 1 ) {
+            // First odd multiple of p at or after base+1.
+            j = ((base + 1 + p - 1) / p) * p;
+            if ( !(j & 1) )
+                j += p;
+        }
+        for ( j = (j - base - 1) / 2; j < nbits; j += p )
+            bits[j >> 6] &= ~(1ULL << (j & 63));
+    }
+    // Clear everything outside [lo, hi), and the number 1.
+    for ( uint64_t k = 0; base + 2*k + 1 < lo || base + 2*k + 1 < 2; ++k )
+        bits[k >> 6] &= ~(1ULL << (k & 63));
+    for ( uint64_t k = nbits; k < (uint64_t)nwords * 64; ++k )
+        bits[k >> 6] &= ~(1ULL << (k & 63));
+    for ( size_t w = 0; w < nwords; ++w )
+        count += __builtin_popcountll(bits[w]);
+    return count;
+}
+
+/**
+    Extract the primes from a sieved segment.
+
+    @param lo     Start of the segment's range, as passed to
+                  esieve_segment.
+    @param bits   Pointer to the sieved bit-array.
+    @param nwords Number of 64-bit words in the bit-array.
+    @param out    Pointer to an array to be populated with the primes.
+                  The array must be large enough to hold the count
+                  returned by esieve_segment.
+    @return       Number of primes written to (out).
+*/
+size_t esieve_extract(uint64_t lo, const uint64_t *bits, size_t nwords, uint64_t *out) {
+
+    size_t n = 0;
+    uint64_t base = lo & ~1ULL;
+
+    for ( size_t w = 0; w < nwords; ++w ) {
+        uint64_t word = bits[w];
+        while ( word ) {
+            out[n++] = base + 2 * ((uint64_t)w * 64 + __builtin_ctzll(word)) + 1;
+            word &= word - 1;  // Clear the lowest set bit.
+        }
+    }
+    return n;
+}
+
+/**
+    Calculate the greatest common divisor of two unsigned integers.
+
+    @param a  Integer A.
+    @param b  Integer B.
+    @return   The GCD of A and B.
+*/
+static uint64_t _gcd64(uint64_t a, uint64_t b) {
+    uint64_t tmp;
+    while ( b ) {
+        tmp = a % b;
+        a = b;
+        b = tmp;
+    }
+    return a;
+}
+
+/**
+    Find a non-trivial factor of a composite number using Brent's
+    variant of Pollard's rho algorithm.
+
+    The polynomial f(x) = x^2 + c (mod n) is iterated, and the GCD is
+    accumulated over batches of 128 steps to reduce the number of GCD
+    calculations. If a batch overshoots (the GCD is n), the batch is
+    replayed one step at a time. If a cycle is found without a factor,
+    the next value of c is tried.
+
+    @param n  An odd composite number.
+    @return   A non-trivial factor of (n).
+*/
+static uint64_t _rho(uint64_t n) {
+    const uint64_t m = 128;
+    uint64_t c, g, i, k, q, r, x, y, ys;
+
+    for ( c = 1; ; ++c ) {
+        y = 2;
+        ys = 2;
+        q = 1;
+        g = 1;
+        x = 2;
+        for ( r = 1; g == 1; r <<= 1 ) {
+            x = y;
+            for ( i = 0; i < r; ++i ) {
+                y = _mulmod(y, y, n);
+                y = ( y >= n - c ) ? y - (n - c) : y + c;
+            }
+            for ( k = 0; k < r && g == 1; k += m ) {
+                ys = y;
+                for ( i = 0; i < m && i < r - k; ++i ) {
+                    y = _mulmod(y, y, n);
+                    y = ( y >= n - c ) ? y - (n - c) : y + c;
+                    q = _mulmod(q, x > y ? x - y : y - x, n);
+                }
+                g = _gcd64(q, n);
+            }
+        }
+        if ( g == n ) {
+            // Replay the last batch one step at a time.
+            do {
+                ys = _mulmod(ys, ys, n);
+                ys = ( ys >= n - c ) ? ys - (n - c) : ys + c;
+                g = _gcd64(x > ys ? x - ys : ys - x, n);
+            } while ( g == 1 );
+        }
+        if ( g != n )
+            return g;
+    }
+}
+
+/**
+    Recursively split (n) into its prime factors using Pollard's rho.
+
+    @param n   Number to be factorised; with no factors below 1024.
+    @param f   Pointer to the factors array to be populated.
+    @param nf  Pointer to the number of factors in the array.
+*/
+static void _factor_rho(uint64_t n, uint64_t *f, int *nf) {
+    uint64_t d;
+    if ( n == 1 )
+        return;
+    if ( is_prime(n) ) {
+        f[(*nf)++] = n;
+        return;
+    }
+    d = _rho(n);
+    _factor_rho(d, f, nf);
+    _factor_rho(n / d, f, nf);
+}
+
+/**
+    Factorise (n) into its distinct prime factors and their exponents.
+
+    Factors below 1024 are removed by trial division using a mod-30
+    wheel. Any remaining cofactor is tested using the Miller-Rabin
+    primality test and, if composite, split using Brent's variant of
+    Pollard's rho algorithm. This runs in near-constant time for all
+    64-bit inputs.
+
+    A 64-bit integer has at most 15 distinct prime factors. Therefore,
+    the arrays should be allocated with (at least) FACTORS_MAX elements.
+
+    @param n      Number to be factorised, where n > 0.
+    @param primes Pointer to an array to be populated with the distinct
+                  prime factors, in ascending order.
+    @param exps   Pointer to an array to be populated with the exponent
+                  of each prime factor.
+    @return       Number of distinct prime factors.
+*/
+int factorise(unsigned long long n, unsigned long long *primes, int *exps) {
+    static const int WHEEL[] = {4, 2, 4, 2, 4, 6, 2, 6};
+    static const int SMALL[] = {2, 3, 5};
+    uint64_t f[64], p, t;
+    int i, j, nf = 0, np = 0;
+
+    if ( n < 2 )
+        return 0;
+    for ( i = 0; i < 3; ++i ) {
+        while ( !(n % SMALL[i]) ) {
+            f[nf++] = SMALL[i];
+            n /= SMALL[i];
+        }
+    }
+    for ( p = 7, i = 0; p < 1024 && p * p <= n; p += WHEEL[i++ & 7] ) {
+        while ( !(n % p) ) {
+            f[nf++] = p;
+            n /= p;
+        }
+    }
+    if ( n > 1 && n < p * p ) {
+        // The cofactor has no factors below its square root.
+        f[nf++] = n;
+    } else {
+        _factor_rho(n, f, &nf);
+    }
+    // Sort (insertion; at most 64 elements) and collate the exponents.
+    for ( i = 1; i < nf; ++i ) {
+        for ( t = f[i], j = i - 1; j >= 0 && f[j] > t; --j )
+            f[j + 1] = f[j];
+        f[j + 1] = t;
+    }
+    for ( i = 0; i < nf; ++i ) {
+        if ( np && primes[np - 1] == f[i] ) {
+            ++exps[np - 1];
+        } else {
+            primes[np] = f[i];
+            exps[np++] = 1;
+        }
+    }
+    return np;
+}
+
 /**
     Generate the Fibonacci sequence to index (N), inclusive.
 
@@ -206,8 +429,8 @@ int fib_index(unsigned long long n) {
     @param b  Integer B.
     @return   The GCD of A and B.
 */
-long gcd(long a, long b) {
-    long tmp;
+long long gcd(long long a, long long b) {
+    long long tmp;
     while ( b != 0 ) {
         tmp = a % b;
         a = b;
@@ -248,8 +471,8 @@ int int_nbits(long long n) {
     @param n  Number to be tested.
     @return   1 if the number is palindromatic, otherwise 0.
 */
-bool is_palindrome_num(long n) {
-    long rev;
+bool is_palindrome_num(long long n) {
+    long long rev;
     // Store absolute value of n.
     if ( n < 0 ) n = -n;
     rev = reverse(n);
@@ -266,13 +489,13 @@ bool is_palindrome_num(long n) {
     @param n  Number to be tested.
     @return   1 if the number is pandigital, otherwise 0.
 */
-bool is_pandigital(long n) {
+bool is_pandigital(long long n) {
     long d = 0;
     int e = (1 << (digits(n) + 1)) - 2;
     while (n > 0) {
         //d |= 1 << (int)(n - (floor(n / 10) * 10));
         d |= 1 << ( n % 10 );
-        n = floor(n / 10);
+        n /= 10;
     }
     return (d == e) ? 1 : 0;
 }
@@ -283,7 +506,7 @@ bool is_pandigital(long n) {
     @param n  Number to be tested.
     @return   1 if the number is pentagonal, otherwise 0.
 */
-bool is_pentagonal(long n) {
+bool is_pentagonal(long long n) {
     if (n == 0) return 0;
     float pent = ((sqrt(1 + 24*n) + 1) / 6);
     return ( !(fmod(pent, 1)) );
@@ -295,21 +518,18 @@ bool is_pentagonal(long n) {
     A perfect number is defined as a positive integer that is equal to the
     sum of its positive divisors, excluding itself.
 
+    The test is carried out as sigma(n) == 2n, using the factorisation
+    engine rather than trial division of all values up to n/2.
+
     Note: The only perfect numbers below 1000000 are: 6, 28, 496 and 8128.
 
     @param n Number to be tested.
     @return  True if (n) is perfect, otherwise False.
 */
-bool is_perfect(unsigned int n) {
-
-    unsigned int sum = 0;
-    unsigned int i = 1;
-
-    for ( ; i < n / 2+1; ++i ) {
-        if ( !(n % i) ) sum += i;
-    }
-    return ( sum == n ) ? 1 : 0;
-
+bool is_perfect(unsigned long long n) {
+    unsigned long long s = sigma(n);
+    // An overflowed sigma (0) cannot equal 2n for any 64-bit perfect number.
+    return ( n && s && n <= ULLONG_MAX / 2 && s == 2 * n ) ? 1 : 0;
 }
 
 /**
@@ -352,22 +572,97 @@ bool is_permutation(unsigned long long a, unsigned long long b) {
 
 }
 
+/**
+    Calculate (a * b) mod m without overflow.
+
+    If the compiler provides a 128-bit integer type, this is used for
+    the intermediate product. Otherwise, a double-and-add loop is used.
+
+    @param a  Multiplicand, where a < m.
+    @param b  Multiplier, where b < m.
+    @param m  Modulus.
+    @return   The value of (a * b) mod m.
+*/
+static uint64_t _mulmod(uint64_t a, uint64_t b, uint64_t m) {
+#ifdef __SIZEOF_INT128__
+    __extension__ typedef unsigned __int128 uint128_t;
+    return (uint64_t)(((uint128_t)a * b) % m);
+#else
+    uint64_t r = 0;
+    while ( b ) {
+        if ( b & 1 )
+            r = ( r >= m - a ) ? r - (m - a) : r + a;
+        a = ( a >= m - a ) ? a - (m - a) : a + a;
+        b >>= 1;
+    }
+    return r;
+#endif
+}
+
+/**
+    Calculate (b ^ e) mod m using binary exponentiation.
+
+    @param b  Base.
+    @param e  Exponent.
+    @param m  Modulus.
+    @return   The value of (b ^ e) mod m.
+*/
+static uint64_t _powmod(uint64_t b, uint64_t e, uint64_t m) {
+    uint64_t r = 1;
+    b %= m;
+    while ( e ) {
+        if ( e & 1 )
+            r = _mulmod(r, b, m);
+        b = _mulmod(b, b, m);
+        e >>= 1;
+    }
+    return r;
+}
+
 /**
     Test if a number is prime.
 
+    Small primes are handled by trial division against the primes up to
+    37, which also filters the majority of composites. Remaining values
+    are tested using the Miller-Rabin test with Sinclair's seven
+    witnesses, which is deterministic for all 64-bit integers.
+
     @param n  Number to be tested.
     @return   1 if the number is prime, otherwise 0.
 */
-bool is_prime(unsigned long n) {
-    if (n == 2)
-        return 1;
-    else if ( !(n % 2) | (n < 2) )
+bool is_prime(unsigned long long n) {
+    static const uint64_t P[] = {2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37};
+    static const uint64_t W[] = {2, 325, 9375, 28178, 450775, 9780504, 1795265022};
+    const int np = sizeof P / sizeof P[0];
+    const int nw = sizeof W / sizeof W[0];
+    uint64_t a, d, x;
+    int r, i, j;
+
+    if ( n < 2 )
         return 0;
-    else {
-        for ( int i = 3; i <= sqrt(n); i += 2 ) {
-            if ( !(n % i) )
-                return 0;
+    for ( i = 0; i < np; ++i ) {
+        if ( n == P[i] )
+            return 1;
+        if ( !(n % P[i]) )
+            return 0;
+    }
+    if ( n < 37 * 37 )
+        return 1;
+    // Write n-1 as d * 2^r, with d odd.
+    for ( d = n - 1, r = 0; !(d & 1); d >>= 1, ++r );
+    for ( i = 0; i < nw; ++i ) {
+        if ( (a = W[i] % n) == 0 )
+            continue;
+        x = _powmod(a, d, n);
+        if ( x == 1 || x == n - 1 )
+            continue;
+        for ( j = 1; j < r; ++j ) {
+            x = _mulmod(x, x, n);
+            if ( x == n - 1 )
+                break;
         }
+        if ( j == r )
+            return 0;
     }
     return 1;
 }
@@ -378,7 +673,7 @@ bool is_prime(unsigned long n) {
     @param n  Number to be tested.
     @return   1 if the number is triangular, otherwise 0.
 */
-bool is_triangular(long n) {
+bool is_triangular(long long n) {
     if (n == 0) return 0;
     float tri = ((sqrt(1 + 8*n) + 1) / 2);
     return ( !(fmod(tri, 1)) );
@@ -391,7 +686,7 @@ bool is_triangular(long n) {
     @param b  Integer B.
     @return   The LCM of A and B.
 */
-long lcm(long a, long b) {
+long long lcm(long long a, long long b) {
     if ( (a < 0) | (b < 0) ) {
         printf("ValueError: One or both of the passed integers are less than zero.\n");
         return -1;
@@ -400,6 +695,30 @@ long lcm(long a, long b) {
     }
 }
 
+/**
+    Calculate the number of positive divisors of (n).
+
+    The number of divisors is calculated from the prime factorisation
+    of n = p1^e1 * p2^e2 * ... as:
+
+        d(n) = (e1 + 1) * (e2 + 1) * ...
+
+    @param n  Integer for which the divisors are counted.
+    @return   The number of divisors of (n), or 0 if (n) is 0.
+*/
+unsigned long long num_divisors(unsigned long long n) {
+    unsigned long long p[FACTORS_MAX];
+    int e[FACTORS_MAX];
+    unsigned long long d = 1;
+    int k;
+    if ( n == 0 )
+        return 0;
+    k = factorise(n, p, e);
+    for ( int i = 0; i < k; ++i )
+        d *= e[i] + 1;
+    return d;
+}
+
 /**
     Calculate the result of the phi (or Euler's totient) function.
 
@@ -408,78 +727,62 @@ long lcm(long a, long b) {
 
     If N is prime, the result of the phi function is N-1.
 
-    If N is not prime, the result is calculated as:
+    If N is not prime, the result is calculated from the prime
+    factorisation of N, using integer arithmetic only, as:
 
-        phi(n) = n * Pi(1 - 1/p)
+        phi(n) = Pi(p^(e-1) * (p-1))
 
     where the product is obtained for all *distinct* prime factors of N,
-    (or p).
+    (or p), and (e) is the exponent of each factor.
 
     @param n  Integer for which phi is calculated.
     @return   The result of the phi function.
 */
-unsigned long phi(unsigned long n) {
-
-    // Shortcut for prime integers.
-    if ( is_prime(n) )
-        return n-1;
-
-    // Full solution for composite integers.
-    unsigned long *pfac = primefactors(n);
-    unsigned long *pdist = (unsigned long *)malloc(sizeof(unsigned long));
-    int size = distinctn(pfac, &pdist);
-    unsigned long phi = n;
-
-    for ( int i = 0; i < size; ++i ) {
-        phi *= (1 - 1.0/pdist[i]);
+unsigned long long phi(unsigned long long n) {
+    unsigned long long p[FACTORS_MAX];
+    int e[FACTORS_MAX];
+    unsigned long long phi = 1;
+    int k;
+
+    if ( n < 2 )
+        return n;
+    k = factorise(n, p, e);
+    for ( int i = 0; i < k; ++i ) {
+        phi *= p[i] - 1;
+        for ( int j = 1; j < e[i]; ++j )
+            phi *= p[i];
     }
-
-    free(pfac);
-    free(pdist);
-    
     return phi;
 }
 
 /**
     Generate an array of prime factors of N, where N > 0.
 
+    The factors are listed in ascending order, with repetition, and the
+    end of the array is identified by a zero. This is a flattened form
+    of the factorise function.
+
     Reminder:
         It is the responsibility of the *caller* to free the memory 
         allocated by this function.
 
     @param N  Positive number to factorise.
-    @return   Pointer to the prime factors array.
+    @return   Pointer to the prime factors array, or NULL if the
+              allocation failed.
 */
-unsigned long *primefactors(unsigned long N) {
-    
-    float sqrtN = sqrt(N);
-    unsigned long *ptr_arr = (unsigned long *)calloc(256, sizeof(unsigned long));
+unsigned long long *primefactors(unsigned long long N) {
+    unsigned long long p[FACTORS_MAX];
+    int e[FACTORS_MAX];
+    int k = factorise(N, p, e);
     int curr = 0;
-    int p = 3;
-
-    while ( N >= 2 ) {
-        // Primality test.
-        if ( is_prime(N) ) {
-            ptr_arr[curr++] = N;  
-            break;
-        } 
-        // Evens test.
-        if ( !(N % 2) ) {
-            ptr_arr[curr++] = 2;  
-            N /= 2;
-        } else {
-            // Loop to find next prime.
-            while ( p <= sqrtN ) {
-                if ( !(N % p) ) {
-                    ptr_arr[curr++] = p;
-                    N /= p;
-                    p = 3;
-                    break;  // In case n is now prime.
-                } else {
-                    p += 2;
-                }
-            }
-        }
+    // A 64-bit value has at most 64 prime factors; plus the terminator.
+    unsigned long long *ptr_arr = (unsigned long long *)calloc(65, sizeof(unsigned long long));
+
+    if ( ptr_arr == NULL )
+        return NULL;
+    for ( int i = 0; i < k; ++i ) {
+        for ( int j = 0; j < e[i]; ++j )
+            ptr_arr[curr++] = p[i];
     }
     return ptr_arr;
 }
@@ -490,7 +793,7 @@ unsigned long *primefactors(unsigned long N) {
     @param n  Number to be reversed.
     @returns  The value of (n), reversed.
 */
-long long reverse(long n) {
+long long reverse(long long n) {
 
     bool neg = n < 0;
     int d = digits(n) - 1;
@@ -512,13 +815,46 @@ long long reverse(long n) {
     @param n  Number to be rotated.
     @return   The number (n), rotated left to right.
 */
-long long rotate(long n) {
+long long rotate(long long n) {
     int d = digits(n);
     int r = n % 10;
-    long v = floor(n / 10);
+    long long v = n / 10;
     return (r * pow(10, d - 1)) + v; 
 }
 
+/**
+    Calculate the sum of the positive divisors of (n).
+
+    The sum is calculated from the prime factorisation of
+    n = p1^e1 * p2^e2 * ... as:
+
+        sigma(n) = Pi((p^(e+1) - 1) / (p - 1))
+
+    @param n  Integer for which the divisors are summed.
+    @return   The sum of the divisors of (n). If (n) is 0, or the sum
+              overflows 64 bits, 0 is returned.
+*/
+unsigned long long sigma(unsigned long long n) {
+    unsigned long long p[FACTORS_MAX];
+    int e[FACTORS_MAX];
+    unsigned long long s = 1, t, pk;
+    int k;
+
+    if ( n == 0 )
+        return 0;
+    k = factorise(n, p, e);
+    for ( int i = 0; i < k; ++i ) {
+        // Sum of the geometric series 1 + p + p^2 + ... + p^e.
+        for ( t = 1, pk = 1; e[i]--; ) {
+            if ( __builtin_mul_overflow(pk, p[i], &pk) || __builtin_add_overflow(t, pk, &t) )
+                return 0;
+        }
+        if ( __builtin_mul_overflow(s, t, &s) )
+            return 0;
+    }
+    return s;
+}
+
 /**
     Print the data type size and ranges to a table.
 */
@@ -3,9 +3,15 @@
 */
 
 #include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
 
 const char *VERSION = "1.1.1";
 
+// Maximum number of distinct prime factors for a 64-bit integer (15),
+// rounded up.
+#define FACTORS_MAX 16
+
 /** 
     The constant phi.
 
@@ -19,43 +25,7 @@ double PHI(void);
     @param n  Number whose digits are to be counted.
     @return   Number of digits in n.
 */
-int digits(long n);
-
-/**
-    Populate distinct integers to the passed array.
-
-    This function uses a hash-table to identify distinct integers from the
-    passed array.
-
-    @param pvals  Pointer to an array containing integers.
-                  Note: The end of this array is identified when a zero is 
-                  encountered.
-    @param pdist  Pointer to an array to contain the distinct values.
-                  This array can be initialised to a single value,
-                  as the function will reallocate as required.
-                  Note: This array must be created using malloc and passed
-                  as an address.
-    @return       Number of distinct values added to the `pdist` array.
-
-    Usage:
-
-        int size;
-        unsigned long *pfac = primefactors(n);
-        unsigned long *pdist = (unsigned long *)malloc(sizeof(unsigned long));
-
-        size = distinctn(pfac, &pdist);
-
-        // ...
-
-        free(pfac);
-        free(pdist);
-
-    Reminder:
-        The *caller* is responsible for freeing values and distinct values
-        arrays. 
-
-*/
-int distinctn(unsigned long *pvals, unsigned long **pdist);
+int digits(long long n);
 
 /**
     Implementation of the Sieve of Eratosthenes.
@@ -78,6 +48,78 @@ int distinctn(unsigned long *pvals, unsigned long **pdist);
 */
 void esieve(bool *P, int n);
 
+/**
+    Generate the odd base primes used by the segmented sieve.
+
+    A bit-packed, odd-only Sieve of Eratosthenes is used to collect all
+    odd primes less than or equal to (limit). The prime 2 is *not*
+    included, as the segmented sieve only stores odd numbers.
+
+    Reminder:
+        It is the responsibility of the *caller* to free the memory
+        allocated by this function.
+
+    @param limit  Largest value to be tested, inclusive.
+    @param count  Pointer to a value populated with the number of primes.
+    @return       A pointer to the base primes array, or NULL if the
+                  allocation failed.
+*/
+uint32_t *esieve_base(uint32_t limit, size_t *count);
+
+/**
+    Sieve a single segment of odd numbers in the range [lo, hi).
+
+    The segment is stored as a bit-array of odd numbers only, where bit
+    (k) represents the number (base + 2k + 1), and base is (lo) rounded
+    down to an even number. On return, a set bit indicates a prime
+    number within [lo, hi). The prime 2 is never represented.
+
+    @param lo     Start of the range, inclusive.
+    @param hi     End of the range, exclusive. (hi - base) must not
+                  exceed (nwords * 128).
+    @param bp     Pointer to the odd base primes, up to sqrt(hi).
+    @param nbp    Number of base primes.
+    @param bits   Pointer to the segment's bit-array.
+    @param nwords Number of 64-bit words in the bit-array.
+    @return       Number of primes in the segment.
+*/
+size_t esieve_segment(uint64_t lo,
+                      uint64_t hi,
+                      const uint32_t *bp,
+                      size_t nbp,
+                      uint64_t *bits,
+                      size_t nwords);
+
+/**
+    Extract the primes from a sieved segment.
+
+    @param lo     Start of the segment's range, as passed to
+                  esieve_segment.
+    @param bits   Pointer to the sieved bit-array.
+    @param nwords Number of 64-bit words in the bit-array.
+    @param out    Pointer to an array to be populated with the primes.
+    @return       Number of primes written to (out).
+*/
+size_t esieve_extract(uint64_t lo, const uint64_t *bits, size_t nwords, uint64_t *out);
+
+/**
+    Factorise (n) into its distinct prime factors and their exponents.
+
+    Factors below 1024 are removed by trial division using a mod-30
+    wheel. Any remaining cofactor is tested using the Miller-Rabin
+    primality test and, if composite, split using Brent's variant of
+    Pollard's rho algorithm.
+
+    @param n      Number to be factorised, where n > 0.
+    @param primes Pointer to an array of (at least) FACTORS_MAX elements,
+                  to be populated with the distinct prime factors, in
+                  ascending order.
+    @param exps   Pointer to an array of (at least) FACTORS_MAX elements,
+                  to be populated with the exponent of each factor.
+    @return       Number of distinct prime factors.
+*/
+int factorise(unsigned long long n, unsigned long long *primes, int *exps);
+
 /**
     Generate the Fibonacci sequence to index (N), inclusive.
 
@@ -108,7 +150,7 @@ int fib_index(unsigned long long n);
     @param b  Integer B.
     @return   The GCD of integers A and B.
 */
-long gcd(long a, long b);
+long long gcd(long long a, long long b);
 
 /**
     Concatenate two integers.
@@ -133,7 +175,7 @@ int int_nbits(long long n);
     @param n  Number to be tested.
     @return   1 if the number of palindromatic, otherwise 0.
 */
-bool is_palindrome_num(long n);
+bool is_palindrome_num(long long n);
 
 /**
     Test if a number is pandigital.
@@ -141,7 +183,7 @@ bool is_palindrome_num(long n);
     @param n  Number to be tested.
     @return   1 if the number is pandigital, otherwise 0.
 */
-bool is_pandigital(long n);
+bool is_pandigital(long long n);
 
 /**
     Test if a number is pentagonal.
@@ -149,7 +191,7 @@ bool is_pandigital(long n);
     @param n  Number to be tested.
     @return   1 if the number is pentagonal, otherwise 0.
 */
-bool is_pentagonal(long n);
+bool is_pentagonal(long long n);
 
 /**
     Test if (n) is a perfect number.
@@ -162,7 +204,7 @@ bool is_pentagonal(long n);
     @param n Number to be tested.
     @return  True if (n) is perfect, otherwise False.
 */
-bool is_perfect(unsigned int n);
+bool is_perfect(unsigned long long n);
 
 /**
     Test if two positive integers are permutations of eachother.
@@ -176,10 +218,15 @@ bool is_permutation(unsigned long long a, unsigned long long b);
 /**
     Test if a number is prime.
 
+    Small primes are handled by trial division against the primes up to
+    37, which also filters the majority of composites. Remaining values
+    are tested using the Miller-Rabin test with Sinclair's seven
+    witnesses, which is deterministic for all 64-bit integers.
+
     @param n  Number to be tested.
     @return   1 if the number is prime, otherwise 0.
 */
-bool is_prime(unsigned long n);
+bool is_prime(unsigned long long n);
 
 /**
     Test if a number is triangular.
@@ -187,7 +234,7 @@ bool is_prime(unsigned long n);
     @param n  Number to be tested.
     @return   1 if the number is triangular, otherwise 0.
 */
-bool is_triangular(long n);
+bool is_triangular(long long n);
 
 /**
     Calculate the least common multiple of integers A and B.
@@ -196,7 +243,15 @@ bool is_triangular(long n);
     @param b  Integer B.
     @return   The LCM of integers A and B.
 */
-long lcm(long a, long b);
+long long lcm(long long a, long long b);
+
+/**
+    Calculate the number of positive divisors of (n).
+
+    @param n  Integer for which the divisors are counted.
+    @return   The number of divisors of (n), or 0 if (n) is 0.
+*/
+unsigned long long num_divisors(unsigned long long n);
 
 /**
     Calculate the result of the phi (or Euler's totient) function.
@@ -206,21 +261,25 @@ long lcm(long a, long b);
 
     If N is prime, the result of the phi function is N-1.
 
-    If N is not prime, the result is calculated as:
+    If N is not prime, the result is calculated from the prime
+    factorisation of N, as:
 
-        phi(n) = n * Pi(1 - 1/p)
+        phi(n) = Pi(p^(e-1) * (p-1))
 
     where the product is obtained for all *distinct* prime factors of N,
-    (or p).
+    (or p), and (e) is the exponent of each factor.
 
     @param n  Integer for which phi is calculated.
     @return   The result of the phi function.
 */
-unsigned long phi(unsigned long n);
+unsigned long long phi(unsigned long long n);
 
 /**
     Generate an array of prime factors of N, where N > 0.
 
+    The factors are listed in ascending order, with repetition, and the
+    end of the array is identified by a zero.
+
     Reminder:
         The caller of this function is responsible for freeing the
         memory block allocated by this function.
@@ -228,7 +287,7 @@ unsigned long phi(unsigned long n);
     @param N  Positive number to factorise.
     @return   Pointer to the prime factors array.
 */
-unsigned long *primefactors(unsigned long N);
+unsigned long long *primefactors(unsigned long long N);
 
 /**
     Reverse a number.
@@ -236,7 +295,7 @@ unsigned long *primefactors(unsigned long N);
     @param n  Number to be reversed.
     @return   The specified number, reversed.
 */
-long long reverse(long n);
+long long reverse(long long n);
 
 /**
     Rotate a number, moving the last digit to the first.
@@ -244,7 +303,16 @@ long long reverse(long n);
     @param n  Number to be rotated.
     @return   The specified number, rotated one position left to right.
 */
-long long rotate(long n);
+long long rotate(long long n);
+
+/**
+    Calculate the sum of the positive divisors of (n).
+
+    @param n  Integer for which the divisors are summed.
+    @return   The sum of the divisors of (n). If (n) is 0, or the sum
+              overflows 64 bits, 0 is returned.
+*/
+unsigned long long sigma(unsigned long long n);
 
 /**
     Print data type sizes and ranges to a table.
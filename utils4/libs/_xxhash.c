@@ -0,0 +1,240 @@
+/**
+    Purpose:    This module contains a C implementation of the XXH64
+                non-cryptographic hash algorithm, for utils4's xxhash
+                module.
+
+    Developer:  J Berendt
+    Email:      development@3dev.uk
+
+    Comments:   This implementation follows the XXH64 specification by
+                Yann Collet, and produces identical digests to the
+                reference implementation. Input is read as little-endian
+                regardless of the host byte order.
+
+                XXH64 is intended for integrity checks and change
+                detection only. It offers *no* protection against
+                deliberate tampering.
+
+    Copyright (C) 73rd Street Development
+    This file is part of the utils4 library.
+*/
+
+#include <errno.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include "_xxhash.h"
+
+static const uint64_t P1 = 0x9E3779B185EBCA87ULL;
+static const uint64_t P2 = 0xC2B2AE3D27D4EB4FULL;
+static const uint64_t P3 = 0x165667B19E3779F9ULL;
+static const uint64_t P4 = 0x85EBCA77C2B2AE63ULL;
+static const uint64_t P5 = 0x27D4EB2F165667C5ULL;
+
+static inline uint64_t _rotl(uint64_t x, int r) {
+    return (x << r) | (x >> (64 - r));
+}
+
+// Byte-wise little-endian reads; compilers reduce these to single loads.
+static inline uint64_t _read64(const uint8_t *p) {
+    return (uint64_t)p[0]       | (uint64_t)p[1] << 8
+         | (uint64_t)p[2] << 16 | (uint64_t)p[3] << 24
+         | (uint64_t)p[4] << 32 | (uint64_t)p[5] << 40
+         | (uint64_t)p[6] << 48 | (uint64_t)p[7] << 56;
+}
+
+static inline uint32_t _read32(const uint8_t *p) {
+    return (uint32_t)p[0]       | (uint32_t)p[1] << 8
+         | (uint32_t)p[2] << 16 | (uint32_t)p[3] << 24;
+}
+
+static inline uint64_t _round(uint64_t acc, uint64_t input) {
+    acc += input * P2;
+    acc = _rotl(acc, 31);
+    return acc * P1;
+}
+
+static inline uint64_t _merge(uint64_t acc, uint64_t val) {
+    acc ^= _round(0, val);
+    return acc * P1 + P4;
+}
+
+/**
+    Consume whole 32-byte stripes from (p), returning the number of
+    bytes consumed.
+*/
+static size_t _stripes(uint64_t *v, const uint8_t *p, size_t len) {
+    const uint8_t *const start = p;
+    const uint8_t *const limit = p + (len & ~(size_t)31);
+    uint64_t v1 = v[0], v2 = v[1], v3 = v[2], v4 = v[3];
+    while ( p < limit ) {
+        v1 = _round(v1, _read64(p));
+        v2 = _round(v2, _read64(p + 8));
+        v3 = _round(v3, _read64(p + 16));
+        v4 = _round(v4, _read64(p + 24));
+        p += 32;
+    }
+    v[0] = v1; v[1] = v2; v[2] = v3; v[3] = v4;
+    return (size_t)(p - start);
+}
+
+/**
+    Reset the state, ready for a new digest.
+
+    Args:
+        state: Pointer to the state to be reset.
+        seed: Seed value for the hash.
+*/
+void xxh64_reset_(xxh64_state *state, uint64_t seed) {
+    memset(state, 0, sizeof(*state));
+    state->seed = seed;
+    state->v[0] = seed + P1 + P2;
+    state->v[1] = seed + P2;
+    state->v[2] = seed;
+    state->v[3] = seed - P1;
+}
+
+/**
+    Add data to the digest.
+
+    Args:
+        state: Pointer to the state to be updated.
+        data: Pointer to the data.
+        len: Length of the data, in bytes.
+*/
+void xxh64_update_(xxh64_state *state, const void *data, size_t len) {
+    const uint8_t *p = (const uint8_t *)data;
+    size_t fill;
+    if ( len == 0 )
+        return;
+    state->total_len += len;
+    // Complete a stripe held over from the previous update.
+    if ( state->memsize ) {
+        fill = 32 - state->memsize;
+        if ( len < fill ) {
+            memcpy(state->mem + state->memsize, p, len);
+            state->memsize += (uint32_t)len;
+            return;
+        }
+        memcpy(state->mem + state->memsize, p, fill);
+        _stripes(state->v, state->mem, 32);
+        p += fill;
+        len -= fill;
+        state->memsize = 0;
+    }
+    fill = _stripes(state->v, p, len);
+    p += fill;
+    len -= fill;
+    if ( len ) {
+        memcpy(state->mem, p, len);
+        state->memsize = (uint32_t)len;
+    }
+}
+
+/**
+    Finalise the digest.
+
+    The state is not modified, so more data may be added after a digest
+    has been taken.
+
+    Args:
+        state: Pointer to the state.
+
+    Returns:
+        The 64-bit XXH64 digest.
+*/
+uint64_t xxh64_digest_(const xxh64_state *state) {
+    const uint8_t *p = state->mem;
+    uint32_t rem = state->memsize;
+    uint64_t h;
+    if ( state->total_len >= 32 ) {
+        h = _rotl(state->v[0], 1) + _rotl(state->v[1], 7)
+          + _rotl(state->v[2], 12) + _rotl(state->v[3], 18);
+        h = _merge(h, state->v[0]);
+        h = _merge(h, state->v[1]);
+        h = _merge(h, state->v[2]);
+        h = _merge(h, state->v[3]);
+    } else {
+        h = state->seed + P5;
+    }
+    h += state->total_len;
+    for ( ; rem >= 8; p += 8, rem -= 8 )
+        h = _rotl(h ^ _round(0, _read64(p)), 27) * P1 + P4;
+    if ( rem >= 4 ) {
+        h = _rotl(h ^ ((uint64_t)_read32(p) * P1), 23) * P2 + P3;
+        p += 4;
+        rem -= 4;
+    }
+    for ( ; rem; ++p, --rem )
+        h = _rotl(h ^ ((uint64_t)*p * P5), 11) * P1;
+    // Avalanche.
+    h ^= h >> 33;
+    h *= P2;
+    h ^= h >> 29;
+    h *= P3;
+    h ^= h >> 32;
+    return h;
+}
+
+/**
+    Calculate the XXH64 digest of a single buffer.
+
+    Args:
+        data: Pointer to the data.
+        len: Length of the data, in bytes.
+        seed: Seed value for the hash.
+
+    Returns:
+        The 64-bit XXH64 digest.
+*/
+uint64_t xxh64_(const void *data, size_t len, uint64_t seed) {
+    xxh64_state state;
+    xxh64_reset_(&state, seed);
+    xxh64_update_(&state, data, len);
+    return xxh64_digest_(&state);
+}
+
+/**
+    Calculate the XXH64 digest of a file.
+
+    The file is read through an unbuffered stream into a single heap
+    buffer of XXH64_FILE_BUFSZ bytes.
+
+    Args:
+        path: Full path to the file.
+        seed: Seed value for the hash.
+        digest: Pointer to which the digest is written, on success.
+
+    Returns:
+        0 on success, or -1 if the file could not be opened or read, in
+        which case errno is set.
+*/
+int xxh64_file_(const char *path, uint64_t seed, uint64_t *digest) {
+    FILE *fp;
+    uint8_t *buf;
+    size_t n;
+    int err = 0;
+    xxh64_state state;
+    if ( (fp = fopen(path, "rb")) == NULL )
+        return -1;
+    if ( (buf = malloc(XXH64_FILE_BUFSZ)) == NULL ) {
+        fclose(fp);
+        return -1;
+    }
+    setvbuf(fp, NULL, _IONBF, 0);
+    xxh64_reset_(&state, seed);
+    while ( (n = fread(buf, 1, XXH64_FILE_BUFSZ, fp)) > 0 )
+        xxh64_update_(&state, buf, n);
+    // Preserve errno from the failed read, for the caller.
+    if ( ferror(fp) )
+        err = errno ? errno : EIO;
+    else
+        *digest = xxh64_digest_(&state);
+    free(buf);
+    fclose(fp);
+    if ( err ) {
+        errno = err;
+        return -1;
+    }
+    return 0;
+}
@@ -0,0 +1,37 @@
+/**
+    Header file for the _xxhash.c module.
+*/
+
+#ifndef _XXHASH_H
+#define _XXHASH_H
+
+#include <stddef.h>
+#include <stdint.h>
+
+/**
+    Size of the read buffer, in bytes, used by xxh64_file_().
+*/
+#define XXH64_FILE_BUFSZ (1 << 20)
+
+/**
+    Streaming XXH64 state.
+
+    The input is consumed in 32-byte stripes across four accumulator
+    lanes. Any trailing partial stripe is held in (mem) until the next
+    update, or until the digest is finalised.
+*/
+typedef struct {
+    uint64_t total_len;
+    uint64_t seed;
+    uint64_t v[4];
+    uint8_t mem[32];
+    uint32_t memsize;
+} xxh64_state;
+
+void xxh64_reset_(xxh64_state *state, uint64_t seed);
+void xxh64_update_(xxh64_state *state, const void *data, size_t len);
+uint64_t xxh64_digest_(const xxh64_state *state);
+uint64_t xxh64_(const void *data, size_t len, uint64_t seed);
+int xxh64_file_(const char *path, uint64_t seed, uint64_t *digest);
+
+#endif
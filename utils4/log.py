@@ -32,6 +32,16 @@
                         headertext=header)
         >> logger.write(text='Most cows can jump over the moon,Fact,94.2,pct')
 
+
+    For high logging rates, hold the log file open and buffer the writes,
+    using the :class:`~Log` class as a context manager::
+
+        >>> from utils4.log import Log
+
+        >>> with Log(filepath='/tmp/testlog.log', persistent=True) as logger:
+        >>>     logger.write(text='First line')
+        >>>     logger.write_many(lines=['Second line', 'Third line'])
+
 """
 
 import getpass
@@ -69,6 +79,14 @@ class Log:
         sep (str, optional): Separator to be used in the log file. This
             separator is used when writing the autofill values.
             Defaults to ','.
+        persistent (bool, optional): Hold the log file open between writes,
+            rather than opening and closing the file for each write. The
+            file is opened on the first write, and released by
+            :meth:`close`. Defaults to False.
+        buffersize (int, optional): In persistent mode, the size of the
+            write buffer, in bytes. Written lines are held in memory until
+            the buffer is full, or :meth:`flush` or :meth:`close` is
+            called. Use 1 for line buffering. Defaults to 64 KiB.
 
     :File Validation:
         On class instantiation, tests are performed to ensure the log
@@ -81,6 +99,17 @@ class Log:
             * If ``printheader`` is ``True``, yet the log file already
               exists, the header will not be written.
 
+    :Persistent Mode:
+        By default, each write opens the log file, appends the line and
+        closes the file, so each line is on disk as soon as the call
+        returns. This is safe, but slow at high logging rates, as the open
+        and close calls dominate.
+
+        In persistent mode (``persistent=True``), the file handle is held
+        open and writes are buffered, so many lines are written with a
+        single system call. The caller must call :meth:`close` (or use the
+        class as a context manager) to ensure all lines are written.
+
     :Example:
 
         To use the :class:`~Log` class in your project::
@@ -96,18 +125,66 @@ class Log:
 
     """
 
-    def __init__(self, filepath, *, autofill=True, printheader=False, headertext='', sep=','):
+    def __init__(self,
+                 filepath,
+                 *,
+                 autofill=True,
+                 printheader=False,
+                 headertext='',
+                 sep=',',
+                 persistent=False,
+                 buffersize=64*1024):
         """Log class initialiser."""
         self._filepath = filepath
         self._autofill = autofill
         self._printheader = printheader
         self._headertext = headertext
         self._sep = sep
+        self._persistent = persistent
+        self._buffersize = buffersize
         self._host = socket.gethostname()
         self._user = getpass.getuser()
         self._autotext = ''
+        self._f = None
         self._setup()
 
+    def __enter__(self):
+        """Context manager entry point."""
+        return self
+
+    def __exit__(self, *args):
+        """Context manager exit point; close the log file."""
+        self.close()
+
+    def close(self):
+        """Flush any buffered lines and close the log file.
+
+        In persistent mode, a subsequent write re-opens the log file.
+        Otherwise, this method has no effect.
+
+        """
+        if self._f is not None:
+            try:
+                self._f.close()
+            except Exception as err:  # pragma: nocover
+                print(err)
+            finally:
+                self._f = None
+
+    def flush(self):
+        """Write any buffered lines to the log file.
+
+        In persistent mode, lines are held in the write buffer until it is
+        full. This method writes the buffered lines, while keeping the
+        log file open. Otherwise, this method has no effect.
+
+        """
+        if self._f is not None:
+            try:
+                self._f.flush()
+            except Exception as err:  # pragma: nocover
+                print(err)
+
     def write(self, text: str):
         """Write text to the log file defined at instantiation.
 
@@ -135,15 +212,36 @@ class Log:
                 >>> logger.write(text='Just adding some random text to my log')
 
         """
-        try:
-            if text:
-                auto_text = f'{dt.now()}{self._sep}{self._autotext}' if self._autofill else ''
-                with open(self._filepath, 'a', encoding='utf-8') as f:
-                    f.write(auto_text)
-                    f.write(text)
-                    f.write('\n')
-        except Exception as err:  # pragma: nocover
-            print(err)
+        if text:
+            self._write(f'{self._prefix()}{text}\n')
+
+    def write_many(self, lines: list):
+        """Write many lines to the log file, with a single write.
+
+        Args:
+            lines (list): An iterable of delimited text strings to be
+                written to the log. Blank strings are skipped, as with
+                :meth:`write`.
+
+        :Design:
+            If ``autofill`` is ``True``, the datetime is taken *once*, and
+            is shared by all lines in the batch. The lines are joined and
+            written to the file with a single ``write`` call, and in the
+            default (non-persistent) mode, the file is opened only once.
+
+        :Example:
+            To write many lines to the log file::
+
+                >>> from utils4.log import Log
+
+                >>> logger = Log(filepath='/tmp/testlog.log', autofill=True)
+                >>> logger.write_many(lines=['First line', 'Second line'])
+
+        """
+        prefix = self._prefix()
+        text = ''.join(f'{prefix}{line}\n' for line in lines if line)
+        if text:
+            self._write(text)
 
     def write_blank_line(self):
         """Write a blank line to the log file.
@@ -162,11 +260,18 @@ class Log:
                 >>> logger.write_blank_line()
 
         """
-        try:
-            with open(self._filepath, 'a', encoding='utf-8') as f:
-                f.write('\n')
-        except Exception as err:  # pragma: nocover
-            print(err)
+        self._write('\n')
+
+    def _prefix(self) -> str:
+        """Build the autofill text written ahead of each line.
+
+        Returns:
+            str: The datetime, host and username values (with trailing
+            separator), if ``autofill`` is ``True``. Otherwise, an empty
+            string.
+
+        """
+        return f'{dt.now()}{self._sep}{self._autotext}' if self._autofill else ''
 
     def _setup(self):
         """Setup tasks performed on class instantiation.
@@ -202,3 +307,24 @@ class Log:
             with open(self._filepath, 'w', encoding='utf-8') as f:
                 f.write(self._headertext)
                 f.write('\n')
+
+    def _write(self, text: str):
+        """Write text to the log file, using the persistent handle if enabled.
+
+        Args:
+            text (str): Text to be written, including line endings.
+
+        """
+        try:
+            if self._persistent:
+                if self._f is None:
+                    self._f = open(self._filepath,  # pylint: disable=consider-using-with
+                                   'a',
+                                   buffering=self._buffersize,
+                                   encoding='utf-8')
+                self._f.write(text)
+            else:
+                with open(self._filepath, 'a', encoding='utf-8') as f:
+                    f.write(text)
+        except Exception as err:  # pragma: nocover
+            print(err)
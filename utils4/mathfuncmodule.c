@@ -3,6 +3,10 @@
 */
 
 #include <Python.h>
+#include <ctype.h>
+#include <math.h>
+#include <stdint.h>
+#include <string.h>
 #include "libs/_mathfunc.h"
 
 // Python docstrings.
@@ -28,8 +32,42 @@ const char _DOC_ESIEVE[] =
   "    If deindex is False, a boolean list of prime/composite flags, where\n"
   "    1 indicates a prime number, and 0 indicates a composite number."
 };
+const char _DOC_ESIEVE_RANGE[] =
+{ "Segmented, bit-packed Sieve of Eratosthenes over the range [lo, hi).\n\n"
+  "Only odd numbers are stored, as bits, and the range is sieved in\n"
+  "cache-sized segments. Therefore, memory use is bound by the number\n"
+  "of primes found, rather than the size of the range. The GIL is\n"
+  "released while each segment is sieved.\n\n"
+  "To process very large ranges in constant memory, call this function\n"
+  "for consecutive blocks. For example:\n\n"
+  "    for lo in range(0, 10**11, 10**8):\n"
+  "        primes = esieve_range(lo, lo + 10**8)\n\n"
+  "Args:\n"
+  "    lo (int): Start of the range, inclusive.\n"
+  "    hi (int): End of the range, exclusive. Must not exceed 2**63.\n\n"
+  "Raises:\n"
+  "    ValueError: If (hi) exceeds 2**63.\n\n"
+  "Returns:\n"
+  "    numpy.ndarray: A uint64 array of the primes in [lo, hi). The\n"
+  "    array is a zero-copy view over the buffer populated by the sieve."
+};
+const char _DOC_FACTORISE[] =
+{ "Factorise (n) into its distinct prime factors and their exponents.\n\n"
+  "Small factors are removed by trial division, and any remaining\n"
+  "cofactor is split using Pollard's rho (Brent) algorithm, with\n"
+  "Miller-Rabin primality testing. This runs in near-constant time for\n"
+  "all 64-bit integers.\n\n"
+  "Args:\n"
+  "    n (int): Number to be factorised.\n\n"
+  "Returns:\n"
+  "    list: A list of (prime, exponent) tuples, in ascending order of\n"
+  "    prime. For example, factorise(360) returns:\n"
+  "    [(2, 3), (3, 2), (5, 1)]"
+};
 const char _DOC_FIB[] = 
 { "Generate the Fibonacci sequence to index (N), inclusive.\n\n"
+  "Values beyond 64 bits are calculated using Python integers, so the\n"
+  "sequence is exact for any index.\n\n"
   "Args:\n"
   "    n (int): Ending Fibonacci index, inclusive.\n\n"
   "Returns:\n"
@@ -43,6 +81,30 @@ const char _DOC_FIB_INDEX[] =
   "    int: The floor of the calculation, resulting in the index closest\n"
   "    related to the given number."
 };
+const char _DOC_FIB_ITER[] =
+{ "Return a lazy iterator over the Fibonacci sequence.\n\n"
+  "The iterator starts at F(0) and is unbounded. Values beyond 64 bits\n"
+  "are calculated using Python integers.\n\n"
+  "Example:\n"
+  "    >>> from itertools import islice\n"
+  "    >>> list(islice(mathfunc.fib_iter(), 10))\n"
+  "    [0, 1, 1, 2, 3, 5, 8, 13, 21, 34]\n\n"
+  "Returns:\n"
+  "    FibIter: An iterator yielding F(0), F(1), F(2), ..."
+};
+const char _DOC_FIB_NTH[] =
+{ "Calculate the (n)th Fibonacci number, F(n).\n\n"
+  "The fast-doubling method is used, requiring O(log n) multiplications,\n"
+  "rather than generating the sequence:\n\n"
+  "    F(2k)   = F(k) * (2F(k+1) - F(k))\n"
+  "    F(2k+1) = F(k+1)^2 + F(k)^2\n\n"
+  "Args:\n"
+  "    n (int): Fibonacci index, where F(0) = 0 and F(1) = 1.\n\n"
+  "Raises:\n"
+  "    ValueError: If (n) is negative.\n\n"
+  "Returns:\n"
+  "    int: The Fibonacci number at index (n)."
+};
 const char _DOC_GCD[] = 
 { "Calculate the greatest common divisor of integers A and B.\n\n"
   "Args:\n"
@@ -94,8 +156,9 @@ const char _DOC_IS_PENTAGONAL[] =
 };
 const char _DOC_IS_PERFECT[] = 
 { "Test if a number is perfect.\n\n"
+  "The test is carried out as sigma(n) == 2n.\n\n"
   "Note: The only perfect numbers less than 1000000 are:\n"
-  "  8, 28, 496 and 8128.\n\n"
+  "  6, 28, 496 and 8128.\n\n"
   "Args:\n"
   "    n (int): Number to be tested.\n\n"
   "Returns:\n"
@@ -111,6 +174,8 @@ const char _DOC_IS_PERMUTATION[] =
 };
 const char _DOC_IS_PRIME[] = 
 { "Test if a number is prime.\n\n"
+  "A deterministic Miller-Rabin test is used, which is valid for all\n"
+  "64-bit unsigned integers.\n\n"
   "Args:\n"
   "    n (int): Number to be tested.\n\n"
   "Returns:\n"
@@ -131,6 +196,13 @@ const char _DOC_LCM[] =
   "Returns:\n"
   "    int: The LCM of integers A and B."
 };
+const char _DOC_NUM_DIVISORS[] =
+{ "Calculate the number of positive divisors of (n).\n\n"
+  "Args:\n"
+  "    n (int): Integer for which the divisors are counted.\n\n"
+  "Returns:\n"
+  "    int: The number of divisors of (n), including 1 and (n)."
+};
 const char _DOC_PHI[] = 
 { "Calculate the result of the phi (or Euler's totient) function.\n\n"
   "The phi function gives the count of positive integers less than N,\n"
@@ -169,6 +241,15 @@ const char _DOC_ROTATE[] =
   "Returns:\n"
   "    int: The number (n), rotated 1 position to the right."
  };
+const char _DOC_SIGMA[] =
+{ "Calculate the sum of the positive divisors of (n).\n\n"
+  "Args:\n"
+  "    n (int): Integer for which the divisors are summed.\n\n"
+  "Raises:\n"
+  "    OverflowError: If the sum exceeds 64 bits.\n\n"
+  "Returns:\n"
+  "    int: The sum of the divisors of (n), including 1 and (n)."
+};
 const char _DOC_SIZES[] = 
 { "Display platform-specific data type sizes and ranges.\n\n"
   "Returns:\n"
@@ -177,10 +258,144 @@ const char _DOC_SIZES[] =
 const char _DOC_VERSION[] =
 { "Display the embedded mathfunc version.\n" };
 
+// Vectorised function docstrings.
+#define _DOC_VEC_NOTE \
+  "The array is processed in a single C loop, with the GIL released,\n" \
+  "rather than one Python call per element. The numpy library is\n" \
+  "required for the returned array.\n\n"
+#define _DOC_VEC_ARGS1 \
+  "Args:\n" \
+  "    a (buffer): A one-dimensional, C-contiguous integer array\n" \
+  "        supporting the buffer protocol, such as a numpy.ndarray or\n" \
+  "        array.array. Values must be within the int64 range; an\n" \
+  "        OverflowError is raised for larger unsigned values.\n\n"
+#define _DOC_VEC_ARGS2 \
+  "Args:\n" \
+  "    a (buffer): A one-dimensional, C-contiguous integer array\n" \
+  "        supporting the buffer protocol, such as a numpy.ndarray or\n" \
+  "        array.array. Values must be within the int64 range; an\n" \
+  "        OverflowError is raised for larger unsigned values.\n" \
+  "    b (buffer): An array of the same form and length as (a).\n\n" \
+  "Raises:\n" \
+  "    ValueError: If the arrays are not the same length.\n\n"
+const char _DOC_DIGITS_VEC[] =
+{ "Return the number of digits in each integer of an array.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of the number of digits in each value."
+};
+const char _DOC_FIB_INDEX_VEC[] =
+{ "Calculate the Fibonacci index (floor) for each value of an array.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of the Fibonacci index for each value."
+};
+const char _DOC_GCD_VEC[] =
+{ "Calculate the greatest common divisor of each pair of integers.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS2
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of the GCD of each pair."
+};
+const char _DOC_INTCONCAT_VEC[] =
+{ "Concatenate each pair of integers.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS2
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of each pair concatenated as AB."
+};
+const char _DOC_INT_NBITS_VEC[] =
+{ "Return the number of bits occupied by each value of an array.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of the number of bits for each value."
+};
+const char _DOC_IS_PALINDROME_NUM_VEC[] =
+{ "Test if each number in an array is palindromatic.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: A bool array, True where the value is palindromatic."
+};
+const char _DOC_IS_PANDIGITAL_VEC[] =
+{ "Test if each number in an array is a *zeroless* pandigital number.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: A bool array, True where the value is pandigital."
+};
+const char _DOC_IS_PENTAGONAL_VEC[] =
+{ "Test if each number in an array is pentagonal.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: A bool array, True where the value is pentagonal."
+};
+const char _DOC_IS_PERFECT_VEC[] =
+{ "Test if each number in an array is perfect.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: A bool array, True where the value is perfect."
+};
+const char _DOC_IS_PERMUTATION_VEC[] =
+{ "Test if each pair of integers are permutations of each other.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS2
+  "Returns:\n"
+  "    numpy.ndarray: A bool array, True where the pair are permutations."
+};
+const char _DOC_IS_PRIME_VEC[] =
+{ "Test if each number in an array is prime.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: A bool array, True where the value is prime."
+};
+const char _DOC_IS_TRIANGULAR_VEC[] =
+{ "Test if each number in an array is triangular.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: A bool array, True where the value is triangular."
+};
+const char _DOC_LCM_VEC[] =
+{ "Calculate the least common multiple of each pair of integers.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS2
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of the LCM of each pair."
+};
+const char _DOC_PHI_VEC[] =
+{ "Calculate the phi (Euler's totient) function for each value of an array.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of the phi result for each value."
+};
+const char _DOC_REVERSE_VEC[] =
+{ "Reverse each integer value of an array.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of each value, reversed."
+};
+const char _DOC_ROTATE_VEC[] =
+{ "Rotate each integer value of an array, where the last digit becomes\n"
+  "the first.\n\n"
+  _DOC_VEC_NOTE
+  _DOC_VEC_ARGS1
+  "Returns:\n"
+  "    numpy.ndarray: An int64 array of each value, rotated one position."
+};
+
 // Method definitions.
 static PyObject *mathfunc_digits(PyObject *self, PyObject *args) {
-    long i;
-    if ( !PyArg_ParseTuple(args, "l", &i) )
+    long long i;
+    if ( !PyArg_ParseTuple(args, "L", &i) )
         return NULL;
     return Py_BuildValue("i", digits(i));
 }
@@ -216,22 +431,270 @@ static PyObject *mathfunc_esieve(PyObject *self, PyObject *args) {
     return list;
 }
 
+// 32 KiB segment of odd-only bits; covers 524288 integers.
+#define _SEG_WORDS 4096
+
+static PyObject *mathfunc_esieve_range(PyObject *self, PyObject *args) {
+    unsigned long long lo, hi;
+    uint64_t limit, base, seg_hi;
+    uint64_t *bits;
+    uint32_t *bp;
+    size_t cnt, nbp, n = 0;
+    PyObject *buf, *np, *arr = NULL;
+    if ( !PyArg_ParseTuple(args, "KK", &lo, &hi) )
+        return NULL;
+    if ( hi > (1ULL << 63) ) {
+        PyErr_SetString(PyExc_ValueError, "The upper bound must not exceed 2**63.");
+        return NULL;
+    }
+    if ( (np = PyImport_ImportModule("numpy")) == NULL )
+        return NULL;
+    if ( (buf = PyByteArray_FromStringAndSize(NULL, 0)) == NULL )
+        goto done;
+    if ( lo <= 2 && 2 < hi ) {
+        if ( PyByteArray_Resize(buf, sizeof(uint64_t)) )
+            goto done;
+        ((uint64_t *)PyByteArray_AsString(buf))[n++] = 2;
+    }
+    if ( lo < hi ) {
+        // Base primes are required up to floor(sqrt(hi - 1)).
+        limit = (uint64_t)sqrtl((long double)hi);
+        while ( limit && limit * limit > hi - 1 ) --limit;
+        while ( (limit + 1) * (limit + 1) <= hi - 1 ) ++limit;
+        bits = (uint64_t *)malloc(_SEG_WORDS * sizeof(uint64_t));
+        Py_BEGIN_ALLOW_THREADS
+        bp = esieve_base((uint32_t)limit, &nbp);
+        Py_END_ALLOW_THREADS
+        if ( bits == NULL || bp == NULL ) {
+            free(bits);
+            free(bp);
+            PyErr_NoMemory();
+            goto done;
+        }
+        for ( uint64_t seg = lo; seg < hi; seg = seg_hi ) {
+            base = seg & ~1ULL;
+            seg_hi = base + _SEG_WORDS * 128ULL < hi ? base + _SEG_WORDS * 128ULL : hi;
+            Py_BEGIN_ALLOW_THREADS
+            cnt = esieve_segment(seg, seg_hi, bp, nbp, bits, _SEG_WORDS);
+            Py_END_ALLOW_THREADS
+            if ( !cnt )
+                continue;
+            if ( PyByteArray_Resize(buf, (n + cnt) * sizeof(uint64_t)) ) {
+                free(bits);
+                free(bp);
+                goto done;
+            }
+            uint64_t *out = (uint64_t *)PyByteArray_AsString(buf) + n;
+            Py_BEGIN_ALLOW_THREADS
+            n += esieve_extract(seg, bits, _SEG_WORDS, out);
+            Py_END_ALLOW_THREADS
+        }
+        free(bits);
+        free(bp);
+    }
+    arr = PyObject_CallMethod(np, "frombuffer", "Os", buf, "uint64");
+done:
+    Py_XDECREF(buf);
+    Py_DECREF(np);
+    return arr;
+}
+
+static PyObject *mathfunc_factorise(PyObject *self, PyObject *args) {
+    unsigned long long n;
+    unsigned long long p[FACTORS_MAX];
+    int e[FACTORS_MAX];
+    int k;
+    if ( !PyArg_ParseTuple(args, "K", &n) )
+        return NULL;
+    k = factorise(n, p, e);
+    PyObject *list = PyList_New(k);
+    for ( int i = 0; list && i < k; ++i ) {
+        PyObject *item = Py_BuildValue("(Ki)", p[i], e[i]);
+        if ( item == NULL ) {
+            Py_CLEAR(list);
+            break;
+        }
+        PyList_SetItem(list, i, item);  // Steals the reference.
+    }
+    return list;
+}
+
+// Largest Fibonacci index whose value fits into 64 bits.
+#define _FIB_MAX64 93
+
 static PyObject *mathfunc_fib(PyObject *self, PyObject *args) {
     int n;
+    unsigned long long a = 0, b = 1, t;
+    PyObject *item;
     if ( !PyArg_ParseTuple(args, "i", &n) ) {
         return NULL;
     }
-    unsigned long long *ptr_f = fib(n);
-    PyObject *list = PyList_New(0);
-    // Convert Fibonacci sequence array into a Python list.
-    // Uses indexing rather than pointer truthiness as the first value is 0.
-    for ( int i = 0; i <= n; ++i )
-        PyList_Append(list, PyLong_FromDouble(ptr_f[i]));
-    // Deallocate memory allocated by fib function.
-    free(ptr_f);
+    PyObject *list = PyList_New(n >= 0 ? n + 1 : 0);
+    // Native 64-bit integers are used while the values fit, after which
+    // the sequence continues using Python integers.
+    for ( int i = 0; list && i <= n; ++i ) {
+        if ( i <= _FIB_MAX64 ) {
+            item = PyLong_FromUnsignedLongLong(a);
+            t = a + b;
+            a = b;
+            b = t;
+        } else {
+            item = PyNumber_Add(PyList_GetItem(list, i - 1), PyList_GetItem(list, i - 2));
+        }
+        if ( item == NULL ) {
+            Py_CLEAR(list);
+            break;
+        }
+        PyList_SetItem(list, i, item);  // Steals the reference.
+    }
     return list;
 }
 
+/* -----------------------------------------------------------------
+  Lazy Fibonacci iterator type.
+  --------------------------------------------------------------- */
+
+typedef struct {
+    PyObject_HEAD
+    PyObject *a;  // F(i)
+    PyObject *b;  // F(i+1)
+} FibIterObject;
+
+static PyObject *FibIterType = NULL;
+
+static void fibiter_dealloc(PyObject *self) {
+    PyTypeObject *tp = Py_TYPE(self);
+    Py_XDECREF(((FibIterObject *)self)->a);
+    Py_XDECREF(((FibIterObject *)self)->b);
+    ((freefunc)PyType_GetSlot(tp, Py_tp_free))(self);
+    Py_DECREF(tp);
+}
+
+static PyObject *fibiter_next(PyObject *self) {
+    FibIterObject *it = (FibIterObject *)self;
+    PyObject *rtn = it->a;
+    PyObject *next = PyNumber_Add(it->a, it->b);
+    if ( next == NULL )
+        return NULL;
+    // Ownership of (a) passes to the caller.
+    it->a = it->b;
+    it->b = next;
+    return rtn;
+}
+
+static PyType_Slot fibiter_slots[] = {
+    {Py_tp_dealloc, fibiter_dealloc},
+    {Py_tp_iter, PyObject_SelfIter},
+    {Py_tp_iternext, fibiter_next},
+    {Py_tp_doc, (void *)"Lazy iterator over the Fibonacci sequence."},
+    {0, NULL}
+};
+
+// Instances are only created by fib_iter(), which initialises the state.
+static PyType_Spec fibiter_spec = {
+    "utils4.mathfunc.FibIter",
+    sizeof(FibIterObject),
+    0,
+    Py_TPFLAGS_DEFAULT | Py_TPFLAGS_DISALLOW_INSTANTIATION,
+    fibiter_slots
+};
+
+static PyObject *mathfunc_fib_iter(PyObject *self, PyObject *args) {
+    FibIterObject *it = PyObject_New(FibIterObject, (PyTypeObject *)FibIterType);
+    if ( it == NULL )
+        return NULL;
+    it->a = PyLong_FromLong(0);
+    it->b = PyLong_FromLong(1);
+    if ( it->a == NULL || it->b == NULL ) {
+        Py_DECREF(it);
+        return NULL;
+    }
+    return (PyObject *)it;
+}
+
+/**
+    Fast-doubling step, using Python integers.
+
+    Given a = F(k) and b = F(k+1), calculate:
+
+        F(2k)   = F(k) * (2F(k+1) - F(k))
+        F(2k+1) = F(k+1)^2 + F(k)^2
+
+    If (odd) is true, (a, b) are set to F(2k+1), F(2k+2), otherwise
+    F(2k), F(2k+1). The references held by (a) and (b) are replaced.
+
+    @return 0 on success, otherwise -1 with an exception set.
+*/
+static int _fib_double(PyObject **a, PyObject **b, int odd) {
+    PyObject *t = NULL, *u = NULL, *c = NULL, *aa = NULL, *bb = NULL, *d = NULL;
+    int rtn = -1;
+    if ( (t = PyNumber_Add(*b, *b)) == NULL
+         || (u = PyNumber_Subtract(t, *a)) == NULL
+         || (c = PyNumber_Multiply(*a, u)) == NULL
+         || (aa = PyNumber_Multiply(*a, *a)) == NULL
+         || (bb = PyNumber_Multiply(*b, *b)) == NULL
+         || (d = PyNumber_Add(aa, bb)) == NULL )
+        goto done;
+    Py_DECREF(*a);
+    Py_DECREF(*b);
+    if ( odd ) {
+        *a = d;
+        *b = PyNumber_Add(c, d);
+    } else {
+        *a = c;
+        *b = d;
+        c = NULL;
+    }
+    d = NULL;
+    rtn = ( *b == NULL ) ? -1 : 0;
+done:
+    Py_XDECREF(t);
+    Py_XDECREF(u);
+    Py_XDECREF(c);
+    Py_XDECREF(aa);
+    Py_XDECREF(bb);
+    Py_XDECREF(d);
+    return rtn;
+}
+
+static PyObject *mathfunc_fib_nth(PyObject *self, PyObject *args) {
+    long long n;
+    int bit;
+    PyObject *a, *b;
+    if ( !PyArg_ParseTuple(args, "L", &n) )
+        return NULL;
+    if ( n < 0 ) {
+        PyErr_SetString(PyExc_ValueError, "The index must be non-negative.");
+        return NULL;
+    }
+    if ( n <= _FIB_MAX64 ) {
+        // Native fast-path; F(93) is the largest value to fit 64 bits.
+        unsigned long long x = 0, y = 1, t;
+        while ( n-- ) {
+            t = x + y;
+            x = y;
+            y = t;
+        }
+        return PyLong_FromUnsignedLongLong(x);
+    }
+    a = PyLong_FromLong(0);
+    b = PyLong_FromLong(1);
+    if ( a == NULL || b == NULL ) {
+        Py_XDECREF(a);
+        Py_XDECREF(b);
+        return NULL;
+    }
+    for ( bit = 62; !(n >> bit); --bit );
+    for ( ; bit >= 0; --bit ) {
+        if ( _fib_double(&a, &b, (n >> bit) & 1) ) {
+            Py_CLEAR(a);
+            break;
+        }
+    }
+    Py_XDECREF(b);
+    return a;
+}
+
 static PyObject *mathfunc_fib_index(PyObject *self, PyObject *args) {
     unsigned long long i;
     if ( !PyArg_ParseTuple(args, "K", &i) )
@@ -240,10 +703,10 @@ static PyObject *mathfunc_fib_index(PyObject *self, PyObject *args) {
 }
 
 static PyObject *mathfunc_gcd(PyObject *self, PyObject *args) {
-    long a, b;
-    if ( !PyArg_ParseTuple(args, "ll", &a, &b) )
+    long long a, b;
+    if ( !PyArg_ParseTuple(args, "LL", &a, &b) )
         return NULL;
-    return Py_BuildValue("l", gcd(a, b));
+    return Py_BuildValue("L", gcd(a, b));
 }
 
 static PyObject *mathfunc_intconcat(PyObject *self, PyObject *args) {
@@ -261,29 +724,29 @@ static PyObject *mathfunc_int_nbits(PyObject *self, PyObject *args) {
 }
 
 static PyObject *mathfunc_is_palindrome_num(PyObject *self, PyObject *args) {
-    long i;
-    if ( !PyArg_ParseTuple(args, "l", &i) )
+    long long i;
+    if ( !PyArg_ParseTuple(args, "L", &i) )
         return NULL;
     return Py_BuildValue("i", is_palindrome_num(i));
 }
 
 static PyObject *mathfunc_is_pandigital(PyObject *self, PyObject *args) {
-    long i;
-    if ( !PyArg_ParseTuple(args, "l", &i) )
+    long long i;
+    if ( !PyArg_ParseTuple(args, "L", &i) )
         return NULL;
     return Py_BuildValue("i", is_pandigital(i));
 }
 
 static PyObject *mathfunc_is_pentagonal(PyObject *self, PyObject *args) {
-    long i;
-    if ( !PyArg_ParseTuple(args, "l", &i) )
+    long long i;
+    if ( !PyArg_ParseTuple(args, "L", &i) )
         return NULL;
     return Py_BuildValue("i", is_pentagonal(i));
 }
 
 static PyObject *mathfunc_is_perfect(PyObject *self, PyObject *args) {
-    int i;
-    if ( !PyArg_ParseTuple(args, "i", &i) )
+    unsigned long long i;
+    if ( !PyArg_ParseTuple(args, "K", &i) )
         return NULL;
     return Py_BuildValue("i", is_perfect(i));
 }
@@ -296,64 +759,90 @@ static PyObject *mathfunc_is_permutation(PyObject *self, PyObject *args) {
 }
 
 static PyObject *mathfunc_is_prime(PyObject *self, PyObject *args) {
-    unsigned long i;
-    if ( !PyArg_ParseTuple(args, "k", &i) )
+    unsigned long long i;
+    if ( !PyArg_ParseTuple(args, "K", &i) )
         return NULL;
     return Py_BuildValue("i", is_prime(i));
 }
 
 static PyObject *mathfunc_is_triangular(PyObject *self, PyObject *args) {
-    long i;
-    if ( !PyArg_ParseTuple(args, "l", &i) )
+    long long i;
+    if ( !PyArg_ParseTuple(args, "L", &i) )
         return NULL;
     return Py_BuildValue("i", is_triangular(i));
 }
 
 static PyObject *mathfunc_lcm(PyObject *self, PyObject *args) {
-    long a, b;
-    if ( !PyArg_ParseTuple(args, "ll", &a, &b) )
+    long long a, b;
+    if ( !PyArg_ParseTuple(args, "LL", &a, &b) )
+        return NULL;
+    return Py_BuildValue("L", lcm(a, b));
+}
+static PyObject *mathfunc_num_divisors(PyObject *self, PyObject *args) {
+    unsigned long long n;
+    if ( !PyArg_ParseTuple(args, "K", &n) )
         return NULL;
-    return Py_BuildValue("l", lcm(a, b));
+    return Py_BuildValue("K", num_divisors(n));
 }
 static PyObject *mathfunc_phi(PyObject *self, PyObject *args) {
-    unsigned long n;
-    if ( !PyArg_ParseTuple(args, "k", &n) )
+    unsigned long long n;
+    if ( !PyArg_ParseTuple(args, "K", &n) )
         return NULL;
-    return Py_BuildValue("k", phi(n));
+    return Py_BuildValue("K", phi(n));
 }
 static PyObject *mathfunc_phi_const(PyObject *self, PyObject *args) {
     return Py_BuildValue("d", PHI());
 }
 static PyObject *mathfunc_primefactors(PyObject *self, PyObject *args) {
-    unsigned long n;
-    if ( !PyArg_ParseTuple(args, "k", &n) ) {
+    unsigned long long n;
+    unsigned long long p[FACTORS_MAX];
+    int e[FACTORS_MAX];
+    int k;
+    if ( !PyArg_ParseTuple(args, "K", &n) ) {
         return NULL;
     }
-    unsigned long *ptr_f = primefactors(n);
+    k = factorise(n, p, e);
     PyObject *list = PyList_New(0);
-    // Convert primes from array pointer into a Python list.
-    for ( int i = 0; ptr_f[i] ; ++i ) {
-        PyList_Append(list, PyLong_FromDouble(ptr_f[i]));
+    // Expand the (prime, exponent) pairs into a Python list.
+    for ( int i = 0; list && i < k; ++i ) {
+        for ( int j = 0; j < e[i]; ++j ) {
+            PyObject *item = PyLong_FromUnsignedLongLong(p[i]);
+            if ( item == NULL || PyList_Append(list, item) ) {
+                Py_XDECREF(item);
+                Py_CLEAR(list);
+                break;
+            }
+            Py_DECREF(item);
+        }
     }
-    // Deallocate memory allocated by primefactors function.
-    free(ptr_f);
     return list;
 }
 
 static PyObject *mathfunc_reverse(PyObject *self, PyObject *args) {
-    long i;
-    if ( !PyArg_ParseTuple(args, "l", &i) )
+    long long i;
+    if ( !PyArg_ParseTuple(args, "L", &i) )
         return NULL;
     return Py_BuildValue("L", reverse(i));
 }
 
 static PyObject *mathfunc_rotate(PyObject *self, PyObject *args) {
-    long i;
-    if ( !PyArg_ParseTuple(args, "l", &i) )
+    long long i;
+    if ( !PyArg_ParseTuple(args, "L", &i) )
         return NULL;
     return Py_BuildValue("L", rotate(i));
 }
 
+static PyObject *mathfunc_sigma(PyObject *self, PyObject *args) {
+    unsigned long long n, s;
+    if ( !PyArg_ParseTuple(args, "K", &n) )
+        return NULL;
+    if ( !(s = sigma(n)) && n ) {
+        PyErr_SetString(PyExc_OverflowError, "The sum of divisors exceeds 64 bits.");
+        return NULL;
+    }
+    return Py_BuildValue("K", s);
+}
+
 static PyObject *mathfunc_sizes(PyObject *self, PyObject *args) {
     if ( sizes() )
         return NULL;
@@ -366,27 +855,292 @@ static PyObject *mathfunc_version(PyObject *self, PyObject *args) {
     return Py_BuildValue("s", version);
 }
 
+/* -----------------------------------------------------------------
+  Vectorised (array-in/array-out) methods.
+
+  Input arrays are accessed through the buffer protocol, so any
+  C-contiguous integer buffer (numpy.ndarray, array.array, etc.) is
+  accepted without copying. The output array is allocated by numpy
+  and populated in place, with the GIL released for the loop.
+  --------------------------------------------------------------- */
+
+typedef long long (*vfunc1)(long long);
+typedef long long (*vfunc2)(long long, long long);
+
+/**
+    Validate an integer buffer and return its signedness.
+
+    @param view  Buffer to be tested.
+    @return      0 if signed, 1 if unsigned, -1 on error (exception set).
+*/
+static int _vec_sign(Py_buffer *view) {
+    const char *fmt = view->format ? view->format : "B";
+    // Skip the native byte-order / alignment prefixes.
+    while ( *fmt == '@' || *fmt == '=' || *fmt == '<' ) ++fmt;
+    if ( view->ndim > 1 || fmt[0] == '\0' || fmt[1] != '\0'
+         || !strchr("bhilqnBHILQN?", fmt[0])
+         || !(view->itemsize == 1 || view->itemsize == 2
+              || view->itemsize == 4 || view->itemsize == 8) ) {
+        PyErr_Format(PyExc_TypeError,
+                     "Expected a one-dimensional integer array, got format '%s'.",
+                     view->format ? view->format : "B");
+        return -1;
+    }
+    return !islower((unsigned char)fmt[0]);
+}
+
+/**
+    Verify each element of an unsigned 64-bit buffer fits in a long long.
+
+    @param view  Buffer to be tested.
+    @param usgn  Signedness of the buffer, as returned by _vec_sign.
+    @return      0 on success, -1 on error (OverflowError set).
+*/
+static int _vec_range(const Py_buffer *view, int usgn) {
+    if ( !usgn || view->itemsize != 8 )
+        return 0;
+    const uint64_t *p = (const uint64_t *)view->buf;
+    Py_ssize_t n = view->len / view->itemsize;
+    for ( Py_ssize_t i = 0; i < n; ++i ) {
+        if ( p[i] > (uint64_t)INT64_MAX ) {
+            PyErr_Format(PyExc_OverflowError,
+                         "Value at index %zd exceeds the maximum signed 64-bit integer.", i);
+            return -1;
+        }
+    }
+    return 0;
+}
+
+/**
+    Return the (i)th element of an integer buffer as a long long.
+
+    Unsigned 64-bit elements must first be validated using _vec_range.
+*/
+static long long _vec_get(const Py_buffer *view, int usgn, Py_ssize_t i) {
+    const char *p = (const char *)view->buf + i * view->itemsize;
+    switch ( view->itemsize ) {
+        case 1: return usgn ? (long long)*(const uint8_t *)p : (long long)*(const int8_t *)p;
+        case 2: return usgn ? (long long)*(const uint16_t *)p : (long long)*(const int16_t *)p;
+        case 4: return usgn ? (long long)*(const uint32_t *)p : (long long)*(const int32_t *)p;
+        default: return *(const int64_t *)p;
+    }
+}
+
+/**
+    Allocate a numpy array of (n) elements and expose its buffer.
+
+    @param n      Number of elements.
+    @param dtype  Numpy dtype name; either "bool" or "int64".
+    @param oview  Buffer to be populated with the array's writable view.
+    @return       A new reference to the array, or NULL on error.
+*/
+static PyObject *_vec_alloc(Py_ssize_t n, const char *dtype, Py_buffer *oview) {
+    PyObject *np, *arr;
+    if ( (np = PyImport_ImportModule("numpy")) == NULL )
+        return NULL;
+    arr = PyObject_CallMethod(np, "empty", "ns", n, dtype);
+    Py_DECREF(np);
+    if ( arr == NULL )
+        return NULL;
+    if ( PyObject_GetBuffer(arr, oview, PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS) ) {
+        Py_DECREF(arr);
+        return NULL;
+    }
+    return arr;
+}
+
+/**
+    Apply a unary function to each element of an integer buffer.
+*/
+static PyObject *_vec_unary(PyObject *args, vfunc1 fn, const char *dtype) {
+    int usgn;
+    bool isbool = !strcmp(dtype, "bool");
+    PyObject *obj, *arr;
+    Py_buffer view, oview;
+    if ( !PyArg_ParseTuple(args, "O", &obj) )
+        return NULL;
+    if ( PyObject_GetBuffer(obj, &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) )
+        return NULL;
+    if ( (usgn = _vec_sign(&view)) < 0 || _vec_range(&view, usgn) < 0 ) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    Py_ssize_t n = view.len / view.itemsize;
+    if ( (arr = _vec_alloc(n, dtype, &oview)) == NULL ) {
+        PyBuffer_Release(&view);
+        return NULL;
+    }
+    Py_BEGIN_ALLOW_THREADS
+    if ( isbool ) {
+        unsigned char *out = (unsigned char *)oview.buf;
+        for ( Py_ssize_t i = 0; i < n; ++i )
+            out[i] = fn(_vec_get(&view, usgn, i)) != 0;
+    } else {
+        int64_t *out = (int64_t *)oview.buf;
+        for ( Py_ssize_t i = 0; i < n; ++i )
+            out[i] = fn(_vec_get(&view, usgn, i));
+    }
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&oview);
+    PyBuffer_Release(&view);
+    return arr;
+}
+
+/**
+    Apply a binary function to each element pair of two integer buffers.
+*/
+static PyObject *_vec_binary(PyObject *args, vfunc2 fn, const char *dtype) {
+    int usgn_a, usgn_b;
+    bool isbool = !strcmp(dtype, "bool");
+    PyObject *obj_a, *obj_b, *arr;
+    Py_buffer va, vb, oview;
+    if ( !PyArg_ParseTuple(args, "OO", &obj_a, &obj_b) )
+        return NULL;
+    if ( PyObject_GetBuffer(obj_a, &va, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) )
+        return NULL;
+    if ( PyObject_GetBuffer(obj_b, &vb, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) ) {
+        PyBuffer_Release(&va);
+        return NULL;
+    }
+    arr = NULL;
+    if ( (usgn_a = _vec_sign(&va)) < 0 || (usgn_b = _vec_sign(&vb)) < 0
+         || _vec_range(&va, usgn_a) < 0 || _vec_range(&vb, usgn_b) < 0 )
+        goto done;
+    Py_ssize_t n = va.len / va.itemsize;
+    if ( n != vb.len / vb.itemsize ) {
+        PyErr_SetString(PyExc_ValueError, "The arrays must be the same length.");
+        goto done;
+    }
+    if ( (arr = _vec_alloc(n, dtype, &oview)) == NULL )
+        goto done;
+    Py_BEGIN_ALLOW_THREADS
+    if ( isbool ) {
+        unsigned char *out = (unsigned char *)oview.buf;
+        for ( Py_ssize_t i = 0; i < n; ++i )
+            out[i] = fn(_vec_get(&va, usgn_a, i), _vec_get(&vb, usgn_b, i)) != 0;
+    } else {
+        int64_t *out = (int64_t *)oview.buf;
+        for ( Py_ssize_t i = 0; i < n; ++i )
+            out[i] = fn(_vec_get(&va, usgn_a, i), _vec_get(&vb, usgn_b, i));
+    }
+    Py_END_ALLOW_THREADS
+    PyBuffer_Release(&oview);
+done:
+    PyBuffer_Release(&vb);
+    PyBuffer_Release(&va);
+    return arr;
+}
+
+// Element-wise adaptors onto the _mathfunc.c signatures.
+static long long _v_digits(long long n) { return digits(n); }
+static long long _v_fib_index(long long n) { return fib_index(n); }
+static long long _v_gcd(long long a, long long b) { return gcd(a, b); }
+static long long _v_intconcat(long long a, long long b) { return intconcat(a, b); }
+static long long _v_int_nbits(long long n) { return int_nbits(n); }
+static long long _v_is_palindrome_num(long long n) { return is_palindrome_num(n); }
+static long long _v_is_pandigital(long long n) { return is_pandigital(n); }
+static long long _v_is_pentagonal(long long n) { return is_pentagonal(n); }
+static long long _v_is_perfect(long long n) { return ( n > 0 ) && is_perfect(n); }
+static long long _v_is_permutation(long long a, long long b) { return is_permutation(a, b); }
+static long long _v_is_prime(long long n) { return ( n > 1 ) && is_prime(n); }
+static long long _v_is_triangular(long long n) { return is_triangular(n); }
+static long long _v_lcm(long long a, long long b) { return ( a == 0 && b == 0 ) ? 0 : lcm(a, b); }
+static long long _v_phi(long long n) { return ( n > 0 ) ? (long long)phi(n) : 0; }
+static long long _v_reverse(long long n) { return reverse(n); }
+static long long _v_rotate(long long n) { return rotate(n); }
+
+static PyObject *mathfunc_digits_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_digits, "int64");
+}
+static PyObject *mathfunc_fib_index_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_fib_index, "int64");
+}
+static PyObject *mathfunc_gcd_vec(PyObject *self, PyObject *args) {
+    return _vec_binary(args, _v_gcd, "int64");
+}
+static PyObject *mathfunc_intconcat_vec(PyObject *self, PyObject *args) {
+    return _vec_binary(args, _v_intconcat, "int64");
+}
+static PyObject *mathfunc_int_nbits_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_int_nbits, "int64");
+}
+static PyObject *mathfunc_is_palindrome_num_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_is_palindrome_num, "bool");
+}
+static PyObject *mathfunc_is_pandigital_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_is_pandigital, "bool");
+}
+static PyObject *mathfunc_is_pentagonal_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_is_pentagonal, "bool");
+}
+static PyObject *mathfunc_is_perfect_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_is_perfect, "bool");
+}
+static PyObject *mathfunc_is_permutation_vec(PyObject *self, PyObject *args) {
+    return _vec_binary(args, _v_is_permutation, "bool");
+}
+static PyObject *mathfunc_is_prime_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_is_prime, "bool");
+}
+static PyObject *mathfunc_is_triangular_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_is_triangular, "bool");
+}
+static PyObject *mathfunc_lcm_vec(PyObject *self, PyObject *args) {
+    return _vec_binary(args, _v_lcm, "int64");
+}
+static PyObject *mathfunc_phi_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_phi, "int64");
+}
+static PyObject *mathfunc_reverse_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_reverse, "int64");
+}
+static PyObject *mathfunc_rotate_vec(PyObject *self, PyObject *args) {
+    return _vec_unary(args, _v_rotate, "int64");
+}
+
 static PyMethodDef mathfunc_methods[] = {
     {"PHI", mathfunc_phi_const, METH_NOARGS, _DOC_PHI_CONST},
     {"digits", mathfunc_digits, METH_VARARGS, _DOC_DIGITS},
+    {"digits_vec", mathfunc_digits_vec, METH_VARARGS, _DOC_DIGITS_VEC},
     {"esieve", mathfunc_esieve, METH_VARARGS, _DOC_ESIEVE},
+    {"esieve_range", mathfunc_esieve_range, METH_VARARGS, _DOC_ESIEVE_RANGE},
+    {"factorise", mathfunc_factorise, METH_VARARGS, _DOC_FACTORISE},
     {"fib", mathfunc_fib, METH_VARARGS, _DOC_FIB},
     {"fib_index", mathfunc_fib_index, METH_VARARGS, _DOC_FIB_INDEX},
+    {"fib_index_vec", mathfunc_fib_index_vec, METH_VARARGS, _DOC_FIB_INDEX_VEC},
+    {"fib_iter", mathfunc_fib_iter, METH_NOARGS, _DOC_FIB_ITER},
+    {"fib_nth", mathfunc_fib_nth, METH_VARARGS, _DOC_FIB_NTH},
     {"gcd", mathfunc_gcd, METH_VARARGS, _DOC_GCD},
+    {"gcd_vec", mathfunc_gcd_vec, METH_VARARGS, _DOC_GCD_VEC},
     {"intconcat", mathfunc_intconcat, METH_VARARGS, _DOC_INTCONCAT},
+    {"intconcat_vec", mathfunc_intconcat_vec, METH_VARARGS, _DOC_INTCONCAT_VEC},
     {"int_nbits", mathfunc_int_nbits, METH_VARARGS, _DOC_INT_NBITS},
+    {"int_nbits_vec", mathfunc_int_nbits_vec, METH_VARARGS, _DOC_INT_NBITS_VEC},
     {"is_palindrome_num", mathfunc_is_palindrome_num, METH_VARARGS, _DOC_IS_PALINDROME_NUM},
+    {"is_palindrome_num_vec", mathfunc_is_palindrome_num_vec, METH_VARARGS, _DOC_IS_PALINDROME_NUM_VEC},
     {"is_pandigital", mathfunc_is_pandigital, METH_VARARGS, _DOC_IS_PANDIGITAL},
+    {"is_pandigital_vec", mathfunc_is_pandigital_vec, METH_VARARGS, _DOC_IS_PANDIGITAL_VEC},
     {"is_pentagonal", mathfunc_is_pentagonal, METH_VARARGS, _DOC_IS_PENTAGONAL},
+    {"is_pentagonal_vec", mathfunc_is_pentagonal_vec, METH_VARARGS, _DOC_IS_PENTAGONAL_VEC},
     {"is_perfect", mathfunc_is_perfect, METH_VARARGS, _DOC_IS_PERFECT},
+    {"is_perfect_vec", mathfunc_is_perfect_vec, METH_VARARGS, _DOC_IS_PERFECT_VEC},
     {"is_permutation", mathfunc_is_permutation, METH_VARARGS, _DOC_IS_PERMUTATION},
+    {"is_permutation_vec", mathfunc_is_permutation_vec, METH_VARARGS, _DOC_IS_PERMUTATION_VEC},
     {"is_prime", mathfunc_is_prime, METH_VARARGS, _DOC_IS_PRIME},
+    {"is_prime_vec", mathfunc_is_prime_vec, METH_VARARGS, _DOC_IS_PRIME_VEC},
     {"is_triangular", mathfunc_is_triangular, METH_VARARGS, _DOC_IS_TRIANGULAR},
+    {"is_triangular_vec", mathfunc_is_triangular_vec, METH_VARARGS, _DOC_IS_TRIANGULAR_VEC},
     {"lcm", mathfunc_lcm, METH_VARARGS, _DOC_LCM},
+    {"lcm_vec", mathfunc_lcm_vec, METH_VARARGS, _DOC_LCM_VEC},
+    {"num_divisors", mathfunc_num_divisors, METH_VARARGS, _DOC_NUM_DIVISORS},
     {"phi", mathfunc_phi, METH_VARARGS, _DOC_PHI},
+    {"phi_vec", mathfunc_phi_vec, METH_VARARGS, _DOC_PHI_VEC},
     {"primefactors", mathfunc_primefactors, METH_VARARGS, _DOC_PRIMEFACTORS},
     {"reverse", mathfunc_reverse, METH_VARARGS, _DOC_REVERSE},
+    {"reverse_vec", mathfunc_reverse_vec, METH_VARARGS, _DOC_REVERSE_VEC},
     {"rotate", mathfunc_rotate, METH_VARARGS, _DOC_ROTATE},
+    {"rotate_vec", mathfunc_rotate_vec, METH_VARARGS, _DOC_ROTATE_VEC},
+    {"sigma", mathfunc_sigma, METH_VARARGS, _DOC_SIGMA},
     {"sizes", mathfunc_sizes, METH_NOARGS, _DOC_SIZES},
     {"version", mathfunc_version, METH_NOARGS, _DOC_VERSION},
     {NULL, NULL, 0, NULL}
@@ -401,6 +1155,18 @@ static struct PyModuleDef mathfunc_module = {
 };
 
 PyMODINIT_FUNC PyInit_mathfunc(void) {
-    return PyModule_Create(&mathfunc_module);
+    PyObject *m;
+    if ( FibIterType == NULL
+         && (FibIterType = PyType_FromSpec(&fibiter_spec)) == NULL )
+        return NULL;
+    if ( (m = PyModule_Create(&mathfunc_module)) == NULL )
+        return NULL;
+    Py_INCREF(FibIterType);
+    if ( PyModule_AddObject(m, "FibIter", FibIterType) ) {
+        Py_DECREF(FibIterType);
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
 }
 
@@ -56,6 +56,45 @@
         True
 
 
+    Generate a reference file using a faster algorithm. The algorithm is
+    stored in the reference file, and is used automatically by
+    :meth:`~SourceCheck.check`::
+
+        >>> from utils4.srccheck import srccheck
+
+        >>> files = ['list.c', 'of.py', 'files.sql']
+        >>> srccheck.generate(filepaths=files, algorithm='xxh64')
+
+
+    Verify checksums in parallel, stopping at the first difference, and
+    inspect the result rather than printing::
+
+        >>> from utils4.srccheck import srccheck
+
+        >>> result = srccheck.check_stream(ref_file='path/to/srccheck.ref',
+                                           fail_fast=True)
+        >>> bool(result)
+        False
+
+        >>> result
+        CheckResult(passed=False, complete=False, matched=41,
+                    changed=['/path/to/of.py'], missing=[], extra=[])
+
+
+    Generate a compact, authenticated **binary** reference file, and verify
+    only a subset of the files, without decoding the whole reference file::
+
+        >>> from utils4.srccheck import srccheck
+
+        >>> srccheck.generate(filepaths=files, binary=True)
+
+        >>> srccheck.check_stream(ref_file='path/to/srccheck.ref',
+                                  key_file='path/to/srccheck.key',
+                                  only=['of.py'])
+        CheckResult(passed=True, complete=True, matched=1,
+                    changed=[], missing=[], extra=[])
+
+
     **Advanced usage:**
 
     If you wish to *delay the output* of mismatched files (to give the caller
@@ -84,23 +123,89 @@
         - 15-ex05_col_output.c
         - 02-03_multi_lines.c
 
+
+    **Directory trees:**
+
+    Generate a tree manifest for a deployment directory::
+
+        >>> from utils4.srccheck import srccheck
+
+        >>> srccheck.generate_tree(root='/path/to/deployment')
+
+
+    Incrementally verify the deployment against the tree manifest::
+
+        >>> from utils4.srccheck import srccheck
+
+        >>> srccheck.check_tree(ref_file='path/to/srccheck.tree')
+        True
+
 """
 # pylint: disable=wrong-import-order
 
+import hashlib
 import json
 import os
 import pickle
 import sys
 import uuid
 from cryptography import fernet
-from typing import List
+from typing import Iterable, List, Union
+from utils4.binmanifest import BinaryManifest
 from utils4.crypto import crypto
 
+_TREE_FORMAT = 'srccheck-tree'
+_TREE_VERSION = 1
+
+
+class CheckResult:
+    """Result of a :meth:`SourceCheck.check_stream` verification.
+
+    The object evaluates as ``True`` only if no files are changed, missing
+    or extra.
+
+    Attributes:
+        changed (list): Full paths to files whose checksum does not match
+            the reference file.
+        complete (bool): False if verification stopped at the first
+            difference (``fail_fast=True``), in which case the lists may
+            not be exhaustive.
+        extra (list): Full paths to files which were provided to the check,
+            but are not in the reference file.
+        matched (int): Number of files whose checksum matched.
+        missing (list): Full paths to files listed in the reference file
+            which do not exist.
+
+    """
+
+    def __init__(self):
+        """Check result class initialiser."""
+        self.changed = []
+        self.complete = True
+        self.extra = []
+        self.matched = 0
+        self.missing = []
+
+    def __bool__(self) -> bool:
+        """Return True if all files passed verification."""
+        return self.passed
+
+    def __repr__(self) -> str:
+        """Return a summary of the result."""
+        return (f'CheckResult(passed={self.passed}, complete={self.complete}, '
+                f'matched={self.matched}, changed={self.changed}, '
+                f'missing={self.missing}, extra={self.extra})')
+
+    @property
+    def passed(self) -> bool:
+        """True if no files are changed, missing or extra."""
+        return not any((self.changed, self.missing, self.extra))
+
 
 class SourceCheck:
     """Verify source code checksums values are as expected."""
 
-    def check(self, ref_file: str, key_file: str='') -> bool:
+    def check(self, ref_file: str, key_file: str='', verify: bool=False) -> bool:
         """Verify the provided source code file checksums are as expected.
 
         If any checksum do not match, the names of those files are reported
@@ -114,6 +219,9 @@ class SourceCheck:
                 is not provided, the method assumes the reference file is in
                 plaintext CSV and does not attempt to decrypt.
                 Defaults to ''.
+            verify (bool, optional): If the checksum cache is enabled (via
+                :meth:`~utils4.crypto.Crypto.enable_cache`), bypass the cache
+                and re-hash every file. Defaults to False.
 
         Note:
             If the ``key_file`` argument is *not* provided, it is assumed the
@@ -123,6 +231,9 @@ class SourceCheck:
             If the ``key_file`` argument *is* provided, it is assumed the
             ``ref_file`` has been encrypted, and decryption is carried out.
 
+            This method is a wrapper around :meth:`check_stream`, which
+            returns a structured result rather than printing.
+
         Raises:
             FileNotFoundError: If either the reference file, or key file do
                 not exist.
@@ -132,33 +243,201 @@ class SourceCheck:
             listed in the reference file; otherwise False.
 
         """
-        # pylint: disable=no-else-return
+        result = self.check_stream(ref_file=ref_file, key_file=key_file, verify=verify)
+        if not result:
+            self._report_mismatches(result=result)
+        return result.passed
+
+    def check_stream(self,
+                     ref_file: str,
+                     key_file: str='',
+                     *,
+                     files: Iterable[str]=None,
+                     only: Iterable[str]=None,
+                     fail_fast: bool=False,
+                     workers: int=None,
+                     verify: bool=False) -> CheckResult:
+        """Verify file checksums in parallel, comparing each as it completes.
+
+        Args:
+            ref_file (str): Full path to the reference file.
+            key_file (str, optional): Full path to the key file, if the
+                reference file is encrypted. Defaults to ''.
+            files (Iterable[str], optional): Full paths to the files which
+                are *present*, for example, all files in a deployment. Any of
+                these which are not in the reference file are reported as
+                extra. Defaults to None, which skips the test for extra
+                files.
+            only (Iterable[str], optional): Verify only these files, rather
+                than every file in the reference file. Any of these which
+                are not in the reference file are reported as extra. For a
+                binary reference file, only the blocks holding these files
+                are read and authenticated. Defaults to None.
+            fail_fast (bool, optional): Stop at the first changed, missing
+                or extra file. Defaults to False.
+            workers (int, optional): Number of hashing threads. Defaults to
+                None, which uses the number of CPUs.
+            verify (bool, optional): If the checksum cache is enabled, bypass
+                the cache and re-hash every file. Defaults to False.
+
+        :Design:
+            The files are hashed by
+            :meth:`~utils4.crypto.Crypto.checksum_many`, and each checksum is
+            compared with the reference as soon as it is yielded. If
+            ``fail_fast`` is True, the hashing pool is shut down at the
+            first difference, and any queued files are not hashed.
+
+            Files which do not exist are reported as missing, rather than
+            raising an error.
+
+        Raises:
+            FileNotFoundError: If either the reference file, or key file do
+                not exist.
+            ValueError: If a binary reference file is provided without a
+                key file, or fails authentication.
+
+        Returns:
+            CheckResult: An object listing the changed, missing and extra
+            files, which evaluates as ``True`` only if all files passed.
+
+        """
+        ref = self._load_reference(ref_file=ref_file, key_file=key_file)
+        binary = isinstance(ref, BinaryManifest)
+        algorithm = self._get_algorithm(reference=ref)
+        prefix = '' if binary or algorithm == 'md5' else f'{algorithm}:'
+        result = CheckResult()
+        extra = {f for f in files if f not in ref} if files is not None else set()
+
+        def _present():
+            if fail_fast and extra:
+                return
+            for p in ref if only is None else dict.fromkeys(only):
+                if only is not None and p not in ref:
+                    extra.add(p)
+                elif os.path.isfile(p):
+                    yield p
+                else:
+                    result.missing.append(p)
+                if fail_fast and (result.missing or extra):
+                    return
+
+        chksums = crypto.checksum_many(paths=_present(),
+                                       algorithm=algorithm,
+                                       workers=workers,
+                                       verify=verify)
+        try:
+            for path, digest in chksums:
+                expected = ref[path]
+                # Binary references store fixed-width digests.
+                actual = digest.zfill(len(expected)) if binary else f'{prefix}{digest}'
+                if actual == expected:
+                    result.matched += 1
+                else:
+                    result.changed.append(path)
+                if fail_fast and (result.changed or result.missing or extra):
+                    result.complete = False
+                    break
+        finally:
+            chksums.close()
+            if binary:
+                ref.close()
+        result.extra = sorted(extra)
+        if fail_fast and (result.missing or result.extra):
+            result.complete = False
+        result.changed.sort()
+        return result
+
+    def check_tree(self, ref_file: str, root: str=None, verify: bool=False) -> bool:
+        """Incrementally verify a directory tree against a tree manifest.
+
+        If any files are changed, missing or extra, these are reported to
+        the terminal, grouped by directory.
+
+        Args:
+            ref_file (str): Full path to the tree manifest, as created by
+                :meth:`generate_tree`.
+            root (str, optional): Root of the directory tree to be verified.
+                Defaults to None, which uses the root stored in the
+                manifest. This is useful if the tree has been relocated.
+            verify (bool, optional): Ignore the stored file metadata and
+                re-hash every file. Defaults to False.
+
+        :Design:
+            The current tree is walked, and each directory's *stat rollup*
+            is calculated from its files' size and modification time, and
+            its subdirectories' rollups. If a directory's rollup matches
+            the manifest, the entire subtree is unchanged and is not
+            descended into. Otherwise, only the files in that directory
+            whose size or modification time differ from the manifest are
+            re-hashed (in parallel).
+
+            The Merkle roots of the affected directories are then
+            recalculated from the (new and stored) file digests. The tree
+            passes if the recalculated root matches the manifest's root.
+            Therefore, a file which has been touched, but not modified,
+            does not fail the check.
+
+            The cost of a check is one ``stat`` per file, plus hashing
+            proportional to the number of changed files, rather than the
+            size of the tree.
+
+        Raises:
+            FileNotFoundError: If the manifest or the root directory do not
+                exist.
+            ValueError: If the manifest is not a srccheck tree manifest.
+
+        Returns:
+            bool: True if the tree matches the manifest, otherwise False.
+
+        """
+        # pylint: disable=too-many-locals
         if not os.path.exists(ref_file):
             raise FileNotFoundError(f'Reference file not found: {ref_file}')
-        if all([key_file, not os.path.exists(key_file)]):
-            raise FileNotFoundError(f'Key file not found: {key_file}')
-        if key_file:
-            # Decrypt reference file.
-            with open(ref_file, 'rb') as rfp:
-                data = pickle.load(rfp)
-            with open(key_file, 'rb') as kfp:
-                f = fernet.Fernet(kfp.read())
-            ref = json.loads(f.decrypt(data).decode())
-        else:
-            # Read plaintext reference file.
-            ref = {}
-            with open(ref_file, 'r', encoding='utf-8') as rfp:
-                for line in rfp:
-                    ref.update([line.strip().split(',')])
-        chksums = self._checksum(files=ref.keys())
-        # Object check for quick validation.
-        if chksums == ref:
+        with open(ref_file, 'r', encoding='utf-8') as f:
+            mfst = json.load(f)
+        if mfst.get('format') != _TREE_FORMAT:
+            raise ValueError(f'Not a srccheck tree manifest: {ref_file}')
+        root = root or mfst['root']
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f'Root directory not found: {root}')
+        ref_dirs, ref_files = mfst['dirs'], mfst['files']
+        tree = self._scan_tree(root=root)
+        meta = self._rollup_meta(tree=tree)
+        # Descend from the root, only into subtrees whose stat rollup differs.
+        dirty, stack = [], ['']
+        while stack:
+            d = stack.pop()
+            if not verify and d in ref_dirs and ref_dirs[d][0] == meta[d]:
+                continue
+            dirty.append(d)
+            stack.extend(self._join(d, s) for s in tree[d]['dirs'])
+        # Collect the digests for the files in dirty directories.
+        digests, tohash = {}, {}
+        for d in dirty:
+            for name, (size, mtime) in tree[d]['files'].items():
+                rel = self._join(d, name)
+                ref = ref_files.get(rel)
+                if not verify and ref and ref[:2] == [size, mtime]:
+                    digests[rel] = ref[2]
+                else:
+                    tohash[os.path.join(root, *rel.split('/'))] = rel
+        for path, digest in crypto.checksum_many(paths=tohash,
+                                                 algorithm=mfst['algorithm'],
+                                                 verify=verify):
+            digests[tohash[path]] = digest
+        # Recalculate the Merkle roots bottom-up; clean subtrees use the stored root.
+        merkle = {d: v[1] for d, v in ref_dirs.items() if d not in dirty}
+        self._rollup_merkle(tree=tree, digests=digests, merkle=merkle, dirs=dirty)
+        if merkle.get('') == ref_dirs[''][1]:
             return True
-        else:
-            self._report_mismatches(checksums=chksums, reference=ref)
-            return False
-
-    def generate(self, filepaths: List[str], encrypt: bool=False):
+        self._report_tree(tree=tree, dirty=dirty, digests=digests, ref=mfst)
+        return False
+
+    def generate(self,
+                 filepaths: List[str],
+                 encrypt: bool=False,
+                 algorithm: str='md5',
+                 binary: bool=False):
         """Generate the reference file containing the source file checksums,
         and the associated key file.
 
@@ -167,6 +446,23 @@ class SourceCheck:
                 included in the reference file.
             encrypt (bool, optional): Encrypt the reference file and generate
                 a key file. Defaults to False.
+            algorithm (str, optional): Algorithm used to checksum each file.
+                Any of the algorithms accepted by
+                :meth:`~utils4.crypto.Crypto.checksum_multi`. For example,
+                ``'blake2b'`` for a fast cryptographic hash, or ``'xxh64'``
+                for a (much faster) integrity-only check. Defaults to 'md5'.
+            binary (bool, optional): Write a compact, authenticated binary
+                reference file, and the associated key file. If True, the
+                ``encrypt`` argument is ignored. Defaults to False.
+
+        :Algorithm:
+
+            The algorithm is stored in the reference file, so
+            :meth:`check` always uses the algorithm with which the reference
+            file was generated. For any algorithm other than MD5, each
+            checksum value is prefixed with the algorithm name, as
+            ``algorithm:checksum``. MD5 checksums are not prefixed, so
+            reference files created by earlier versions remain valid.
 
         :Reference File:
 
@@ -183,6 +479,12 @@ class SourceCheck:
                 ...
                 filepath_NN,md5_hash_string_NN
 
+            Or, for example, if the ``'xxh64'`` algorithm is used::
+
+                filepath_01,xxh64:xxh64_hash_string_01
+                ...
+                filepath_NN,xxh64:xxh64_hash_string_NN
+
             **If encrypted:**
 
             The reference file contains is a serialised, encrypted
@@ -199,6 +501,17 @@ class SourceCheck:
             .. note:: These files are a **pair**. If one file is lost, the
                       other file is useless.
 
+            **If binary:**
+
+            The reference file is a
+            :class:`~utils4.binmanifest.BinaryManifest`, holding the sorted
+            file paths and raw digest bytes, with an offset index. This is
+            smaller and much faster to load than the other formats, and
+            supports verifying a subset of files without decoding the
+            whole file. The manifest is authenticated (but not encrypted)
+            using the key stored in the ``srccheck.key`` file. Therefore,
+            these files are also a pair.
+
         :Layout:
 
             **If encrypted:**
@@ -223,8 +536,18 @@ class SourceCheck:
         if not self._all_files_exist(files=filepaths):
             raise FileNotFoundError('The files listed above were not found.')
         op_ref, op_key = self._build_outpaths()
-        chksums = self._checksum(files=filepaths)
-        if encrypt:
+        # Always re-hash when generating a reference file.
+        chksums = self._checksum(files=filepaths, algorithm=algorithm, verify=True)
+        if binary:
+            key = fernet.Fernet.generate_key()
+            with open(op_key, 'wb') as kfp:
+                kfp.write(key)
+            BinaryManifest.write(path=op_ref,
+                                 entries={k: v.rpartition(':')[2] for k, v in chksums.items()},
+                                 algorithm=algorithm,
+                                 key=key)
+            print('\nComplete.\nThe reference and key files are available on your desktop.')
+        elif encrypt:
             key = crypto.b64(uuid.uuid4().hex, decode=False)
             with open(op_key, 'wb') as kfp:
                 kfp.write(key)
@@ -238,6 +561,79 @@ class SourceCheck:
                     rfp.write(f'{k},{v}\n')
             print('\nComplete.\nThe reference file is available on your desktop.')
 
+    def generate_tree(self, root: str, out_path: str=None, algorithm: str='md5') -> str:
+        """Generate a tree manifest for all files under a directory.
+
+        Args:
+            root (str): Root of the directory tree to be recorded.
+            out_path (str, optional): Full path to the manifest file.
+                Defaults to None, which writes ``srccheck.tree`` to the
+                user's desktop.
+            algorithm (str, optional): Algorithm used to checksum each file.
+                The algorithm is stored in the manifest, and used by
+                :meth:`check_tree`. Refer to :meth:`generate` for the
+                options. Defaults to 'md5'.
+
+        :Layout:
+
+            The manifest is a JSON file containing the checksum algorithm,
+            the absolute path to the root, and the following:
+
+            - ``files``: For each file (relative to the root, using ``/`` as
+              the separator): ``[size, mtime_ns, digest]``.
+            - ``dirs``: For each directory (the root being ``''``):
+              ``[stat_rollup, merkle_root]``.
+
+            For example::
+
+                {"format": "srccheck-tree", "version": 1,
+                 "algorithm": "md5", "root": "/path/to/root",
+                 "dirs": {"": ["1f0e...", "c4d2..."],
+                          "pkg": ["77a1...", "0b9e..."]},
+                 "files": {"setup.py": [1024, 1700000000000000000, "9ec0..."],
+                           "pkg/mod.py": [2048, 1700000000000000000, "e49a..."]}}
+
+        :Design:
+            A directory's *stat rollup* is a BLAKE2b hash of the names,
+            sizes and modification times of its files, and the rollups of
+            its subdirectories. A directory's *Merkle root* is a BLAKE2b
+            hash of the names and digests of its files, and the Merkle
+            roots of its subdirectories. Therefore, a change anywhere in a
+            subtree changes the rollups of every directory above it.
+
+        Raises:
+            FileNotFoundError: If the root directory does not exist.
+
+        Returns:
+            str: Full path to the manifest file.
+
+        """
+        if not os.path.isdir(root):
+            raise FileNotFoundError(f'Root directory not found: {root}')
+        root = os.path.realpath(root)
+        out_path = out_path or os.path.join(os.path.dirname(self._build_outpaths()[0]),
+                                            'srccheck.tree')
+        tree = self._scan_tree(root=root)
+        paths = {os.path.join(root, *self._join(d, n).split('/')): self._join(d, n)
+                 for d, v in tree.items() for n in v['files']}
+        digests = {paths[p]: dig for p, dig in crypto.checksum_many(paths=paths,
+                                                                    algorithm=algorithm,
+                                                                    verify=True)}
+        meta = self._rollup_meta(tree=tree)
+        merkle = {}
+        self._rollup_merkle(tree=tree, digests=digests, merkle=merkle, dirs=list(tree))
+        mfst = {'format': _TREE_FORMAT,
+                'version': _TREE_VERSION,
+                'algorithm': algorithm,
+                'root': root,
+                'dirs': {d: [meta[d], merkle[d]] for d in sorted(tree)},
+                'files': {self._join(d, n): [*v['files'][n], digests[self._join(d, n)]]
+                          for d, v in sorted(tree.items()) for n in sorted(v['files'])}}
+        with open(out_path, 'w', encoding='utf-8') as f:
+            json.dump(mfst, f, separators=(',', ':'))
+        print(f'\nComplete.\nThe tree manifest has been written to: {out_path}')
+        return out_path
+
     @staticmethod
     def _all_files_exist(files: list) -> bool:
         """Verify all provided files exist.
@@ -287,12 +683,16 @@ class SourceCheck:
         return os.path.join(desk, fn_ref), os.path.join(desk, fn_key)
 
     @staticmethod
-    def _checksum(files: list) -> dict:
+    def _checksum(files: list, algorithm: str='md5', verify: bool=False) -> dict:
         """Calculate checksum for all passed files.
 
         Args:
             files (list): List of full paths against which a checksum is to be
                 calculated.
+            algorithm (str, optional): Algorithm to be used.
+                Defaults to 'md5'.
+            verify (bool, optional): Bypass the checksum cache, if enabled.
+                Defaults to False.
 
         Returns:
             dict: A dictionary containing the filename and checksum for all
@@ -304,27 +704,224 @@ class SourceCheck:
                  ...,
                  'fname_NN': 'checksum_hash_NN'}
 
+        :Design:
+            The checksums are calculated in parallel using
+            :meth:`~utils4.crypto.Crypto.checksum_many`, which uses the
+            checksum cache if enabled. The returned dictionary is ordered
+            per the ``files`` argument.
+
+            For any algorithm other than MD5, each checksum value is
+            prefixed with ``algorithm:``, as stored in the reference file.
+
+        """
+        chksums = dict(crypto.checksum_many(paths=files, algorithm=algorithm, verify=verify))
+        prefix = '' if algorithm == 'md5' else f'{algorithm}:'
+        return {f: f'{prefix}{chksums[f]}' for f in files}
+
+    @staticmethod
+    def _get_algorithm(reference: Union[dict, BinaryManifest]) -> str:
+        """Determine the checksum algorithm used by a reference file.
+
+        Args:
+            reference (Union[dict, BinaryManifest]): The deserialised
+                reference file, as ``{filepath: checksum}``, or a binary
+                reference file.
+
+        Returns:
+            str: The algorithm stored in a binary reference file, or named
+            by the ``algorithm:`` prefix on the checksum values. If the
+            values are not prefixed, ``'md5'`` is returned.
+
         """
-        return {f: crypto.checksum_md5(path=f) for f in files}
+        if isinstance(reference, BinaryManifest):
+            return reference.algorithm
+        algorithm, sep, _ = next(iter(reference.values()), '').partition(':')
+        return algorithm if sep else 'md5'
 
     @staticmethod
-    def _report_mismatches(checksums: dict, reference: dict):
-        """Report the files for which the checksums do not match.
+    def _join(dirname: str, name: str) -> str:
+        """Join a relative directory and a name, using ``/``.
 
         Args:
-            checksums (dict): A dictionary containing the recently calculated
-                checksums.
-            reference (dict): A dictionary containing the *expected* checksums.
+            dirname (str): Relative directory, where the root is ``''``.
+            name (str): Name of the file or subdirectory.
+
+        Returns:
+            str: The relative path to the file or subdirectory.
+
+        """
+        return f'{dirname}/{name}' if dirname else name
+
+    @staticmethod
+    def _load_reference(ref_file: str, key_file: str='') -> Union[dict, BinaryManifest]:
+        """Load a reference file, decrypting if a key file is provided.
+
+        Args:
+            ref_file (str): Full path to the reference file.
+            key_file (str, optional): Full path to the key file.
+                Defaults to ''.
+
+        Raises:
+            FileNotFoundError: If either the reference file, or key file do
+                not exist.
+            ValueError: If a binary reference file is provided without a
+                key file, or fails authentication.
+
+        Returns:
+            Union[dict, BinaryManifest]: The reference file's contents, as
+            ``{filepath: checksum}``. Or, an open binary reference file,
+            which must be closed by the caller.
+
+        """
+        if not os.path.exists(ref_file):
+            raise FileNotFoundError(f'Reference file not found: {ref_file}')
+        if all([key_file, not os.path.exists(key_file)]):
+            raise FileNotFoundError(f'Key file not found: {key_file}')
+        if BinaryManifest.is_manifest(ref_file):
+            if not key_file:
+                raise ValueError('A key file is required for a binary reference file.')
+            with open(key_file, 'rb') as kfp:
+                return BinaryManifest(path=ref_file, key=kfp.read())
+        if key_file:
+            # Decrypt reference file.
+            with open(ref_file, 'rb') as rfp:
+                data = pickle.load(rfp)
+            with open(key_file, 'rb') as kfp:
+                f = fernet.Fernet(kfp.read())
+            return json.loads(f.decrypt(data).decode())
+        # Read plaintext reference file.
+        ref = {}
+        with open(ref_file, 'r', encoding='utf-8') as rfp:
+            for line in rfp:
+                # Split on the last comma, as paths may contain commas.
+                ref.update([line.strip().rsplit(',', 1)])
+        return ref
+
+    @staticmethod
+    def _report_mismatches(result: CheckResult):
+        """Report the files which failed verification.
+
+        Args:
+            result (CheckResult): The result of the verification.
 
         """
         # pylint: disable=consider-using-f-string
-        m = []
-        for k, v in reference.items():
-            if checksums.get(k) != v:
-                m.append(os.path.basename(k))
+        m = sorted(result.changed + result.missing)
         print('\nChecksum verification has failed for the following:')
-        print(*map('- {}'.format, m), sep='\n')
+        print(*map('- {}'.format, map(os.path.basename, m)), sep='\n')
         print('')
 
+    def _report_tree(self, tree: dict, dirty: list, digests: dict, ref: dict):
+        """Report the changed, missing and extra files, by directory.
+
+        Only the dirty directories are inspected, as all other subtrees
+        have been verified as unchanged.
+
+        Args:
+            tree (dict): The current tree, as returned by :meth:`_scan_tree`.
+            dirty (list): Relative paths to the dirty directories.
+            digests (dict): The current digests for all files in the dirty
+                directories.
+            ref (dict): The tree manifest.
+
+        """
+        # pylint: disable=consider-using-f-string
+        byparent = {}
+        for rel in ref['files']:
+            byparent.setdefault(rel.rpartition('/')[0], set()).add(rel)
+        report = {}
+        for d in sorted(dirty):
+            # Files under a subdirectory which no longer exists are missing.
+            gone = [s for s in ref['dirs'] if s.rpartition('/')[0] == d and s not in tree]
+            missing = {r for g in gone for r in ref['files'] if r.startswith(f'{g}/')}
+            current = {self._join(d, n) for n in tree[d]['files']}
+            missing |= byparent.get(d, set()) - current
+            lines = ['  - missing: {}'.format(m) for m in sorted(missing)]
+            for rel in sorted(current):
+                if rel not in ref['files']:
+                    lines.append('  - extra: {}'.format(rel))
+                elif ref['files'][rel][2] != digests[rel]:
+                    lines.append('  - changed: {}'.format(rel))
+            if lines:
+                report[d or '.'] = lines
+        print('\nChecksum verification has failed for the following:')
+        for d, lines in report.items():
+            print(f'- {d}/', *lines, sep='\n')
+        print('')
+
+    def _rollup_merkle(self, tree: dict, digests: dict, merkle: dict, dirs: list):
+        """Calculate the Merkle root for each of the given directories.
+
+        Args:
+            tree (dict): The tree, as returned by :meth:`_scan_tree`.
+            digests (dict): The digest for each file in ``dirs``, keyed on
+                the relative path.
+            merkle (dict): The Merkle roots of all other (unchanged)
+                directories. This dictionary is updated in place.
+            dirs (list): Relative paths to the directories to be calculated.
+
+        """
+        for d in sorted(dirs, key=lambda x: -x.count('/') if x else 1):
+            h = hashlib.blake2b(digest_size=32)
+            for n in sorted(tree[d]['files']):
+                h.update(f'f\0{n}\0{digests[self._join(d, n)]}\0'.encode())
+            for n in sorted(tree[d]['dirs']):
+                h.update(f'd\0{n}\0{merkle[self._join(d, n)]}\0'.encode())
+            merkle[d] = h.hexdigest()
+
+    def _rollup_meta(self, tree: dict) -> dict:
+        """Calculate the stat rollup for every directory in the tree.
+
+        Args:
+            tree (dict): The tree, as returned by :meth:`_scan_tree`.
+
+        Returns:
+            dict: The stat rollup for each directory, keyed on the relative
+            path.
+
+        """
+        meta = {}
+        for d in sorted(tree, key=lambda x: -x.count('/') if x else 1):
+            h = hashlib.blake2b(digest_size=16)
+            for n, (size, mtime) in sorted(tree[d]['files'].items()):
+                h.update(f'f\0{n}\0{size}\0{mtime}\0'.encode())
+            for n in sorted(tree[d]['dirs']):
+                h.update(f'd\0{n}\0{meta[self._join(d, n)]}\0'.encode())
+            meta[d] = h.hexdigest()
+        return meta
+
+    def _scan_tree(self, root: str) -> dict:
+        """Walk a directory tree, collecting the metadata for each file.
+
+        Args:
+            root (str): Root of the directory tree.
+
+        Note:
+            Symbolic links to directories are not followed.
+
+        Returns:
+            dict: A dictionary keyed on each directory's relative path (the
+            root being ``''``), as::
+
+                {'pkg': {'files': {'mod.py': [size, mtime_ns]},
+                         'dirs': ['subpkg']}}
+
+        """
+        tree = {}
+        stack = ['']
+        while stack:
+            d = stack.pop()
+            files, dirs = {}, []
+            with os.scandir(os.path.join(root, *d.split('/'))) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        dirs.append(e.name)
+                    elif e.is_file():
+                        st = e.stat()
+                        files[e.name] = [st.st_size, st.st_mtime_ns]
+            tree[d] = {'files': files, 'dirs': dirs}
+            stack.extend(self._join(d, n) for n in dirs)
+        return tree
+
 
 srccheck = SourceCheck()
@@ -46,9 +46,11 @@ import re
 import site
 import string
 import subprocess
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Generator, Union
 # locals
+from utils4 import filesys
 from utils4.reporterror import reporterror
 from utils4.user_interface import ui
 try:
@@ -505,8 +507,12 @@ def getsitepackages() -> str:
         pkgs = site.getsitepackages()[0]
     return pkgs
 
-def gzip_compress(in_path: str, out_path: str=None, size: int=None) -> str:
-    """Compress a file using ``gzip``.
+def gzip_compress(in_path: str,
+                  out_path: str=None,
+                  size: int=None,
+                  level: int=9,
+                  workers: int=None) -> str:
+    """Compress a file using ``gzip``, in parallel.
 
     Args:
         in_path (str): Full path to the file to be compressed. If the file
@@ -517,6 +523,11 @@ def gzip_compress(in_path: str, out_path: str=None, size: int=None) -> str:
             parameter.
         size (int, optional): Size of the chunk to be read / written during
             compression. Defaults to 10MiB.
+        level (int, optional): Compression level, from 0 (none) to 9
+            (best). Defaults to 9.
+        workers (int, optional): Number of threads used to compress the
+            chunks. Defaults to None, which uses the number of CPUs.
+            Passing 1 compresses the file serially.
 
     :Example:
 
@@ -535,37 +546,99 @@ def gzip_compress(in_path: str, out_path: str=None, size: int=None) -> str:
             >>> utils.gzip_compress(in_path='/tmp/rand.txt', out_path='/tmp/rand2.txt.gz')
             '/tmp/rand2.txt.gz'
 
+
+        Quickly compress a large file using four threads::
+
+            >>> from utils4 import utils
+
+            >>> utils.gzip_compress(in_path='/tmp/rand.txt', level=1, workers=4)
+            '/tmp/rand.txt.gz'
+
+    :Design:
+        The file is compressed in the same manner as ``pigz``. Each chunk
+        is compressed to a raw deflate stream on a thread pool (``zlib``
+        releases the GIL while compressing). The last 32 KiB of the
+        previous chunk is used as the compression dictionary, to
+        maintain the compression ratio across chunk boundaries. Each
+        stream is ended with a *sync flush*, allowing the streams to be
+        concatenated directly.
+
+        The compressed chunks are written in order between a single
+        gzip header and trailer. The CRC-32 and length are calculated
+        over the original data as it is read. The output is a standard
+        single-member gzip file.
+
+        The number of chunks in flight is bounded to twice the number of
+        workers, so memory use is constant regardless of file size.
+
     Returns:
         str: Full path to the output file.
 
     """
-    import gzip
+    # pylint: disable=too-many-locals
+    import struct
+    import zlib
+    from collections import deque
     size = 1024*1024*10 if size is None else size  # Default to 10MiB.
+    workers = workers or os.cpu_count() or 1
+
+    def _deflate(chunk: bytes, zdict: bytes) -> bytes:
+        kwargs = {'zdict': zdict} if zdict else {}
+        comp = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS, **kwargs)
+        return comp.compress(chunk) + comp.flush(zlib.Z_SYNC_FLUSH)
+
     if fileexists(filepath=in_path, error='raise'):
         if out_path is None:
             out_path = f'{in_path}.gz'
-        with open(in_path, 'rb') as f_in, open(out_path, 'wb') as f_out:
+        crc = length = 0
+        prev = b''
+        pending = deque()
+        xfl = {1: 4, 9: 2}.get(level, 0)  # Per RFC 1952; 255 is 'unknown OS'.
+        mtime = int(os.path.getmtime(in_path)) & 0xffffffff
+        with (open(in_path, 'rb') as f_in,
+              open(out_path, 'wb') as f_out,
+              ThreadPoolExecutor(max_workers=workers) as pool):
+            f_out.write(struct.pack('<BBBBIBB', 0x1f, 0x8b, 8, 0, mtime, xfl, 255))
             chunk = f_in.read(size)
             while len(chunk) > 0:
-                comp = gzip.compress(data=chunk, compresslevel=9)
-                f_out.write(comp)
+                crc = zlib.crc32(chunk, crc)
+                length += len(chunk)
+                pending.append(pool.submit(_deflate, chunk, prev[-(1 << 15):]))
+                prev = chunk
+                if len(pending) >= workers * 2:
+                    f_out.write(pending.popleft().result())
                 chunk = f_in.read(size)
+            while pending:
+                f_out.write(pending.popleft().result())
+            # Empty final (BFINAL) block, then the CRC-32 and ISIZE.
+            f_out.write(b'\x03\x00')
+            f_out.write(struct.pack('<II', crc, length & 0xffffffff))
     return out_path
 
-def gzip_decompress(path: str, encoding: str='utf-8', size: int=None) -> bool:
+def gzip_decompress(path: str,
+                    encoding: str='utf-8',
+                    size: int=None,
+                    binary: bool=False,
+                    out_path: str=None) -> bool:
     """Decompress a ``.gz`` file using ``gzip``.
 
     Args:
         path (str): Full path to the file to be decompressed. If the file
             does not exist, a ``FileNotFoundError`` is raised.
         encoding (str, optional): Encoding to be used to decode the
-            decompressed binary data. Defaults to 'utf-8'.
+            decompressed binary data. Defaults to 'utf-8'. This argument
+            is ignored if ``binary`` is True.
         size (int, optional): Size of the chunk to be read / written during
             decompression. Defaults to 1MiB.
+        binary (bool, optional): Write the decompressed bytes directly,
+            without decoding. Defaults to False.
+        out_path (str, optional): Full path to the decompressed output
+            file. Defaults to None, which uses the ``path`` value with the
+            *last* file extension removed.
 
     Note:
         The output path is simply the ``path`` value with *last* file
-        extension removed.
+        extension removed, unless ``out_path`` is provided.
 
         In general cases, a file compressed using gzip will have a ``.gz``
         extension appended onto the existing filename and extension.
@@ -592,28 +665,116 @@ def gzip_decompress(path: str, encoding: str='utf-8', size: int=None) -> bool:
             >>> utils.gzip_decompress(path='/tmp/rand.txt.gz')
             True
 
+
+        Decompress a binary file::
+
+            >>> from utils4 import utils
+
+            >>> utils.gzip_decompress(path='/tmp/data.bin.gz', binary=True)
+            True
+
+    :Design:
+        The decompressed blocks are provided by the :func:`gzip_stream`
+        function, therefore any (multi-member) gzip file is supported,
+        using constant memory. For text output, an incremental decoder
+        is used, so a multi-byte character split across two blocks is
+        decoded correctly.
+
     Returns:
         bool: True if the decompression was successful, otherwise False.
 
     """
-    # pylint: disable=line-too-long
-    import gzip
-    size = (1<<2)**10 if size is None else size  # Default to 1 MiB.
+    import codecs
     success = False
     try:
         if fileexists(filepath=path, error='raise'):
-            out_path = os.path.splitext(path)[0]
-            with open(path, 'rb') as f_in, open(out_path, 'w', encoding='utf-8', newline='') as f_out:
-                chunk = f_in.read(size)
-                while len(chunk) > 1:
-                    decomp = gzip.decompress(data=chunk).decode(encoding=encoding)
-                    f_out.write(decomp)
-                    chunk = f_in.read(size)
+            out_path = out_path or os.path.splitext(path)[0]
+            if binary:
+                with open(out_path, 'wb') as f_out:
+                    for block in gzip_stream(path=path, size=size):
+                        f_out.write(block)
+            else:
+                decoder = codecs.getincrementaldecoder(encoding)()
+                with open(out_path, 'w', encoding='utf-8', newline='') as f_out:
+                    for block in gzip_stream(path=path, size=size):
+                        f_out.write(decoder.decode(block))
+                    f_out.write(decoder.decode(b'', final=True))
             success = True
     except Exception as err:
         reporterror(err)
     return success
 
+def gzip_stream(path: str, size: int=None) -> Generator[bytes, None, None]:
+    """Decompress a ``.gz`` file, yielding the decompressed blocks.
+
+    Args:
+        path (str): Full path to the file to be decompressed.
+        size (int, optional): Size of the compressed chunk read from the
+            file, and the maximum size of each decompressed block.
+            Defaults to 1MiB.
+
+    :Example:
+
+        Count the lines in a large compressed file::
+
+            >>> from utils4 import utils
+
+            >>> sum(b.count(b'\\n') for b in utils.gzip_stream('/tmp/rand.txt.gz'))
+            10000000
+
+    :Design:
+        The compressed file is read into a single, preallocated buffer
+        using ``readinto``, and fed to an incremental
+        ``zlib.decompressobj`` (with ``wbits=31``, for a gzip header and
+        trailer). The output of each call is capped at ``size`` bytes,
+        with any unconsumed input fed on the next call, so the memory
+        used is bounded regardless of the compression ratio.
+
+        When the end of a gzip member is reached, a new decompressor is
+        created and fed any remaining data, so multi-member files (such
+        as those created by concatenation) are fully decompressed. Zero
+        padding between or after members is ignored.
+
+    Raises:
+        EOFError: If the file ends part way through a gzip member.
+        zlib.error: If the data is not a valid gzip stream.
+
+    Yields:
+        bytes: Blocks of decompressed data, each up to ``size`` bytes.
+
+    """
+    import zlib
+    size = (1<<2)**10 if size is None else size  # Default to 1 MiB.
+    buf = bytearray(size)
+    view = memoryview(buf)
+    dcmp = zlib.decompressobj(wbits=31)
+    fresh = True  # No data has been fed to the current decompressor.
+    with open(path, 'rb') as f:
+        while n := f.readinto(buf):
+            data = view[:n]
+            while data:
+                if fresh and data[0] == 0:
+                    # Skip any zero padding before a member.
+                    data = bytes(data).lstrip(b'\x00')
+                    if not data:
+                        break
+                fresh = False
+                block = dcmp.decompress(data, size)
+                if block:
+                    yield block
+                if dcmp.eof:
+                    data = dcmp.unused_data
+                    dcmp = zlib.decompressobj(wbits=31)
+                    fresh = True
+                else:
+                    data = dcmp.unconsumed_tail
+    if not fresh:
+        tail = dcmp.flush()
+        for i in range(0, len(tail), size):  # pragma: nocover
+            yield tail[i:i+size]
+        if not dcmp.eof:
+            raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+
 # Tested by the test_x_futils module.
 def is7zip(path: str) -> bool:  # pragma: nocover
     r"""Determine if a file is a 7-zip archive.
@@ -659,7 +820,8 @@ def isascii(path: str, size: int=2048) -> bool:  # pragma: nocover
     Args:
         path (str): Full path to the file to be tested.
         size (int, optional): Number of bytes to read in a chunk.
-            Defaults to 2048 (2 MiB).
+            Values below 64 KiB are rounded up to 64 KiB.
+            Defaults to 2048.
 
     :Example:
 
@@ -696,7 +858,8 @@ def isbinary(path: str, size: int=1024) -> bool:  # pragma: nocover
     Args:
         path (str): Full path to the file to be tested.
         size (int, optional): Number of bytes to read in a chunk.
-            Defaults to 1024 (1 MiB).
+            Values below 64 KiB are rounded up to 64 KiB.
+            Defaults to 1024.
 
     :Example:
 
@@ -715,6 +878,11 @@ def isbinary(path: str, size: int=1024) -> bool:  # pragma: nocover
         printable range, False is returned as the file is plain-text
         (ASCII only).
 
+        Each chunk is scanned eight bytes (one 64-bit word) at a time.
+        Only words containing a control character are tested
+        byte-by-byte, using a lookup table. The GIL is released while the
+        file is scanned.
+
         This method calls the :func:`futils.isbinary` function with the
         given arguments.
 
@@ -960,6 +1128,170 @@ def ping(server: str, count: int=1, timeout: int=5, verbose: bool=False) -> bool
             ui.print_alert(text=stderr.decode().strip())
     return status == 0
 
+# Tested by the test_x_futils module.
+def scan_tree(root: str,
+              checks: tuple=('ascii', 'binary', '7zip', 'gzip', 'pdf', 'zip'),
+              workers: int=None) -> Generator[tuple[str, dict], None, None]:  # pragma: nocover
+    """Classify every file in a directory tree, in parallel.
+
+    Args:
+        root (str): Root of the directory tree to be scanned.
+        checks (tuple, optional): The classifications to be tested for
+            each file. Any of: ``'ascii'``, ``'binary'``, ``'7zip'``,
+            ``'gzip'``, ``'pdf'``, ``'zip'``. Defaults to all.
+        workers (int, optional): Number of worker threads. Defaults to
+            None, which uses the number of CPUs.
+
+    :Example:
+
+        Find all PDF files in a directory tree::
+
+            >>> from utils4 import utils
+
+            >>> for path, result in utils.scan_tree('/path/to/docs',
+                                                    checks=('pdf',)):
+            >>>     if result['pdf']:
+            >>>         print(path)
+
+    :Design:
+        The directory tree is walked lazily, using
+        :func:`utils4.filesys.iterfiles`, and each file is submitted
+        to a thread pool. As the :mod:`futils` functions release the GIL
+        around all file I/O, the files are classified concurrently.
+
+        For each file, the signature checks (7zip, gzip, pdf, zip) are
+        satisfied by a *single* call to :func:`futils.sniff`, and the
+        ascii/binary checks by a single call to :func:`futils.isbinary`.
+        The sniff is always made, as it also reports whether the file
+        could be read; if not, the remaining checks are skipped.
+
+        The number of files in flight is bounded to a small multiple of
+        ``workers``, so memory use is constant regardless of the size of
+        the tree.
+
+    Raises:
+        ValueError: If an unrecognised check is requested.
+
+    Yields:
+        tuple: A tuple of ``(path, result)`` for each file, where
+        ``result`` is a dict of ``{check: bool}``, followed by an
+        ``'error'`` flag. If the file could not be read (e.g. removed, or
+        permission denied), ``'error'`` is True and all checks are False.
+        The results are yielded as they complete, therefore the order is
+        *not* guaranteed.
+
+    """
+    magic = {'7zip': futils.FT_7ZIP,
+             'gzip': futils.FT_GZIP,
+             'pdf': futils.FT_PDF,
+             'zip': futils.FT_ZIP}
+    checks = tuple(checks)
+    if set(checks).difference(magic, ('ascii', 'binary')):
+        raise ValueError(f'Invalid check(s), expected any of: {("ascii", "binary", *magic)}')
+    sniff_ = set(checks).intersection(magic)
+    scan_ = 'ascii' in checks or 'binary' in checks
+
+    def _classify(path: str) -> tuple[str, dict]:
+        # The sniff also confirms the file is readable, as isbinary reports
+        # a file which cannot be opened as (not binary) ascii.
+        try:
+            code = futils.sniff(path)
+        except ValueError:  # e.g. An embedded null byte.
+            code = futils.FT_ERROR
+        if code == futils.FT_ERROR:
+            return path, {**dict.fromkeys(checks, False), 'error': True}
+        result = {c: code == magic[c] for c in sniff_}
+        if scan_:
+            binary = bool(futils.isbinary(path, 65536))
+            result.update({'ascii': not binary, 'binary': binary})
+        return path, {**{c: result[c] for c in checks}, 'error': False}
+
+    workers = workers or os.cpu_count() or 1
+    files = (e.path for e in filesys.iterfiles(path=root, recursive=True, follow_symlinks=True))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for path in files:
+            pending.add(pool.submit(_classify, path))
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (f.result() for f in done)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from (f.result() for f in done)
+
+# Tested by the test_x_futils module.
+def sniff(path: str) -> str:  # pragma: nocover
+    """Determine a file's type by testing its leading bytes.
+
+    Unlike calling :func:`is7zip`, :func:`isgzip`, :func:`ispdf` and
+    :func:`iszip` in turn, the file is opened and read only *once*, and
+    the header is tested against a table of known file signatures.
+
+    Args:
+        path (str): Full path to the file to be tested.
+
+    :Example:
+
+        Determine the type of a file::
+
+            >>> from utils4 import utils
+
+            >>> utils.sniff('/path/to/file.tar.gz')
+            'gzip'
+
+    Note:
+        The file type is determined from the file's content, *not*
+        using the file extension. The supported types are:
+
+        ``7zip``, ``bzip2``, ``gif``, ``gzip``, ``jpeg``, ``parquet``,
+        ``pdf``, ``png``, ``sqlite``, ``tar``, ``xz``, ``zip``,
+        ``zstd``
+
+    :Design:
+        This method calls the :func:`futils.sniff` function with the
+        given arguments, and maps the returned type code to its name
+        using the ``futils.FILETYPES`` dictionary.
+
+    Returns:
+        str: The short name of the file type, ``'unknown'`` if the
+        file's signature was not recognised, or ``'error'`` if the file
+        could not be read.
+
+    """
+    return futils.FILETYPES[futils.sniff(path)]
+
+# Tested by the test_x_futils module.
+def sniff_many(paths: list[str]) -> list[str]:  # pragma: nocover
+    """Determine the file type for each file in a list.
+
+    Args:
+        paths (list[str]): A list of full paths to be tested.
+
+    :Example:
+
+        Determine the type of several files::
+
+            >>> from utils4 import utils
+
+            >>> utils.sniff_many(['/path/to/file.pdf', '/path/to/file.7z'])
+            ['pdf', '7zip']
+
+    :Design:
+        This method calls the :func:`futils.sniff_many` function, which
+        releases the GIL and classifies the full list in C. Therefore,
+        this function is suitable for use with a thread pool when
+        classifying a large number of files.
+
+        For further detail, refer to the :func:`sniff` documentation.
+
+    Returns:
+        list[str]: A list of file type names, in the same order as the
+        given paths.
+
+    """
+    names = futils.FILETYPES
+    return [names[c] for c in futils.sniff_many(paths)]
+
 def strip_ansi_colour(text: str):
     r"""Strip ANSI colour sequences from a string.
 
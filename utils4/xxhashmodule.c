@@ -0,0 +1,327 @@
+/*
+    Python wrapper for the _xxhash.c module.
+*/
+
+#include <Python.h>
+#include "libs/_xxhash.h"
+
+// Buffers of at least this size are hashed with the GIL released.
+#define _GIL_MINSIZE 2048
+
+// Python docstrings.
+const char _DOC_XXH64[] =
+{ "xxh64(data=b'', seed=0)\n"
+  "--\n\n"
+  "Streaming XXH64 hasher, with a hashlib-style interface.\n\n"
+  "XXH64 is a fast, non-cryptographic 64-bit hash, suitable for\n"
+  "integrity checks and change detection only. It offers *no*\n"
+  "protection against deliberate tampering.\n\n"
+  "Args:\n"
+  "    data (bytes-like, optional): Initial data to be hashed.\n"
+  "        Defaults to b''.\n"
+  "    seed (int, optional): Unsigned 64-bit seed. Defaults to 0.\n\n"
+  "Note:\n"
+  "    Buffers of 2 KiB or more are hashed with the GIL released, so\n"
+  "    separate hashers may be updated concurrently from a thread pool."
+};
+const char _DOC_XXH64_FILE[] =
+{ "Calculate the XXH64 digest of a file.\n\n"
+  "The file is read and hashed entirely in C, with the GIL released.\n\n"
+  "Args:\n"
+  "    path (str): Full path to the file.\n"
+  "    seed (int, optional): Unsigned 64-bit seed. Defaults to 0.\n\n"
+  "Raises:\n"
+  "    OSError: If the file cannot be opened or read.\n\n"
+  "Returns:\n"
+  "    str: The digest, as a 16-character hex string."
+};
+const char _DOC_XXH64_HEXDIGEST[] =
+{ "Calculate the XXH64 digest of a bytes-like object.\n\n"
+  "Args:\n"
+  "    data (bytes-like): Data to be hashed.\n"
+  "    seed (int, optional): Unsigned 64-bit seed. Defaults to 0.\n\n"
+  "Returns:\n"
+  "    str: The digest, as a 16-character hex string."
+};
+const char _DOC_XXH64_INTDIGEST[] =
+{ "Calculate the XXH64 digest of a bytes-like object.\n\n"
+  "Args:\n"
+  "    data (bytes-like): Data to be hashed.\n"
+  "    seed (int, optional): Unsigned 64-bit seed. Defaults to 0.\n\n"
+  "Returns:\n"
+  "    int: The digest, as an unsigned 64-bit integer."
+};
+
+/* -----------------------------------------------------------------
+  Streaming hasher type.
+  --------------------------------------------------------------- */
+
+typedef struct {
+    PyObject_HEAD
+    xxh64_state state;
+    PyThread_type_lock lock;
+} XXH64Object;
+
+static PyObject *XXH64Type = NULL;
+
+// Serialise access to the state; blocking waits release the GIL.
+#define _ENTER(self) \
+    if ( !PyThread_acquire_lock((self)->lock, 0) ) { \
+        Py_BEGIN_ALLOW_THREADS \
+        PyThread_acquire_lock((self)->lock, 1); \
+        Py_END_ALLOW_THREADS \
+    }
+#define _LEAVE(self) PyThread_release_lock((self)->lock)
+
+static PyObject *_hexdigest(uint64_t h) {
+    char hex[17];
+    snprintf(hex, sizeof(hex), "%016llx", (unsigned long long)h);
+    return PyUnicode_FromStringAndSize(hex, 16);
+}
+
+static XXH64Object *_xxh64_alloc(PyTypeObject *tp) {
+    XXH64Object *self = PyObject_New(XXH64Object, tp);
+    if ( self == NULL )
+        return NULL;
+    if ( (self->lock = PyThread_allocate_lock()) == NULL ) {
+        Py_DECREF(self);
+        PyErr_NoMemory();
+        return NULL;
+    }
+    return self;
+}
+
+static void _xxh64_update(XXH64Object *self, Py_buffer *buf) {
+    if ( buf->len >= _GIL_MINSIZE ) {
+        Py_BEGIN_ALLOW_THREADS
+        PyThread_acquire_lock(self->lock, 1);
+        xxh64_update_(&self->state, buf->buf, (size_t)buf->len);
+        PyThread_release_lock(self->lock);
+        Py_END_ALLOW_THREADS
+    } else {
+        _ENTER(self);
+        xxh64_update_(&self->state, buf->buf, (size_t)buf->len);
+        _LEAVE(self);
+    }
+}
+
+static PyObject *xxh64_new(PyTypeObject *tp, PyObject *args, PyObject *kwargs) {
+    static char *kwlist[] = {"data", "seed", NULL};
+    Py_buffer buf = {NULL, NULL};
+    unsigned long long seed = 0;
+    XXH64Object *self;
+    if ( !PyArg_ParseTupleAndKeywords(args, kwargs, "|y*K:xxh64", kwlist, &buf, &seed) )
+        return NULL;
+    if ( (self = _xxh64_alloc(tp)) != NULL ) {
+        xxh64_reset_(&self->state, (uint64_t)seed);
+        if ( buf.obj != NULL )
+            _xxh64_update(self, &buf);
+    }
+    if ( buf.obj != NULL )
+        PyBuffer_Release(&buf);
+    return (PyObject *)self;
+}
+
+static void xxh64_dealloc(PyObject *self) {
+    PyTypeObject *tp = Py_TYPE(self);
+    if ( ((XXH64Object *)self)->lock != NULL )
+        PyThread_free_lock(((XXH64Object *)self)->lock);
+    ((freefunc)PyType_GetSlot(tp, Py_tp_free))(self);
+    Py_DECREF(tp);
+}
+
+static PyObject *xxh64_copy(PyObject *self, PyObject *args) {
+    XXH64Object *src = (XXH64Object *)self;
+    XXH64Object *dst = _xxh64_alloc(Py_TYPE(self));
+    if ( dst == NULL )
+        return NULL;
+    _ENTER(src);
+    dst->state = src->state;
+    _LEAVE(src);
+    return (PyObject *)dst;
+}
+
+static PyObject *xxh64_digest(PyObject *self, PyObject *args) {
+    unsigned char out[8];
+    uint64_t h;
+    int i;
+    _ENTER((XXH64Object *)self);
+    h = xxh64_digest_(&((XXH64Object *)self)->state);
+    _LEAVE((XXH64Object *)self);
+    // Canonical (big-endian) representation.
+    for ( i = 7; i >= 0; --i, h >>= 8 )
+        out[i] = (unsigned char)(h & 0xff);
+    return PyBytes_FromStringAndSize((const char *)out, 8);
+}
+
+static PyObject *xxh64_hexdigest(PyObject *self, PyObject *args) {
+    uint64_t h;
+    _ENTER((XXH64Object *)self);
+    h = xxh64_digest_(&((XXH64Object *)self)->state);
+    _LEAVE((XXH64Object *)self);
+    return _hexdigest(h);
+}
+
+static PyObject *xxh64_intdigest(PyObject *self, PyObject *args) {
+    uint64_t h;
+    _ENTER((XXH64Object *)self);
+    h = xxh64_digest_(&((XXH64Object *)self)->state);
+    _LEAVE((XXH64Object *)self);
+    return PyLong_FromUnsignedLongLong(h);
+}
+
+static PyObject *xxh64_reset(PyObject *self, PyObject *args) {
+    XXH64Object *obj = (XXH64Object *)self;
+    _ENTER(obj);
+    xxh64_reset_(&obj->state, obj->state.seed);
+    _LEAVE(obj);
+    Py_RETURN_NONE;
+}
+
+static PyObject *xxh64_update(PyObject *self, PyObject *args) {
+    Py_buffer buf;
+    if ( !PyArg_ParseTuple(args, "y*:update", &buf) )
+        return NULL;
+    _xxh64_update((XXH64Object *)self, &buf);
+    PyBuffer_Release(&buf);
+    Py_RETURN_NONE;
+}
+
+static PyObject *xxh64_get_name(PyObject *self, void *closure) {
+    return PyUnicode_FromString("xxh64");
+}
+
+static PyObject *xxh64_get_seed(PyObject *self, void *closure) {
+    return PyLong_FromUnsignedLongLong(((XXH64Object *)self)->state.seed);
+}
+
+static PyObject *xxh64_get_size(PyObject *self, void *closure) {
+    return PyLong_FromSsize_t((Py_ssize_t)closure);
+}
+
+static PyMethodDef xxh64_methods[] = {
+    {"copy", xxh64_copy, METH_NOARGS, "Return a copy of the hasher."},
+    {"digest", xxh64_digest, METH_NOARGS, "Return the digest as 8 big-endian bytes."},
+    {"hexdigest", xxh64_hexdigest, METH_NOARGS, "Return the digest as a hex string."},
+    {"intdigest", xxh64_intdigest, METH_NOARGS, "Return the digest as an integer."},
+    {"reset", xxh64_reset, METH_NOARGS, "Reset the hasher, retaining the seed."},
+    {"update", xxh64_update, METH_VARARGS, "Add a bytes-like object to the digest."},
+    {NULL, NULL, 0, NULL}
+};
+
+static PyGetSetDef xxh64_getset[] = {
+    {"block_size", xxh64_get_size, NULL, "Internal block size, in bytes.", (void *)32},
+    {"digest_size", xxh64_get_size, NULL, "Digest size, in bytes.", (void *)8},
+    {"name", xxh64_get_name, NULL, "Name of the algorithm.", NULL},
+    {"seed", xxh64_get_seed, NULL, "Seed value.", NULL},
+    {NULL, NULL, NULL, NULL, NULL}
+};
+
+static PyType_Slot xxh64_slots[] = {
+    {Py_tp_new, xxh64_new},
+    {Py_tp_dealloc, xxh64_dealloc},
+    {Py_tp_methods, xxh64_methods},
+    {Py_tp_getset, xxh64_getset},
+    {Py_tp_doc, (void *)_DOC_XXH64},
+    {0, NULL}
+};
+
+static PyType_Spec xxh64_spec = {
+    "utils4.xxhash.xxh64",
+    sizeof(XXH64Object),
+    0,
+    Py_TPFLAGS_DEFAULT,
+    xxh64_slots
+};
+
+/* -----------------------------------------------------------------
+  Module-level functions.
+  --------------------------------------------------------------- */
+
+static int _parse_data(PyObject *args, PyObject *kwargs, const char *fmt,
+                       Py_buffer *buf, uint64_t *h) {
+    static char *kwlist[] = {"data", "seed", NULL};
+    unsigned long long seed = 0;
+    if ( !PyArg_ParseTupleAndKeywords(args, kwargs, fmt, kwlist, buf, &seed) )
+        return 0;
+    if ( buf->len >= _GIL_MINSIZE ) {
+        Py_BEGIN_ALLOW_THREADS
+        *h = xxh64_(buf->buf, (size_t)buf->len, (uint64_t)seed);
+        Py_END_ALLOW_THREADS
+    } else {
+        *h = xxh64_(buf->buf, (size_t)buf->len, (uint64_t)seed);
+    }
+    PyBuffer_Release(buf);
+    return 1;
+}
+
+static PyObject *xxhash_xxh64_file(PyObject *self, PyObject *args, PyObject *kwargs) {
+    static char *kwlist[] = {"path", "seed", NULL};
+    PyObject *bpath = NULL;
+    unsigned long long seed = 0;
+    uint64_t h = 0;
+    int rtn;
+    if ( !PyArg_ParseTupleAndKeywords(args, kwargs, "O&|K:xxh64_file", kwlist,
+                                      PyUnicode_FSConverter, &bpath, &seed) )
+        return NULL;
+    Py_BEGIN_ALLOW_THREADS
+    rtn = xxh64_file_(PyBytes_AsString(bpath), (uint64_t)seed, &h);
+    Py_END_ALLOW_THREADS
+    if ( rtn ) {
+        PyErr_SetFromErrnoWithFilename(PyExc_OSError, PyBytes_AsString(bpath));
+        Py_DECREF(bpath);
+        return NULL;
+    }
+    Py_DECREF(bpath);
+    return _hexdigest(h);
+}
+
+static PyObject *xxhash_xxh64_hexdigest(PyObject *self, PyObject *args, PyObject *kwargs) {
+    Py_buffer buf;
+    uint64_t h;
+    if ( !_parse_data(args, kwargs, "y*|K:xxh64_hexdigest", &buf, &h) )
+        return NULL;
+    return _hexdigest(h);
+}
+
+static PyObject *xxhash_xxh64_intdigest(PyObject *self, PyObject *args, PyObject *kwargs) {
+    Py_buffer buf;
+    uint64_t h;
+    if ( !_parse_data(args, kwargs, "y*|K:xxh64_intdigest", &buf, &h) )
+        return NULL;
+    return PyLong_FromUnsignedLongLong(h);
+}
+
+static PyMethodDef xxhash_methods[] = {
+    {"xxh64_file", (PyCFunction)(void(*)(void))xxhash_xxh64_file,
+     METH_VARARGS | METH_KEYWORDS, _DOC_XXH64_FILE},
+    {"xxh64_hexdigest", (PyCFunction)(void(*)(void))xxhash_xxh64_hexdigest,
+     METH_VARARGS | METH_KEYWORDS, _DOC_XXH64_HEXDIGEST},
+    {"xxh64_intdigest", (PyCFunction)(void(*)(void))xxhash_xxh64_intdigest,
+     METH_VARARGS | METH_KEYWORDS, _DOC_XXH64_INTDIGEST},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef xxhash_module = {
+    PyModuleDef_HEAD_INIT,
+    "xxhash",
+    "Fast, non-cryptographic XXH64 hashing, implemented in C for efficiency.",
+    -1,
+    xxhash_methods
+};
+
+PyMODINIT_FUNC PyInit_xxhash(void) {
+    PyObject *m;
+    if ( XXH64Type == NULL
+         && (XXH64Type = PyType_FromSpec(&xxh64_spec)) == NULL )
+        return NULL;
+    if ( (m = PyModule_Create(&xxhash_module)) == NULL )
+        return NULL;
+    Py_INCREF(XXH64Type);
+    if ( PyModule_AddObject(m, "xxh64", XXH64Type) ) {
+        Py_DECREF(XXH64Type);
+        Py_DECREF(m);
+        return NULL;
+    }
+    return m;
+}